@@ -0,0 +1,318 @@
+"""
+Benchmark of the Harte Library over the chord vocabulary of ChoCo.
+Each chord of test/chords_count.json is processed by the following
+workloads, timing every call:
+  * parse              parsing of the label (with an empty parse cache)
+  * harte              construction of a Harte object
+  * harte_interval     construction of a HarteInterval for each degree
+  * multi_hot          Harte.multi_hot_encoding
+  * prettify           Harte.prettify
+  * get_midi_pitches   Harte.get_midi_pitches
+Latency percentiles and throughput are reported both over the distinct
+chords and weighted by the number of occurrences of each chord in ChoCo,
+together with the peak memory allocated by each workload. The report is
+written as JSON and can be compared against a stored baseline, in which case
+the script exits with status 1 if any workload regressed.
+
+Usage:
+    python benchmarks/bench_choco.py [--repeat N] [--limit N]
+        [--output report.json] [--baseline baseline.json] [--tolerance 0.1]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# pylint: disable=wrong-import-position
+from harte.harte import Harte
+from harte.interval import HarteInterval
+from harte.parse_harte import PARSE_CACHE, parse_chord
+from harte.utils import resolve_degrees
+
+CHORDS_PATH = os.path.join(ROOT_DIR, "test", "chords_count.json")
+PERCENTILES = (50, 90, 99)
+# metrics that are worse when higher, and when lower
+LATENCY_METRICS = tuple(f"p{q}_us" for q in PERCENTILES) + ("mean_us",)
+THROUGHPUT_METRICS = ("ops_per_s",)
+
+Workload = Tuple[Callable[[str], object], Callable[[str], object]]
+
+
+def load_chords(limit: Optional[int] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    Load the chords of ChoCo that can be parsed, with their counts
+    :param limit: maximum number of chords, taken among the most frequent
+    :type limit: int
+    :return: a tuple containing the labels and their number of occurrences
+    :rtype: Tuple[List[str], np.ndarray]
+    """
+    with open(CHORDS_PATH, encoding="UTF-8") as file:
+        counts = json.load(file)
+    chords = []
+    for label, count in sorted(counts.items(), key=lambda x: -x[1]):
+        try:
+            Harte(label)
+        except Exception:  # pylint: disable=broad-except
+            continue
+        chords.append((label, count))
+        if limit is not None and len(chords) >= limit:
+            break
+    return [label for label, _ in chords], \
+        np.array([count for _, count in chords], dtype=np.float64)
+
+
+def _parse(label: str) -> object:
+    """
+    Parse a label, bypassing the parse cache
+    """
+    PARSE_CACHE.clear()
+    return parse_chord(label)
+
+
+def _intervals(label: str) -> List[str]:
+    """
+    Retrieve the degrees of a chord
+    """
+    parsed = parse_chord(label)
+    return resolve_degrees(parsed.shorthand, parsed.degrees,
+                           parsed.bass or "1")
+
+
+def make_workloads(labels: List[str]) -> Dict[str, Workload]:
+    """
+    Define the benchmarked workloads. Each one is a pair of functions: the
+    first prepares the argument of the timed call for a label (outside of the
+    timing) and the second is the timed call
+    :param labels: the labels of the chords
+    :type labels: List[str]
+    :return: a dictionary mapping the name of each workload to its functions
+    :rtype: Dict[str, Workload]
+    """
+    harte = {label: Harte(label) for label in labels}
+    return {
+        "parse": (lambda label: label, _parse),
+        "harte": (lambda label: label, Harte),
+        "harte_interval": (
+            _intervals,
+            lambda degrees: [HarteInterval(degree) for degree in degrees]),
+        "multi_hot": (harte.get, lambda chord: chord.multi_hot_encoding()),
+        "prettify": (harte.get, lambda chord: chord.prettify()),
+        "get_midi_pitches": (harte.get,
+                             lambda chord: chord.get_midi_pitches()),
+    }
+
+
+def time_workload(workload: Workload, labels: List[str],
+                  repeat: int) -> np.ndarray:
+    """
+    Time each call of a workload, keeping the best time for each label
+    :param workload: the functions of the workload
+    :type workload: Workload
+    :param labels: the labels of the chords
+    :type labels: List[str]
+    :param repeat: number of times each call is timed
+    :type repeat: int
+    :return: the latency of each label, in seconds
+    :rtype: np.ndarray
+    """
+    prepare, call = workload
+    arguments = [prepare(label) for label in labels]
+    latencies = np.full(len(labels), np.inf)
+    clock = time.perf_counter_ns
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for i, argument in enumerate(arguments):
+                start = clock()
+                call(argument)
+                latencies[i] = min(latencies[i], clock() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return latencies * 1e-9
+
+
+def peak_memory(workload: Workload, labels: List[str]) -> int:
+    """
+    Measure the peak memory allocated while running a workload once
+    :param workload: the functions of the workload
+    :type workload: Workload
+    :param labels: the labels of the chords
+    :type labels: List[str]
+    :return: the peak of the allocated memory, in bytes
+    :rtype: int
+    """
+    prepare, call = workload
+    arguments = [prepare(label) for label in labels]
+    tracemalloc.start()
+    try:
+        results = [call(argument) for argument in arguments]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return peak
+
+
+def _weighted_percentile(values: np.ndarray, weights: np.ndarray,
+                         q: float) -> float:
+    """
+    Compute a percentile of values weighted by the given weights
+    """
+    order = np.argsort(values)
+    cumulative = np.cumsum(weights[order])
+    index = np.searchsorted(cumulative, q / 100 * cumulative[-1])
+    return float(values[order][min(index, len(values) - 1)])
+
+
+def summarize(latencies: np.ndarray,
+              weights: Optional[np.ndarray] = None) -> Dict[str, float]:
+    """
+    Summarize the latencies of a workload
+    :param latencies: the latency of each label, in seconds
+    :type latencies: np.ndarray
+    :param weights: the number of occurrences of each label, if the
+    statistics are to be weighted
+    :type weights: np.ndarray
+    :return: the latency percentiles and mean (in microseconds) and the
+    throughput (in operations per second)
+    :rtype: Dict[str, float]
+    """
+    if weights is None:
+        weights = np.ones_like(latencies)
+    mean = float(np.average(latencies, weights=weights))
+    summary = {f"p{q}_us": _weighted_percentile(latencies, weights, q) * 1e6
+               for q in PERCENTILES}
+    summary["mean_us"] = mean * 1e6
+    summary["ops_per_s"] = 1 / mean if mean > 0 else float("inf")
+    return summary
+
+
+def run(repeat: int = 3, limit: Optional[int] = None,
+        workloads: Optional[List[str]] = None) -> dict:
+    """
+    Run the benchmark
+    :param repeat: number of times each call is timed
+    :type repeat: int
+    :param limit: maximum number of chords
+    :type limit: int
+    :param workloads: names of the workloads to be run, defaults to all
+    :type workloads: List[str]
+    :return: the report of the benchmark
+    :rtype: dict
+    """
+    labels, counts = load_chords(limit)
+    defined = make_workloads(labels)
+    results = {}
+    for name in workloads or defined:
+        latencies = time_workload(defined[name], labels, repeat)
+        results[name] = {
+            "unweighted": summarize(latencies),
+            "weighted": summarize(latencies, counts),
+            "peak_memory_bytes": peak_memory(defined[name], labels),
+        }
+    return {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "chords": len(labels),
+            "occurrences": int(counts.sum()),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict,
+            tolerance: float = 0.1) -> List[str]:
+    """
+    Compare a report against a baseline
+    :param report: the report of the current run
+    :type report: dict
+    :param baseline: the report of the baseline run
+    :type baseline: dict
+    :param tolerance: relative slowdown (or memory increase) tolerated
+    before a metric is considered a regression
+    :type tolerance: float
+    :return: a description of each regression
+    :rtype: List[str]
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        for weighting in ("unweighted", "weighted"):
+            current, previous = result[weighting], reference[weighting]
+            for metric in LATENCY_METRICS:
+                if current[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{name} ({weighting}) {metric}: "
+                        f"{previous[metric]:.2f} -> {current[metric]:.2f}")
+            for metric in THROUGHPUT_METRICS:
+                if current[metric] < previous[metric] / (1 + tolerance):
+                    regressions.append(
+                        f"{name} ({weighting}) {metric}: "
+                        f"{previous[metric]:.0f} -> {current[metric]:.0f}")
+        if result["peak_memory_bytes"] > \
+                reference["peak_memory_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"{name} peak_memory_bytes: {reference['peak_memory_bytes']}"
+                f" -> {result['peak_memory_bytes']}")
+    return regressions
+
+
+def main():
+    """
+    Run the benchmark, print a summary table and compare it with a baseline
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--workload", action="append", dest="workloads",
+                        help="workload to be run (can be repeated)")
+    parser.add_argument("--output", default=None,
+                        help="path of the JSON report")
+    parser.add_argument("--baseline", default=None,
+                        help="path of a JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.limit, args.workloads)
+    print(f"{'workload':<18}{'weighting':<12}{'p50 (us)':>10}"
+          f"{'p90 (us)':>10}{'p99 (us)':>10}{'ops/s':>12}{'peak (KiB)':>12}")
+    for name, result in report["results"].items():
+        for weighting in ("unweighted", "weighted"):
+            summary = result[weighting]
+            print(f"{name:<18}{weighting:<12}{summary['p50_us']:>10.1f}"
+                  f"{summary['p90_us']:>10.1f}{summary['p99_us']:>10.1f}"
+                  f"{summary['ops_per_s']:>12.0f}"
+                  f"{result['peak_memory_bytes'] / 1024:>12.1f}")
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="UTF-8") as file:
+            json.dump(report, file, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline, encoding="UTF-8") as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
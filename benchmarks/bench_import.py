@@ -0,0 +1,74 @@
+"""
+Benchmark of the import time of the modules of the Harte Library.
+Each measurement is taken in a fresh interpreter, so that nothing is shared
+between runs apart from the on-disk cache of the compiled grammar.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+SCENARIOS = {
+    "import harte.parse_harte": "import harte.parse_harte",
+    "import harte.core": "import harte.core",
+    "import harte.harte": "import harte.harte",
+    "first parse (fast parser)":
+        "from harte.parse_harte import parse_chord; parse_chord('C:maj7')",
+    "first parse (Lark, cached tables)":
+        "from harte.parse_harte import get_parser; "
+        "get_parser().parse('C:maj7')",
+    "first parse (Lark, no cache)":
+        "import os; os.environ['HARTE_LARK_CACHE'] = '0'; "
+        "from harte.parse_harte import get_parser; "
+        "get_parser().parse('C:maj7')",
+    "first Harte": "from harte.harte import Harte; Harte('C:maj7')",
+}
+
+TIMER = ("import time; _start = time.perf_counter(); {statement}; "
+         "print(time.perf_counter() - _start)")
+
+
+def measure(statement: str, repeat: int) -> List[float]:
+    """
+    Measure the time needed to run a statement in a fresh interpreter
+    :param statement: the statement to be timed
+    :type statement: str
+    :param repeat: number of measurements
+    :type repeat: int
+    :return: the measured times, in seconds
+    :rtype: List[float]
+    """
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            cwd=ROOT_DIR, check=True, capture_output=True, text=True)
+        times.append(float(output.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def main():
+    """
+    Run the import benchmark and print a summary table
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<36}{'median (ms)':>12}{'min (ms)':>12}")
+    for name, statement in SCENARIOS.items():
+        times = measure(statement, args.repeat)
+        print(f"{name:<36}{statistics.median(times) * 1e3:>12.1f}"
+              f"{min(times) * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark of the size and speed of the serialization of Harte chords.
+A sequence of chords is sampled from the chord vocabulary of ChoCo according
+to the number of occurrences of each chord, and serialized as:
+  * music21 state   pickle of the full music21 object graph of each chord
+  * pickle          pickle of the chords through their compact state
+  * serialization   harte.serialization.dumps
+  * labels          pickle of the labels only, as a reference
+
+Usage:
+    python benchmarks/bench_serialization.py [--chords N] [--seed N]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+from music21.base import Music21Object
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# pylint: disable=wrong-import-position
+from harte import serialization
+from harte.harte import Harte
+
+CHORDS_PATH = os.path.join(ROOT_DIR, "test", "chords_count.json")
+
+
+def sample_chords(n_chords: int, seed: int) -> List[str]:
+    """
+    Sample a sequence of parsable chords of ChoCo, according to their number
+    of occurrences
+    :param n_chords: number of chords of the sequence
+    :type n_chords: int
+    :param seed: seed of the random generator
+    :type seed: int
+    :return: the labels of the sampled chords
+    :rtype: List[str]
+    """
+    with open(CHORDS_PATH, encoding="UTF-8") as file:
+        counts = json.load(file)
+    labels, weights = [], []
+    for label, count in counts.items():
+        try:
+            Harte(label)
+        except Exception:  # pylint: disable=broad-except
+            continue
+        labels.append(label)
+        weights.append(count)
+    weights = np.array(weights, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    return [labels[i] for i in
+            rng.choice(len(labels), n_chords, p=weights / weights.sum())]
+
+
+def _timed(function: Callable, *args) -> Tuple[object, float]:
+    """
+    Call a function, measuring the elapsed time
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """
+    Run the serialization benchmark and print a summary table
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chords", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    labels = sample_chords(args.chords, args.seed)
+    chords = [Harte(label) for label in labels]
+    scenarios = {
+        "music21 state": (
+            lambda: pickle.dumps([Music21Object.__getstate__(chord)
+                                  for chord in chords]),
+            pickle.loads),
+        "pickle": (lambda: pickle.dumps(chords), pickle.loads),
+        "serialization": (lambda: serialization.dumps(chords),
+                          serialization.loads),
+        "labels": (lambda: pickle.dumps(labels), pickle.loads),
+    }
+
+    print(f"{'format':<16}{'size (KiB)':>12}{'bytes/chord':>13}"
+          f"{'dump (ms)':>11}{'load (ms)':>11}")
+    for name, (dump, load) in scenarios.items():
+        payload, dump_time = _timed(dump)
+        _, load_time = _timed(load, payload)
+        print(f"{name:<16}{len(payload) / 1024:>12.1f}"
+              f"{len(payload) / len(labels):>13.1f}"
+              f"{dump_time * 1e3:>11.1f}{load_time * 1e3:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
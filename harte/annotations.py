@@ -0,0 +1,273 @@
+"""
+Streaming readers for timed chord annotations, such as the .lab files of
+Isophonics and ChoCo (one `start end label` line per chord) and the chord
+annotations of JAMS files.
+The readers yield columnar batches of bounded size, so that arbitrarily large
+corpora can be processed in constant memory.
+"""
+
+import json
+import mmap
+import os
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, \
+    Tuple, Union
+
+import numpy as np
+
+from harte.parse_harte import parse_chord
+
+DEFAULT_CHUNK_SIZE = 65536
+INVALID_ID = -1
+
+
+class AnnotationBatch(NamedTuple):
+    """
+    Columnar batch of timed chord annotations
+    """
+    onsets: np.ndarray
+    offsets: np.ndarray
+    chord_ids: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.chord_ids)
+
+
+class LabelIndex:
+    """
+    Index assigning a stable integer ID to each distinct chord label, in order
+    of first appearance. Labels are validated through the shared parse cache
+    the first time they are seen, and the errors of the invalid labels are
+    cached as well, so that each distinct label is parsed only once.
+    """
+
+    def __init__(self, labels: Iterable[str] = ()):
+        """
+        Constructor of the LabelIndex class
+        :param labels: labels to be indexed upfront
+        :type labels: Iterable[str]
+        """
+        self._ids: Dict[str, int] = {}
+        self._errors: Dict[str, Exception] = {}
+        self.labels: List[str] = []
+        for label in labels:
+            self.index(label)
+
+    def index(self, label: str) -> int:
+        """
+        Retrieve the ID of a label, adding the label to the index if needed
+        :param label: a chord annotated according to the Harte notation
+        :type label: str
+        :return: the ID of the label
+        :rtype: int
+        """
+        chord_id = self._ids.get(label)
+        if chord_id is None:
+            error = self._errors.get(label)
+            if error is not None:
+                raise error.with_traceback(None)
+            try:
+                parse_chord(label)
+            except Exception as parse_error:
+                self._errors[label] = parse_error
+                raise
+            chord_id = self._ids[label] = len(self.labels)
+            self.labels.append(label)
+        return chord_id
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._ids
+
+    def __getitem__(self, chord_id: int) -> str:
+        return self.labels[chord_id]
+
+
+class _BatchBuilder:
+    """
+    Accumulate annotations into preallocated arrays of bounded size
+    """
+
+    def __init__(self, chunk_size: int, index, strict: bool):
+        if chunk_size <= 0:
+            raise ValueError("The size of the chunks must be positive.")
+        self.chunk_size = chunk_size
+        self.index = index
+        self.strict = strict
+        self._reset()
+
+    def _reset(self):
+        self.onsets = np.empty(self.chunk_size, dtype=np.float64)
+        self.offsets = np.empty(self.chunk_size, dtype=np.float64)
+        self.chord_ids = np.empty(self.chunk_size, dtype=np.int32)
+        self.size = 0
+
+    def add(self, onset: float, offset: float,
+            label: str) -> Optional[AnnotationBatch]:
+        """
+        Add an annotation, returning a batch when the chunk is full
+        """
+        try:
+            chord_id = self.index.index(label)
+        except Exception:  # pylint: disable=broad-except
+            if self.strict:
+                raise
+            chord_id = INVALID_ID
+        self.onsets[self.size] = onset
+        self.offsets[self.size] = offset
+        self.chord_ids[self.size] = chord_id
+        self.size += 1
+        if self.size == self.chunk_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[AnnotationBatch]:
+        """
+        Return the annotations accumulated so far, if any
+        """
+        if self.size == 0:
+            return None
+        batch = AnnotationBatch(self.onsets[:self.size],
+                                self.offsets[:self.size],
+                                self.chord_ids[:self.size])
+        self._reset()
+        return batch
+
+
+def _iter_lines(path: Union[str, os.PathLike],
+                use_mmap: bool) -> Iterator[bytes]:
+    """
+    Iterate over the lines of a file, optionally memory-mapping it
+    """
+    with open(path, "rb") as file:
+        if use_mmap and os.fstat(file.fileno()).st_size > 0:
+            with mmap.mmap(file.fileno(), 0,
+                           access=mmap.ACCESS_READ) as mapped:
+                yield from iter(mapped.readline, b"")
+        else:
+            yield from file
+
+
+def read_lab(path: Union[str, os.PathLike],
+             index: Optional[LabelIndex] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE,
+             use_mmap: bool = False,
+             strict: bool = True) -> Iterator[AnnotationBatch]:
+    """
+    Stream the annotations of a .lab file, in which each line contains the
+    onset, the offset and the label of a chord separated by whitespaces.
+    Empty lines and lines starting with '#' are skipped
+    :param path: path of the .lab file
+    :type path: Union[str, os.PathLike]
+    :param index: the index used to map labels to IDs (e.g. a LabelIndex or
+    a ChordVocabulary), which can be shared across files. A new LabelIndex is
+    created if not given
+    :type index: LabelIndex
+    :param chunk_size: maximum number of annotations in each batch
+    :type chunk_size: int
+    :param use_mmap: whether to memory-map the file instead of reading it
+    :type use_mmap: bool
+    :param strict: whether to raise an error for labels that are not valid
+    Harte chords. If False, invalid labels get the ID INVALID_ID
+    :type strict: bool
+    :return: an iterator over batches of annotations
+    :rtype: Iterator[AnnotationBatch]
+    """
+    builder = _BatchBuilder(chunk_size,
+                            index if index is not None else LabelIndex(),
+                            strict)
+    for line_number, line in enumerate(_iter_lines(path, use_mmap), 1):
+        line = line.decode("utf-8").strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = line.split(maxsplit=2)
+        if len(fields) != 3:
+            raise ValueError(f"{path}:{line_number}: expected onset, offset "
+                             f"and label, found {line!r}.")
+        batch = builder.add(float(fields[0]), float(fields[1]), fields[2])
+        if batch is not None:
+            yield batch
+    batch = builder.flush()
+    if batch is not None:
+        yield batch
+
+
+def read_jams(path: Union[str, os.PathLike],
+              index: Optional[LabelIndex] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              namespace: str = "chord",
+              strict: bool = True) -> Iterator[AnnotationBatch]:
+    """
+    Stream the chord annotations of a JAMS file, i.e. the observations of the
+    annotations in the given namespace. JAMS files are JSON documents, hence
+    each file is loaded in memory as a whole
+    :param path: path of the JAMS file
+    :type path: Union[str, os.PathLike]
+    :param index: the index used to map labels to IDs (e.g. a LabelIndex or
+    a ChordVocabulary), which can be shared across files. A new LabelIndex is
+    created if not given
+    :type index: LabelIndex
+    :param chunk_size: maximum number of annotations in each batch
+    :type chunk_size: int
+    :param namespace: the namespace of the annotations to be read
+    :type namespace: str
+    :param strict: whether to raise an error for labels that are not valid
+    Harte chords. If False, invalid labels get the ID INVALID_ID
+    :type strict: bool
+    :return: an iterator over batches of annotations
+    :rtype: Iterator[AnnotationBatch]
+    """
+    builder = _BatchBuilder(chunk_size,
+                            index if index is not None else LabelIndex(),
+                            strict)
+    with open(path, "r", encoding="utf-8") as file:
+        jams = json.load(file)
+    for annotation in jams.get("annotations", []):
+        if annotation.get("namespace") != namespace:
+            continue
+        for observation in annotation.get("data", []):
+            onset = float(observation["time"])
+            offset = onset + float(observation["duration"])
+            batch = builder.add(onset, offset, observation["value"])
+            if batch is not None:
+                yield batch
+    batch = builder.flush()
+    if batch is not None:
+        yield batch
+
+
+def read_annotations(paths: Iterable[Union[str, os.PathLike]],
+                     index: Optional[LabelIndex] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     use_mmap: bool = False,
+                     strict: bool = True) \
+        -> Iterator[Tuple[Union[str, os.PathLike], AnnotationBatch]]:
+    """
+    Stream the annotations of a collection of files, sharing the same label
+    index (and the parse cache) across all of them. Files with the .jams
+    extension are read as JAMS files, all the others as .lab files
+    :param paths: paths of the annotation files
+    :type paths: Iterable[Union[str, os.PathLike]]
+    :param index: the index used to map labels to IDs (e.g. a LabelIndex or
+    a ChordVocabulary). A new LabelIndex is created if not given
+    :type index: LabelIndex
+    :param chunk_size: maximum number of annotations in each batch
+    :type chunk_size: int
+    :param use_mmap: whether to memory-map the .lab files
+    :type use_mmap: bool
+    :param strict: whether to raise an error for labels that are not valid
+    Harte chords. If False, invalid labels get the ID INVALID_ID
+    :type strict: bool
+    :return: an iterator over tuples containing the path of a file and a
+    batch of its annotations
+    :rtype: Iterator[Tuple[Union[str, os.PathLike], AnnotationBatch]]
+    """
+    index = index if index is not None else LabelIndex()
+    for path in paths:
+        if os.fspath(path).lower().endswith(".jams"):
+            batches = read_jams(path, index, chunk_size, strict=strict)
+        else:
+            batches = read_lab(path, index, chunk_size, use_mmap, strict)
+        for batch in batches:
+            yield path, batch
@@ -0,0 +1,419 @@
+"""
+Lightweight, music21-free representation of a Harte chord.
+The HarteCore class resolves the degrees of a chord into plain integers and
+answers the most common queries (degrees, MIDI pitches, multi-hot encoding,
+prettify) directly, building the music21-based Harte object only on demand.
+"""
+
+# pylint: disable=import-outside-toplevel
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from harte.parse_harte import ParsedChord, parse_chord
+from harte.utils import BASE_INTERVAL_SEMITONES, degrees_to_key, \
+    interval_offsets, prettify_key, resolve_degrees
+
+if TYPE_CHECKING:
+    from harte.harte import Harte
+
+NOTE_STEPS = "CDEFGAB"
+NATURAL_PITCH_CLASSES = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9,
+                         "B": 11}
+# default spelling of each pitch class, used by music21 for the notes that
+# would need too many accidentals
+PITCH_CLASS_NAMES = ("C", "C#", "D", "Eb", "E", "F", "F#", "G", "G#", "A",
+                     "Bb", "B")
+# levels at which two chords can be considered equivalent (see
+# HarteCore.canonical_key)
+EQUIVALENCE_LEVELS = ("spelling", "enharmonic", "pitch_class_set")
+# highest number of sharps or flats supported for the root of a chord
+MAX_ROOT_ALTERATIONS = 4
+
+
+def is_valid_root(root: str) -> bool:
+    """
+    Check whether the root of a chord can be spelled, i.e. whether it has a
+    single kind of accidental, repeated at most MAX_ROOT_ALTERATIONS times
+    (e.g. 'Cb#' and 'C#####' are not valid)
+    :param root: the root of a chord (e.g. 'Bb')
+    :type root: str
+    :return: True if the root is valid, False otherwise
+    :rtype: bool
+    """
+    alterations = root[1:]
+    return len(alterations) <= MAX_ROOT_ALTERATIONS and \
+        len(set(alterations)) <= 1
+
+
+def root_pitch_class(root: str) -> int:
+    """
+    Compute the pitch class of a root note expressed in Harte notation
+    :param root: the root of a chord (e.g. 'Bb')
+    :type root: str
+    :return: the pitch class of the note (e.g. 10)
+    :rtype: int
+    """
+    if not is_valid_root(root):
+        raise ValueError(f"The root {root} has an unsupported alteration.")
+    return (NATURAL_PITCH_CLASSES[root[0]] + root.count("#")
+            - root.count("b")) % 12
+
+
+def is_spellable_degree(root: str, steps: int) -> bool:
+    """
+    Check whether the degree found a given number of staff steps above a
+    (valid) root can be spelled. The note is named by altering the natural
+    note on the degree's staff step, and the interval from the root to that
+    natural note cannot exceed the perfect or major interval by more than
+    MAX_ROOT_ALTERATIONS semitones (e.g. the fourth of 'Fbbbb' is not valid)
+    :param root: the root of a chord (e.g. 'Bb')
+    :type root: str
+    :param steps: the staff steps that separate the degree from the root
+    :type steps: int
+    :return: True if the degree can be spelled, False otherwise
+    :rtype: bool
+    """
+    root_step = NOTE_STEPS.index(root[0])
+    natural = NOTE_STEPS[(root_step + steps) % 7]
+    semitones = (NATURAL_PITCH_CLASSES[natural]
+                 - NATURAL_PITCH_CLASSES[root[0]]) % 12
+    excess = semitones - BASE_INTERVAL_SEMITONES[steps % 7 + 1]
+    return excess - root.count("#") + root.count("b") <= MAX_ROOT_ALTERATIONS
+
+
+def _spell(step: int, alter: int) -> str:
+    """
+    Build the name of a note given its absolute staff step and alteration
+    :param step: the absolute staff step of the note (0 is C)
+    :type step: int
+    :param alter: the alteration of the note, in semitones
+    :type alter: int
+    :return: the name of the note (e.g. 'Eb'); notes needing more than
+    MAX_ROOT_ALTERATIONS accidentals are respelled as music21 does (e.g.
+    'G#####' becomes 'C')
+    :rtype: str
+    """
+    if abs(alter) > MAX_ROOT_ALTERATIONS:
+        return PITCH_CLASS_NAMES[
+            (NATURAL_PITCH_CLASSES[NOTE_STEPS[step % 7]] + alter) % 12]
+    return NOTE_STEPS[step % 7] + ("#" * alter if alter > 0 else "b" * -alter)
+
+
+class HarteCore:  # pylint: disable=too-many-instance-attributes
+    """
+    Compact value type holding a parsed Harte chord and its resolved degrees.
+    The semitone offsets of the degrees (from the root) are stored as plain
+    integers, so that no music21 object is needed to work with the chord.
+    """
+
+    # one slot per cached property of the chord, so that queries need no
+    # recomputation
+    __slots__ = ("chord", "root", "shorthand", "degrees", "bass",
+                 "all_degrees", "interval_key", "root_pc", "steps",
+                 "semitones", "_harte")
+
+    def __init__(self, chord: str):
+        """
+        Constructor for the HarteCore class. It takes a Harte chord as input,
+        parses it (through the shared parse cache) and resolves its degrees
+        :param chord: a music chord annotated according to the Harte notation
+        :type chord: str
+        """
+        self._init_from_parsed(chord, parse_chord(chord))
+
+    @classmethod
+    def from_parsed(cls, chord: str, parsed_chord: ParsedChord) -> "HarteCore":
+        """
+        Build a HarteCore out of an already parsed chord
+        :param chord: the chord annotated according to the Harte notation
+        :type chord: str
+        :param parsed_chord: the parsed version of the chord
+        :type parsed_chord: ParsedChord
+        :return: the lightweight chord
+        :rtype: HarteCore
+        """
+        core = cls.__new__(cls)
+        core._init_from_parsed(chord, parsed_chord)
+        return core
+
+    def _init_from_parsed(self, chord: str, parsed_chord: ParsedChord):
+        """
+        Initialise the slots of the object out of a parsed chord
+        :param chord: the chord annotated according to the Harte notation
+        :type chord: str
+        :param parsed_chord: the parsed version of the chord
+        :type parsed_chord: ParsedChord
+        """
+        self.chord = chord
+        self.root = parsed_chord.root
+        self.shorthand = parsed_chord.shorthand
+        self.degrees = parsed_chord.degrees
+        self._harte = None
+        if self.root is None:
+            # chord is empty
+            self.bass = None
+            self.all_degrees = ()
+            self.interval_key = 0
+            self.root_pc = None
+            self.steps = ()
+            self.semitones = ()
+            return
+        self.bass = parsed_chord.bass or "1"
+        self.all_degrees = tuple(
+            resolve_degrees(self.shorthand, self.degrees, self.bass))
+        self.interval_key = degrees_to_key(self.all_degrees)
+        self.root_pc = root_pitch_class(self.root)
+        offsets = [interval_offsets(x) for x in self.all_degrees]
+        self.steps = tuple(x[0] for x in offsets)
+        for degree, steps in zip(self.all_degrees, self.steps):
+            if not is_spellable_degree(self.root, steps):
+                raise ValueError(f"The degree {degree} of {self.root} cannot "
+                                 f"be spelled.")
+        self.semitones = tuple(x[1] for x in offsets)
+
+    def is_empty(self) -> bool:
+        """
+        Method to check whether the chord is a no-chord (i.e. N or X)
+        :return: True if the chord has no root, False otherwise
+        :rtype: bool
+        """
+        return self.root is None
+
+    def get_root(self) -> Optional[str]:
+        """
+        Method to retrieve the root of the chord as a string representing the
+        note name (e.g. 'C#')
+        :return: the root of the chord, None if the chord is empty
+        :rtype: str
+        """
+        return self.root
+
+    def get_bass(self) -> Optional[str]:
+        """
+        Method to retrieve the bass of the chord as the interval calculated
+        from the root note (e.g. 'b3')
+        :return: the bass of the chord, None if the chord is empty
+        :rtype: str
+        """
+        return self.bass
+
+    def contains_shorthand(self) -> bool:
+        """
+        Method to check if the chord contains a shorthand or not
+        :return: True if the chord contains a shorthand notation, False
+        otherwise
+        :rtype: bool
+        """
+        return self.shorthand is not None
+
+    def get_shorthand(self) -> Optional[str]:
+        """
+        Method to retrieve the shorthand of the chord
+        :return: the shorthand of the chord (e.g. 'maj7') if it exists, None
+        otherwise
+        :rtype: str
+        """
+        return self.shorthand
+
+    def get_degrees(self) -> Optional[List[str]]:
+        """
+        Method to retrieve the degrees of the chord without considering the
+        degrees associated to the shorthand
+        :return: a list of strings representing the degrees of the chord
+        (e.g. ['b3', '5', '7']), None if there are no explicit degrees
+        :rtype: list[str]
+        """
+        return list(self.degrees) if self.degrees else None
+
+    def unwrap_shorthand(self) -> Optional[List[str]]:
+        """
+        Method to retrieve the degrees of the chord, both those associated to
+        the shorthand and those explicitly specified
+        :return: a list of strings representing the degrees of the chord
+        :rtype: list[str]
+        """
+        if self.shorthand:
+            return list(self.all_degrees)
+        if self.degrees:
+            return list(self.degrees)
+        return None
+
+    def get_interval_key(self) -> int:
+        """
+        Method to retrieve the interval-set key of the chord, i.e. a bitmask
+        in which each degree of the chord (including root and bass) sets its
+        own bit (see harte.utils.degrees_to_key)
+        :return: the interval-set key of the chord, 0 if the chord is empty
+        :rtype: int
+        """
+        return self.interval_key
+
+    def get_pitch_classes(self) -> List[int]:
+        """
+        Method to retrieve the pitch classes of the notes of the chord, in the
+        same order of the resolved degrees
+        :return: a list of pitch classes
+        :rtype: list[int]
+        """
+        return [(self.root_pc + x) % 12 for x in self.semitones]
+
+    def _spelled_pitches(self) -> List[Tuple[str, int]]:
+        """
+        Spell the pitches of the chord, reproducing the voicing of the Harte
+        class: the root is placed in octave 4, each degree is transposed
+        from it and the bass note is moved to octave 3
+        :return: a list of tuples containing name and MIDI number of each
+        pitch, in the same order of the resolved degrees
+        :rtype: list[tuple[str, int]]
+        """
+        root_step = NOTE_STEPS.index(self.root[0])
+        root_natural = NATURAL_PITCH_CLASSES[self.root[0]]
+        root_alter = self.root.count("#") - self.root.count("b")
+        root_midi = 60 + root_natural + root_alter
+
+        def spell_degree(step: int, semitones: int) -> str:
+            absolute_step = root_step + step
+            natural = (NATURAL_PITCH_CLASSES[NOTE_STEPS[absolute_step % 7]]
+                       + 12 * (absolute_step // 7))
+            return _spell(absolute_step,
+                          root_natural + root_alter + semitones - natural)
+
+        def octave_midi(name: str, octave: int) -> int:
+            alter = name.count("#") - name.count("b")
+            return 12 * (octave + 1) + NATURAL_PITCH_CLASSES[name[0]] + alter
+
+        def find(name: str, midi: int) -> Optional[list]:
+            # same lookup order as music21: by name and octave, then by name
+            for pitch in pitches:
+                if pitch[0] == name and pitch[1] == midi:
+                    return pitch
+            for pitch in pitches:
+                if pitch[0] == name:
+                    return pitch
+            return None
+
+        pitches = [[spell_degree(step, semitones), root_midi + semitones]
+                   for step, semitones in zip(self.steps, self.semitones)]
+        root_pitch = find(self.root, root_midi)
+
+        bass_step, bass_semitones = interval_offsets(self.bass)
+        bass_name = spell_degree(bass_step, bass_semitones)
+        bass_midi = root_midi + bass_semitones
+        if (bass_name, bass_midi) != (self.root, root_midi):
+            bass_midi = octave_midi(bass_name, 3)
+        bass_pitch = find(bass_name, bass_midi)
+
+        # set octave of bass and root to 3 and 4 respectively
+        if bass_pitch is not None:
+            bass_pitch[1] = octave_midi(bass_pitch[0], 3)
+        if root_pitch is not None:
+            root_pitch[1] = octave_midi(root_pitch[0], 4)
+        return [tuple(x) for x in pitches]
+
+    def get_midi_pitches(self) -> List[int]:
+        """
+        Method to retrieve the MIDI pitches of the chord
+        :return: a sorted list of integers representing the MIDI pitches of
+        the chord
+        :rtype: list[int]
+        """
+        if self.root is None:
+            return []
+        return sorted(x[1] for x in self._spelled_pitches())
+
+    def multi_hot_encoding(self, transpose: bool = False) -> List[int]:
+        """
+        Method to retrieve the multi-hot encoding of the chord.
+        The multi-hot encoding is a list of integers where each integer is 1 if
+        the corresponding pitch is present in the chord, 0 otherwise
+        :param transpose: whether to transpose the chord so that the root
+        note is at the 0th position
+        :type transpose: bool
+        :return: a list of integers representing the multi-hot encoding of the
+        chord
+        :rtype: list[int]
+        """
+        pitch_classes = set(x % 12 for x in self.semitones) if transpose \
+            else set(self.get_pitch_classes())
+        return [1 if i in pitch_classes else 0 for i in range(12)]
+
+    def prettify(self) -> str:
+        """
+        Method to prettify the chord. It decomposes the chord into its
+        constituent parts and returns a string representing the chord
+        summarising the constituent degrees in shorthands, if possible.
+        The degrees that are not part of the shorthand are sorted, so that the
+        result is deterministic
+        :return: a string representing the chord in Harte notation summarising
+        the constituent degrees in shorthands, if possible. If it is not
+        possible to summarise the chord in a shorthand, the chord is returned
+        in its original form
+        :rtype: str
+        """
+        if self.root is None:
+            # chord is empty
+            return self.chord
+        shorthand = prettify_key(self.interval_key)
+        if shorthand:
+            bass = f"/{self.bass}" if self.bass != "1" else ""
+            return self.root + ":" + shorthand + bass
+        return self.chord
+
+    def to_harte(self) -> "Harte":
+        """
+        Method to materialise the music21-based Harte object corresponding
+        to this chord. The object is built on the first call and reused
+        afterwards
+        :return: the Harte object corresponding to this chord
+        :rtype: Harte
+        """
+        if self._harte is None:
+            from harte.harte import Harte
+            self._harte = Harte(self.chord)
+        return self._harte
+
+    def canonical_key(self, level: str = "spelling") -> tuple:
+        """
+        Method to compute a hashable key identifying the chord at the given
+        level of equivalence:
+          * spelling: same root spelling, set of resolved degrees and bass
+            (e.g. C:maj and C:(3,5))
+          * enharmonic: same root pitch class, set of semitone offsets of the
+            degrees and of the bass (e.g. C#:maj and Db:(3,5), or C:(b3) and
+            C:(#2)). As in the voicing of the Harte class, compound degrees
+            are reduced to simple ones (e.g. C:maj9 and C:maj7(2))
+          * pitch_class_set: same set of pitch classes, regardless of root
+            and bass (e.g. C:maj6 and A:min7)
+        All the no-chords share the same key
+        :param level: one of 'spelling', 'enharmonic' and 'pitch_class_set'
+        :type level: str
+        :return: the canonical key of the chord
+        :rtype: tuple
+        """
+        if level not in EQUIVALENCE_LEVELS:
+            raise ValueError(f"level must be one of {EQUIVALENCE_LEVELS}, "
+                             f"not {level!r}.")
+        if self.root is None:
+            return (level, None)
+        if level == "spelling":
+            return (level, self.root, self.interval_key, self.bass)
+        if level == "enharmonic":
+            return (level, self.root_pc, tuple(sorted(set(self.semitones))),
+                    interval_offsets(self.bass)[1])
+        mask = 0
+        for pitch_class in self.get_pitch_classes():
+            mask |= 1 << pitch_class
+        return (level, mask)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, HarteCore):
+            return self.canonical_key() == other.canonical_key()
+        return False
+
+    def __hash__(self) -> int:
+        return hash(self.canonical_key())
+
+    def __repr__(self) -> str:
+        return f"HarteCore({self.chord})"
+
+    def __str__(self) -> str:
+        return self.chord
@@ -0,0 +1,63 @@
+"""
+Batched encodings of sequences of Harte chords as NumPy arrays.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from harte.core import HarteCore
+
+
+def index_labels(labels: Iterable[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    Deduplicate a sequence of labels, preserving the order of their first
+    occurrence
+    :param labels: a sequence of chords annotated according to the Harte
+    notation
+    :type labels: Iterable[str]
+    :return: a tuple containing the list of the distinct labels and an array
+    mapping each input label to its position in that list
+    :rtype: Tuple[List[str], np.ndarray]
+    """
+    index: Dict[str, int] = {}
+    inverse = np.fromiter((index.setdefault(label, len(index))
+                           for label in labels), dtype=np.intp)
+    return list(index), inverse
+
+
+def encode_many(labels: Iterable[str],
+                transpose: bool = False,
+                out: Optional[np.ndarray] = None,
+                dtype: np.dtype = np.uint8) -> np.ndarray:
+    """
+    Compute the multi-hot encoding of a sequence of chords. Each distinct
+    chord is encoded only once, and the rows of the output are gathered
+    through an index array, so that the cost depends on the number of distinct
+    chords rather than on the length of the sequence
+    :param labels: a sequence of chords annotated according to the Harte
+    notation
+    :type labels: Iterable[str]
+    :param transpose: whether to transpose each chord so that its root note
+    is at the 0th position
+    :type transpose: bool
+    :param out: an optional (N, 12) array in which the result is stored
+    :type out: np.ndarray
+    :param dtype: the data type of the output array (e.g. np.uint8 or bool),
+    ignored if out is given
+    :type dtype: np.dtype
+    :return: an (N, 12) array where each row is the multi-hot encoding of the
+    corresponding chord
+    :rtype: np.ndarray
+    """
+    distinct, inverse = index_labels(labels)
+    if out is None:
+        out = np.empty((len(inverse), 12), dtype=dtype)
+    elif out.shape != (len(inverse), 12):
+        raise ValueError(f"The output array should have shape "
+                         f"{(len(inverse), 12)}, not {out.shape}.")
+    rows = np.array([HarteCore(label).multi_hot_encoding(transpose)
+                     for label in distinct],
+                    dtype=out.dtype).reshape(len(distinct), 12)
+    np.take(rows, inverse, axis=0, out=out)
+    return out
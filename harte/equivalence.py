@@ -0,0 +1,90 @@
+"""
+Equivalence of Harte chords and deduplication of collections of labels.
+Chords are compared through hashable canonical keys computed at one of the
+levels of HarteCore.canonical_key:
+  * spelling          same root spelling, resolved degrees and bass
+  * enharmonic        same root pitch class, semitones of degrees and bass
+  * pitch_class_set   same set of pitch classes
+"""
+
+from typing import TYPE_CHECKING, Hashable, Iterable, List, Tuple, Union
+
+import numpy as np
+
+from harte.core import EQUIVALENCE_LEVELS, HarteCore
+from harte.encoding import index_labels
+
+if TYPE_CHECKING:
+    from harte.harte import Harte
+
+
+def canonical_key(chord: Union[str, "Harte", HarteCore],
+                  level: str = "spelling") -> Hashable:
+    """
+    Compute the canonical key of a chord at the given level of equivalence
+    :param chord: a chord, either as a label or as a Harte or HarteCore
+    object
+    :type chord: Union[str, Harte, HarteCore]
+    :param level: one of 'spelling', 'enharmonic' and 'pitch_class_set'
+    :type level: str
+    :return: the canonical key of the chord
+    :rtype: Hashable
+    """
+    if isinstance(chord, str):
+        chord = HarteCore(chord)
+    return chord.canonical_key(level)
+
+
+def equivalent(first: Union[str, "Harte", HarteCore],
+               second: Union[str, "Harte", HarteCore],
+               level: str = "spelling") -> bool:
+    """
+    Check whether two chords are equivalent at the given level
+    :param first: the first chord
+    :type first: Union[str, Harte, HarteCore]
+    :param second: the second chord
+    :type second: Union[str, Harte, HarteCore]
+    :param level: one of 'spelling', 'enharmonic' and 'pitch_class_set'
+    :type level: str
+    :return: True if the chords have the same canonical key
+    :rtype: bool
+    """
+    return canonical_key(first, level) == canonical_key(second, level)
+
+
+def dedupe(labels: Iterable[str], level: str = "spelling",
+           return_inverse: bool = False) \
+        -> Union[List[str], Tuple[List[str], np.ndarray]]:
+    """
+    Collapse a collection of labels into one representative (the first
+    occurrence) for each class of equivalent chords. Each distinct label is
+    parsed only once, so that the cost is linear in the number of labels
+    :param labels: a sequence of chords annotated according to the Harte
+    notation
+    :type labels: Iterable[str]
+    :param level: one of 'spelling', 'enharmonic' and 'pitch_class_set'
+    :type level: str
+    :param return_inverse: whether to also return, for each label, the index
+    of its representative
+    :type return_inverse: bool
+    :return: the representatives in order of first occurrence and,
+    optionally, the array of the indices of the representatives
+    :rtype: Union[List[str], Tuple[List[str], np.ndarray]]
+    """
+    if level not in EQUIVALENCE_LEVELS:
+        raise ValueError(f"level must be one of {EQUIVALENCE_LEVELS}, "
+                         f"not {level!r}.")
+    distinct, inverse = index_labels(labels)
+    representatives: List[str] = []
+    classes = {}
+    class_ids = np.empty(len(distinct), dtype=np.intp)
+    for i, label in enumerate(distinct):
+        key = HarteCore(label).canonical_key(level)
+        class_id = classes.get(key)
+        if class_id is None:
+            class_id = classes[key] = len(representatives)
+            representatives.append(label)
+        class_ids[i] = class_id
+    if return_inverse:
+        return representatives, class_ids[inverse]
+    return representatives
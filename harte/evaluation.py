@@ -0,0 +1,346 @@
+"""
+Vectorized evaluation of estimated chord annotations against reference ones,
+following the MIREX comparison rules (as implemented in mir_eval.chord):
+  * root          same root
+  * majmin        same root and triad, for maj/min references
+  * thirds        same root and third
+  * triads        same root and triad (first 8 semitones)
+  * sevenths      same root and quality, for maj/min/maj7/7/min7 references
+  * tetrads       same root and quality (all the semitones within the octave)
+  * mirex         at least three pitch classes in common
+and their inversion-aware variants (e.g. majmin_inv), which also require
+the same bass. The segment boundaries of the two annotations are merged,
+each distinct label is resolved only once, and every rule is computed with
+mask operations over all the segments. Scores are weighted by the duration
+of the segments; segments excluded by a rule (e.g. a 7 reference for
+majmin, or an X reference for any rule) are ignored, while X estimates
+never match.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from harte.core import HarteCore
+from harte.encoding import index_labels
+from harte.utils import interval_offsets
+from harte.vocabulary import NO_CHORD, UNKNOWN_CHORD
+
+COMPARISONS = ("root", "majmin", "majmin_inv", "thirds", "thirds_inv",
+               "triads", "triads_inv", "sevenths", "sevenths_inv", "tetrads",
+               "tetrads_inv", "mirex")
+
+# root-relative semitones of the qualities accepted by majmin and sevenths
+_QUALITIES = {
+    "maj": (0, 4, 7), "min": (0, 3, 7), "maj7": (0, 4, 7, 11),
+    "7": (0, 4, 7, 10), "min7": (0, 3, 7, 10),
+}
+_MAJMIN = ("maj", "min")
+_SEVENTHS = ("maj", "min", "maj7", "7", "min7")
+# minimum number of pitch classes in common for the mirex rule
+MIREX_MIN_INTERSECTION = 3
+# mask of the unknown chords, which cannot be the mask of any chord
+UNKNOWN_MASK = 0xFFFF
+# number of semitones of each 12-bit mask
+_POPCOUNT = np.array([bin(x).count("1") for x in range(1 << 12)],
+                     dtype=np.int8)
+
+
+class ChordEncoding(NamedTuple):
+    """
+    Encoding of a sequence of chords: the pitch class of the root (-1 for
+    no-chords), the root-relative mask of the semitones within the octave
+    (bit i is set if the chord contains the note i semitones above the root,
+    UNKNOWN_MASK for unknown chords) and the semitones between root and bass
+    (-1 for no-chords)
+    """
+    roots: np.ndarray
+    masks: np.ndarray
+    basses: np.ndarray
+
+
+def _quality_mask(quality: str) -> int:
+    """
+    Compute the root-relative mask of a quality
+    """
+    return sum(1 << x for x in _QUALITIES[quality])
+
+
+@lru_cache(maxsize=None)
+def _encode_label(label: str) -> Tuple[int, int, int]:
+    """
+    Encode a chord as a tuple of root, mask and bass. As in MIREX, the
+    degrees beyond the octave (e.g. 9, 11 and 13) are not part of the mask,
+    while the bass is
+    """
+    if label.strip() == UNKNOWN_CHORD:
+        return -1, UNKNOWN_MASK, -1
+    core = HarteCore(label)
+    if core.is_empty():
+        return -1, 0, -1
+    mask = 0
+    for degree, semitones in zip(core.all_degrees, core.semitones):
+        number = int("".join(x for x in degree if x.isdigit()))
+        if number <= 7 and 0 <= semitones < 12:
+            mask |= 1 << semitones
+    bass = interval_offsets(core.bass)[1] % 12
+    return core.root_pc, mask | 1 << bass, bass
+
+
+def encode_labels(labels: Iterable[str]) -> ChordEncoding:
+    """
+    Encode a sequence of chords, resolving each distinct label only once
+    :param labels: a sequence of chords annotated according to the Harte
+    notation
+    :type labels: Iterable[str]
+    :return: the roots, masks and basses of the chords
+    :rtype: ChordEncoding
+    """
+    distinct, inverse = index_labels(labels)
+    roots, masks, basses = zip(*(_encode_label(label)
+                                 for label in distinct)) \
+        if distinct else ((), (), ())
+    return ChordEncoding(np.array(roots, dtype=np.int8)[inverse],
+                         np.array(masks, dtype=np.uint16)[inverse],
+                         np.array(basses, dtype=np.int8)[inverse])
+
+
+def merge_segments(reference_intervals: np.ndarray,
+                   estimated_intervals: np.ndarray) \
+        -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge the segment boundaries of two annotations over the time span of
+    the reference one
+    :param reference_intervals: the (N, 2) onsets and offsets of the
+    reference chords, sorted by onset
+    :type reference_intervals: np.ndarray
+    :param estimated_intervals: the (M, 2) onsets and offsets of the
+    estimated chords, sorted by onset
+    :type estimated_intervals: np.ndarray
+    :return: the duration of each merged segment and the indices of the
+    reference and estimated chords covering it (-1 for the gaps)
+    :rtype: Tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    reference_intervals = np.asarray(reference_intervals,
+                                     dtype=np.float64).reshape(-1, 2)
+    estimated_intervals = np.asarray(estimated_intervals,
+                                     dtype=np.float64).reshape(-1, 2)
+    if len(reference_intervals) == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return np.empty(0), empty, empty
+    start = reference_intervals[:, 0].min()
+    end = reference_intervals[:, 1].max()
+    boundaries = np.unique(np.clip(np.concatenate(
+        [reference_intervals.ravel(), estimated_intervals.ravel()]),
+        start, end))
+    midpoints = (boundaries[:-1] + boundaries[1:]) / 2
+
+    def locate(intervals: np.ndarray) -> np.ndarray:
+        indices = np.searchsorted(intervals[:, 0], midpoints,
+                                  side="right") - 1
+        inside = indices >= 0
+        inside[inside] = midpoints[inside] < intervals[indices[inside], 1]
+        return np.where(inside, indices, -1)
+
+    return np.diff(boundaries), locate(reference_intervals), \
+        locate(estimated_intervals)
+
+
+def _matches(rule: str, reference: ChordEncoding, estimated: ChordEncoding,
+             ref_masks: np.ndarray, est_masks: np.ndarray) -> np.ndarray:
+    """
+    Find the pairs of chords matching according to a rule, regardless of
+    the bass
+    """
+    eq_roots = reference.roots == estimated.roots
+    if rule == "root":
+        return eq_roots
+    if rule == "thirds":
+        return eq_roots & ((ref_masks ^ est_masks) & 1 << 3 == 0)
+    if rule == "mirex":
+        common = _rotate(ref_masks, reference.roots) & \
+            _rotate(est_masks, estimated.roots)
+        return (_POPCOUNT[common] >= MIREX_MIN_INTERSECTION) | \
+            ((reference.roots < 0) & (estimated.roots < 0))
+    # triads only consider the semitones up to the fifth
+    width = 0xFF if rule == "triads" else 0xFFF
+    return eq_roots & ((ref_masks ^ est_masks) & width == 0)
+
+
+def _evaluated(rule: str, inversions: bool, reference: ChordEncoding,
+               ref_masks: np.ndarray) -> np.ndarray:
+    """
+    Find the pairs of chords evaluated by a rule, i.e. those whose
+    reference chord is not excluded
+    """
+    # unknown reference chords are always excluded
+    evaluated = reference.masks != UNKNOWN_MASK
+    no_chord = (reference.roots < 0) & (ref_masks == 0)
+    if rule in ("majmin", "sevenths"):
+        qualities, width = (_MAJMIN, 0xFF) if rule == "majmin" \
+            else (_SEVENTHS, 0xFFF)
+        valid = np.isin(ref_masks & width,
+                        [_quality_mask(x) & width for x in qualities])
+        if inversions:
+            # the bass must be a note of the reference chord
+            valid &= ref_masks >> np.maximum(reference.basses, 0) & 1 > 0
+        evaluated &= valid | no_chord
+    if rule == "mirex":
+        n_notes = _POPCOUNT[ref_masks]
+        evaluated &= (n_notes == 0) | (n_notes >= MIREX_MIN_INTERSECTION)
+    return evaluated
+
+
+def compare(reference: ChordEncoding, estimated: ChordEncoding,
+            comparison: str) -> np.ndarray:
+    """
+    Compare two aligned sequences of encoded chords according to a rule
+    :param reference: the encoded reference chords
+    :type reference: ChordEncoding
+    :param estimated: the encoded estimated chords
+    :type estimated: ChordEncoding
+    :param comparison: one of COMPARISONS
+    :type comparison: str
+    :return: the score of each pair of chords: 1 if they match, 0 if they
+    do not, -1 if the pair is excluded from the evaluation
+    :rtype: np.ndarray
+    """
+    if comparison not in COMPARISONS:
+        raise ValueError(f"comparison must be one of {COMPARISONS}, "
+                         f"not {comparison!r}.")
+    rule, inversions = comparison.replace("_inv", ""), \
+        comparison.endswith("_inv")
+    est_unknown = estimated.masks == UNKNOWN_MASK
+    ref_masks = np.where(reference.masks == UNKNOWN_MASK, 0, reference.masks)
+    est_masks = np.where(est_unknown, 0, estimated.masks)
+    # majmin is scored as triads, on the references it does not exclude
+    scores = _matches("triads" if rule == "majmin" else rule, reference,
+                      estimated, ref_masks, est_masks)
+    if inversions:
+        scores = scores & (reference.basses == estimated.basses)
+    # unknown estimated chords never match
+    scores = (scores & ~est_unknown).astype(np.float64)
+    scores[~_evaluated(rule, inversions, reference, ref_masks)] = -1
+    return scores
+
+
+def _rotate(masks: np.ndarray, roots: np.ndarray) -> np.ndarray:
+    """
+    Rotate root-relative masks to absolute pitch classes
+    """
+    masks = masks.astype(np.int32)
+    shifts = np.maximum(roots, 0).astype(np.int32)
+    return (masks << shifts | masks >> (12 - shifts)) & 0xFFF
+
+
+def _weighted_scores(durations: np.ndarray, reference: ChordEncoding,
+                     estimated: ChordEncoding,
+                     comparisons: Sequence[str]) -> Dict[str, Tuple[float,
+                                                                    float]]:
+    """
+    Compute, for each rule, the matched and the evaluated duration
+    """
+    totals = {}
+    for comparison in comparisons:
+        scores = compare(reference, estimated, comparison)
+        evaluated = scores >= 0
+        totals[comparison] = (float(np.sum(durations * (scores > 0))),
+                              float(np.sum(durations[evaluated])))
+    return totals
+
+
+def _append_track(labels: List[str], indices: List[np.ndarray],
+                  track_labels: Sequence[str], track_indices: np.ndarray,
+                  n_intervals: int) -> None:
+    """
+    Append the labels of an annotation of a track, and the indices of the
+    labels covering its merged segments. The gaps (index -1) select a
+    no-chord appended to the labels
+    """
+    start = len(labels)
+    labels.extend(track_labels)
+    if len(labels) - start != n_intervals:
+        raise ValueError("Each interval must have exactly one label.")
+    labels.append(NO_CHORD)
+    indices.append(np.where(track_indices < 0, len(labels) - 1,
+                            track_indices + start))
+
+
+def _aligned_encodings(tracks: Iterable[Tuple[np.ndarray, Sequence[str],
+                                              np.ndarray, Sequence[str]]]) \
+        -> Tuple[np.ndarray, ChordEncoding, ChordEncoding]:
+    """
+    Merge the segments of the annotations of each track and encode the
+    chords covering each segment (gaps are filled with no-chords). The
+    labels of all the tracks are encoded at once
+    """
+    durations, ref_indices, est_indices = [], [], []
+    ref_labels: List[str] = []
+    est_labels: List[str] = []
+    for ref_intervals, track_ref_labels, est_intervals, track_est_labels \
+            in tracks:
+        track_durations, track_ref, track_est = merge_segments(
+            ref_intervals, est_intervals)
+        durations.append(track_durations)
+        _append_track(ref_labels, ref_indices, track_ref_labels, track_ref,
+                      len(ref_intervals))
+        _append_track(est_labels, est_indices, track_est_labels, track_est,
+                      len(est_intervals))
+    reference = encode_labels(ref_labels)
+    estimated = encode_labels(est_labels)
+    ref_indices = np.concatenate(ref_indices or [np.empty(0, np.intp)])
+    est_indices = np.concatenate(est_indices or [np.empty(0, np.intp)])
+    return np.concatenate(durations or [np.empty(0)]), \
+        ChordEncoding(*(x[ref_indices] for x in reference)), \
+        ChordEncoding(*(x[est_indices] for x in estimated))
+
+
+def evaluate(reference_intervals: np.ndarray,
+             reference_labels: Sequence[str],
+             estimated_intervals: np.ndarray,
+             estimated_labels: Sequence[str],
+             comparisons: Sequence[str] = COMPARISONS) -> Dict[str, float]:
+    """
+    Evaluate an estimated annotation against a reference one
+    :param reference_intervals: the (N, 2) onsets and offsets of the
+    reference chords, sorted by onset
+    :type reference_intervals: np.ndarray
+    :param reference_labels: the N reference chords
+    :type reference_labels: Sequence[str]
+    :param estimated_intervals: the (M, 2) onsets and offsets of the
+    estimated chords, sorted by onset
+    :type estimated_intervals: np.ndarray
+    :param estimated_labels: the M estimated chords
+    :type estimated_labels: Sequence[str]
+    :param comparisons: the rules to be computed
+    :type comparisons: Sequence[str]
+    :return: the duration-weighted score of each rule (0 if no segment is
+    evaluated)
+    :rtype: Dict[str, float]
+    """
+    return evaluate_many([(reference_intervals, reference_labels,
+                           estimated_intervals, estimated_labels)],
+                         comparisons)
+
+
+def evaluate_many(tracks: Iterable[Tuple[np.ndarray, Sequence[str],
+                                         np.ndarray, Sequence[str]]],
+                  comparisons: Sequence[str] = COMPARISONS) \
+        -> Dict[str, float]:
+    """
+    Evaluate a corpus of annotations, weighting each segment by its duration
+    across all the tracks
+    :param tracks: an iterable of tuples containing reference intervals,
+    reference labels, estimated intervals and estimated labels of a track
+    :type tracks: Iterable[Tuple[np.ndarray, Sequence[str], np.ndarray,
+    Sequence[str]]]
+    :param comparisons: the rules to be computed
+    :type comparisons: Sequence[str]
+    :return: the duration-weighted score of each rule over the corpus (0
+    if no segment is evaluated)
+    :rtype: Dict[str, float]
+    """
+    totals = _weighted_scores(*_aligned_encodings(tracks), comparisons)
+    return {comparison: matched / evaluated if evaluated > 0 else 0.0
+            for comparison, (matched, evaluated) in totals.items()}
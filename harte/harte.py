@@ -3,25 +3,40 @@ Extension of the Chord class from music21.chord to support the
 Harte notation.
 """
 
-# pylint: disable=consider-using-dict-items
-from typing import List, Union
+# pylint: disable=consider-using-dict-items,attribute-defined-outside-init
+from typing import Any, Callable, FrozenSet, Iterable, Iterator, List, \
+    Optional, Tuple, Union
 
 from music21.chord import Chord, ChordException
 from music21.note import Note
 
-from harte.interval import HarteInterval
-from harte.mappings import SHORTHAND_DEGREES, DEGREE_SHORTHAND_MAP
-from harte.parse_harte import PARSER
-from harte.utils import degree_to_sort_key
+from harte.core import HarteCore
+from harte.interval import PITCH_TABLE
+from harte.mappings import SHORTHAND_DEGREES
+from harte.parse_harte import DEFAULT_DELIMITERS, ParsedChord, \
+    SequenceToken, parse_chord, parse_sequence
+from harte.profiling import PROFILER
+from harte.utils import degrees_to_key, prettify_key, resolve_degrees
+from harte.validation import check
 
+# key of the music21 cache under which the values derived from the pitches of
+# the chord are stored
+_CACHE_KEY = "harte"
+# key of the music21 cache marking the chords whose pitches have not been
+# changed since their construction, which can be pickled in compact form
+_PRISTINE_KEY = "harte_pristine"
 
-class Harte(Chord):
+
+# the parsed chord is kept in its own attributes, next to the music21 ones
+class Harte(Chord):  # pylint: disable=too-many-instance-attributes
     """
     Extension of the Chord class from music21.chord to support the
     Harte notation.
     """
 
-    def __init__(self, chord: str, **keywords):
+    # Chord.__init__ is called by _init_from_parsed, shared with from_parsed
+    def __init__(self, chord: str,  # pylint: disable=super-init-not-called
+                 **keywords):
         """
         Constructor for the Harte class. It takes a Harte chord as input
         and parses it to extract the root, bass, degrees and shorthand. The
@@ -30,74 +45,126 @@ class Harte(Chord):
         :param chord: a music chord annotated according to the Harte notation
         :type chord: str
         """
+        # stages are timed only when profiling is enabled
+        profiler = PROFILER if PROFILER.enabled else None
+        start = profiler.start() if profiler else 0
+
+        # parse the chord (parsing is cached on the chord string)
+        try:
+            parsed_chord = parse_chord(chord)
+        except NameError as name_error:
+            raise ChordException(
+                f"The input chord {chord} is not a valid Harte chord"
+            ) from name_error
+        if profiler:
+            start = profiler.record("parse", start)
+        self._init_from_parsed(chord, parsed_chord, start, **keywords)
+
+    @classmethod
+    def from_parsed(cls, chord: str, parsed_chord: ParsedChord,
+                    **keywords) -> "Harte":
+        """
+        Build a Harte object out of an already parsed chord, without parsing
+        the chord again
+        :param chord: a music chord annotated according to the Harte notation
+        :type chord: str
+        :param parsed_chord: the parsed version of the chord
+        :type parsed_chord: ParsedChord
+        :return: the chord
+        :rtype: Harte
+        """
+        harte = cls.__new__(cls)
+        start = PROFILER.start() if PROFILER.enabled else 0
+        harte._init_from_parsed(chord, parsed_chord, start, **keywords)
+        return harte
+
+    @classmethod
+    def sequence(cls, text: Union[str, Iterable[str]],
+                 delimiters: str = DEFAULT_DELIMITERS) \
+            -> Iterator[Tuple[SequenceToken, Optional["Harte"]]]:
+        """
+        Lazily build the chords of a progression (see parse_sequence). Each
+        chord is parsed only once, and invalid tokens do not interrupt the
+        progression
+        :param text: the progression, either as a string or as an iterable
+        of chunks (e.g. the lines of a file)
+        :type text: Union[str, Iterable[str]]
+        :param delimiters: the characters separating the chords
+        :type delimiters: str
+        :return: an iterator over tuples containing each token of the
+        progression and the corresponding chord, which is None if the token
+        is not a valid chord (the position of the error is then given by the
+        error field of the token)
+        :rtype: Iterator[Tuple[SequenceToken, Optional[Harte]]]
+        """
+        for token in parse_sequence(text, delimiters):
+            chord = None
+            if token.chord is not None:
+                try:
+                    chord = cls.from_parsed(token.label, token.chord)
+                except Exception:  # pylint: disable=broad-except
+                    # the chord can be parsed, but its notes cannot be
+                    # resolved (e.g. C:(##3))
+                    error = check(token.label)
+                    token = token._replace(
+                        chord=None,
+                        error=token.start + (error[1] if error else 0))
+            yield token, chord
+
+    def _init_from_parsed(self, chord: str, parsed_chord: ParsedChord,
+                          start: int, **keywords):
+        """
+        Initialise the chord out of its parsed version
+        :param chord: a music chord annotated according to the Harte notation
+        :type chord: str
+        :param parsed_chord: the parsed version of the chord
+        :type parsed_chord: ParsedChord
+        :param start: the time at which the construction started, only used
+        when profiling is enabled
+        :type start: int
+        """
+        profiler = PROFILER if PROFILER.enabled and start else None
         self.chord = chord
+        self._parsed_chord = parsed_chord
         self._root = None
         self._bass = None
         self._all_degrees = ["1"]
         self._shorthand = []
         self._degrees = []
         self._shorthand_degrees = []
-
-        # parse the chord
-        try:
-            parsed_chord = PARSER.parse(chord)
-        except NameError as name_error:
-            raise ChordException(
-                f"The input chord {chord} is not a valid Harte chord"
-            ) from name_error
+        self._interval_key = 0
 
         # chord is not empty
-        if "root" in parsed_chord:
+        if parsed_chord.root is not None:
             # retrieve information from the parsed chord
-            self._root = parsed_chord["root"]
-            self._shorthand = parsed_chord.get("shorthand", None)
-            self._degrees = parsed_chord.get("degrees", [])
-            self._bass = parsed_chord.get("bass", "1")
-            removed_degrees = (
-                [x.replace("*", "") for x in self._degrees if x.startswith("*")]
-                if self._degrees
-                else []
+            self._root = parsed_chord.root
+            self._shorthand = parsed_chord.shorthand
+            self._degrees = list(parsed_chord.degrees)
+            self._bass = parsed_chord.bass or "1"
+            self._all_degrees = resolve_degrees(
+                self._shorthand, self._degrees, self._bass
             )
-
-            # unwrap shorthand if it exists and merge with degrees
             if self._shorthand:
-                assert SHORTHAND_DEGREES[
-                    self._shorthand
-                ], "The Harte shorthand is not valid."
                 self._shorthand_degrees = SHORTHAND_DEGREES[self._shorthand]
-                self._all_degrees += self._shorthand_degrees + self._degrees
-            # if no shorthand exists, just use the degrees
-            elif self._degrees and len(self._degrees) > len(removed_degrees):
-                self._all_degrees += self._degrees
-            # if no degrees exist, assume the chord is a major triad
-            else:
-                self._all_degrees += ["3", "5"]
-
-            # remove the degrees included in removed_degrees and the ones that start with '*'
-            self._all_degrees = [
-                x
-                for x in set(self._all_degrees)
-                if x not in removed_degrees and x[0] != "*"
-            ]
-            # add root and bass note to the overall list of degrees
-            self._all_degrees.append(self._bass)
-
-            # sort the list and remove duplicates
-            self._all_degrees = list(set(self._all_degrees))
-            self._all_degrees.sort(key=degree_to_sort_key)
+            self._interval_key = degrees_to_key(self._all_degrees)
+            if profiler:
+                start = profiler.record("degrees", start)
 
             # convert notes and interval to m21 primitives
             # note that when multiple flats are introduced (i.e. Cbb) music21
             # won't be able to parse the note.
             # this is fixed by replacing each 'b' with a '-'.
+            # the transposed notes are looked up in the shared pitch table
             m21_root = Note(self._root.replace("b", "-"), octave=4)
             m21_degrees = [
-                HarteInterval(x, octave=4).transposeNote(m21_root)
+                PITCH_TABLE.note(self._root, x, octave=4)
                 for x in self._all_degrees
             ]
-            m21_bass = HarteInterval(self._bass).transposeNote(m21_root)
+            m21_bass = PITCH_TABLE.note(self._root, self._bass, octave=4)
             if m21_root != m21_bass:
                 m21_bass.octave = 3
+            if profiler:
+                start = profiler.record("intervals", start)
 
             # initialize the parent constructor
             super().__init__(m21_degrees, **keywords)
@@ -110,16 +177,61 @@ class Harte(Chord):
         else:
             # chord is empty
             super().__init__()
+        self._cache[_PRISTINE_KEY] = True
+        if profiler:
+            profiler.record("chord", start)
 
     def __deepcopy__(self, *args, **kwargs):
         """
         Perform a deepcopy of this object by creating a new identical
-        object with the input chord used for this one.
+        object with the input chord used for this one, reusing its parsed
+        version.
 
         :return: A copy of the current object.
         :rtype: Harte
         """
-        return Harte(self.chord)
+        return Harte.from_parsed(self.chord, self._parsed_chord)
+
+    def __getstate__(self) -> Union[Tuple, dict]:
+        """
+        Retrieve the state of the chord used for pickling and copying. Unless
+        the pitches of the chord have been changed since its construction
+        (e.g. by an in-place transposition), the state is compact: the input
+        chord, its parsed fields, its duration and its offset. Other music21
+        attributes (e.g. lyrics or expressions) are not preserved in this
+        case. The full music21 state is used otherwise.
+
+        :return: a tuple containing the chord, root, shorthand, degrees,
+        bass, duration (in quarter lengths) and offset, or the music21 state
+        :rtype: Union[Tuple, dict]
+        """
+        if not self._cache.get(_PRISTINE_KEY):
+            return super().__getstate__()
+        return (self.chord,) + tuple(self._parsed_chord) + \
+            (self.duration.quarterLength, self.offset)
+
+    def __setstate__(self, state: Union[Tuple, dict]):
+        """
+        Restore the chord from its state, without parsing it again.
+
+        :param state: the state returned by __getstate__
+        :type state: Union[Tuple, dict]
+        """
+        if isinstance(state, dict):
+            super().__setstate__(state)
+            return
+        chord, *fields, quarter_length, offset = state
+        self._init_from_parsed(chord, ParsedChord(*fields), 0)
+        self.duration.quarterLength = quarter_length
+        self.offset = offset
+        # the pitches are unchanged
+        self._cache[_PRISTINE_KEY] = True
+
+    def __reduce__(self):
+        """
+        Pickle (and shallow copy) the chord through its state.
+        """
+        return _new_harte, (type(self),), self.__getstate__()
 
     def get_degrees(self) -> List[str]:
         """
@@ -131,28 +243,102 @@ class Harte(Chord):
         """
         return self._degrees if self._degrees else None
 
+    def _cached(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Retrieve a value derived from the pitches of the chord, computing it
+        on the first access. The values are stored in the music21 cache of the
+        chord, which is cleared whenever the chord is mutated (e.g. when
+        pitches are added or removed, or when the chord is transposed in
+        place). Changes made directly to the Pitch objects of the chord are
+        not detected
+        :param name: the name of the value
+        :type name: str
+        :param compute: the function computing the value
+        :type compute: Callable[[], Any]
+        :return: the value
+        :rtype: Any
+        """
+        cache = self._cache.setdefault(_CACHE_KEY, {})
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = compute()
+            return value
+
+    def _invalidate_cache(self):
+        """
+        Discard the values derived from the pitches of the chord
+        """
+        self._cache.pop(_CACHE_KEY, None)
+        self._cache.pop(_PRISTINE_KEY, None)
+
+    def transpose(self, value, *, inPlace=False):
+        """
+        Transpose the chord (see music21.chord.Chord.transpose), discarding
+        the cached values derived from its pitches when transposing in place
+        """
+        transposed = super().transpose(value, inPlace=inPlace)
+        if inPlace:
+            self._invalidate_cache()
+        return transposed
+
+    def root(self, newroot=None, **keywords):
+        """
+        Retrieve or set the root of the chord (see music21.chord.Chord.root),
+        discarding the cached values derived from the root when it is set
+        """
+        if newroot is not None:
+            self._invalidate_cache()
+        return super().root(newroot, **keywords)
+
     def get_midi_pitches(self) -> List[int]:
         """
-        Method to retrieve the MIDI pitches of the chord
+        Method to retrieve the MIDI pitches of the chord. The pitches are
+        computed on the first call and cached
         :return: a list of integers representing the MIDI pitches of the chord
         """
-        return sorted([x.midi for x in self.pitches])
+        return list(self._cached(
+            "midi_pitches", lambda: tuple(sorted(x.midi for x in self.pitches))
+        ))
+
+    def get_pitch_class_set(self) -> FrozenSet[int]:
+        """
+        Method to retrieve the set of the pitch classes of the chord. The set
+        is computed on the first call and cached
+        :return: the pitch classes of the chord
+        :rtype: FrozenSet[int]
+        """
+        return self._cached(
+            "pitch_class_set", lambda: frozenset(x.pitchClass
+                                                 for x in self.pitches))
 
     def multi_hot_encoding(self, transpose: bool = False) -> List[int]:
         """
         Method to retrieve the multi-hot encoding of the chord in Harte notation.
         The multi-hot encoding is a list of integers where each integer is 1 if
-        the corresponding pitch is present in the chord, 0 otherwise
+        the corresponding pitch is present in the chord, 0 otherwise. The
+        encodings are computed on the first call and cached
         :return: a list of integers representing the multi-hot encoding of the
         chord in Harte notation
         """
-        pitch_classes = [x.pitchClass for x in self.pitches]
         if transpose:
-            # get the pitch class of the root note
-            root_pitch_class = self.root().pitchClass
-            # transpose the chord so that the root note is at the 0th position
-            pitch_classes = [(x - root_pitch_class) % 12 for x in pitch_classes]
-        return [1 if i in pitch_classes else 0 for i in range(12)]
+            return list(self._cached("root_relative",
+                                     self._root_relative_encoding))
+        return list(self._cached(
+            "multi_hot", lambda: tuple(
+                1 if i in self.get_pitch_class_set() else 0
+                for i in range(12))))
+
+    def _root_relative_encoding(self) -> Tuple[int, ...]:
+        """
+        Compute the multi-hot encoding of the chord transposed so that the
+        root note is at the 0th position
+        """
+        # get the pitch class of the root note
+        root_pitch_class = self.root().pitchClass
+        pitch_classes = {(x - root_pitch_class) % 12
+                         for x in self.get_pitch_class_set()}
+        return tuple(1 if i in pitch_classes else 0 for i in range(12))
 
     def get_root(self) -> str:
         """
@@ -202,42 +388,35 @@ class Harte(Chord):
         """
         return self._shorthand
 
+    def get_interval_key(self) -> int:
+        """
+        Method to retrieve the interval-set key of the chord, i.e. a bitmask
+        in which each degree of the chord (including root and bass) sets its
+        own bit (see harte.utils.degrees_to_key)
+        :return: the interval-set key of the chord, 0 if the chord is empty
+        :rtype: int
+        """
+        return self._interval_key
+
     def prettify(self) -> str:
         """
         Method to prettify the chord in Harte notation. It decomposes the chord
         into its constituent parts and returns a string representing the chord
         in Harte notation summarising the constituent degrees in shorthands,
-        if possible
+        if possible. The degrees that are not part of the shorthand are
+        sorted, so that the result is deterministic
         :return: a string representing the chord in Harte notation summarising
         the constituent degrees in shorthands, if possible. If it is not
         possible to summarise the chord in a shorthand, the chord is returned
         in its original form
         :rtype: str
         """
-        separator, shorthand = None, None
-        assert self._all_degrees, "The chord is empty: no degrees to prettify."
-        degrees = self._all_degrees
-        if "1" in degrees:
-            degrees.remove("1")
-        for grades in DEGREE_SHORTHAND_MAP.keys():
-            intersection = set(grades).intersection(degrees)
-            if len(intersection) == len(grades):
-                shorthand = DEGREE_SHORTHAND_MAP[grades]
-                clean_harte_degrees = list(set(degrees) - intersection)
-                if "sus" in shorthand and "*3" in clean_harte_degrees:
-                    clean_harte_degrees.remove("*3")
-                break
+        if self._root is None:
+            return self.chord
+        shorthand = prettify_key(self._interval_key)
         if shorthand:
-            clean_harte_degrees = (
-                f'({",".join(clean_harte_degrees)})'
-                if len(clean_harte_degrees) > 0
-                else ""
-            )
-            if len(shorthand) > 0 or len(clean_harte_degrees) > 0:
-                separator = ":"
-
             bass = f"/{self._bass}" if self._bass != "1" else ""
-            return self._root + separator + shorthand + clean_harte_degrees + bass
+            return self._root + ":" + shorthand + bass
         return self.chord
 
     def unwrap_shorthand(self) -> Union[List[str], None]:
@@ -262,13 +441,39 @@ class Harte(Chord):
         :return: True if the two HarteChord objects are equal, False otherwise
         """
         if isinstance(other, Harte):
-            return (
-                self._root == other.get_root()
-                and self._degrees == other.get_degrees()
-                and self._bass == other.get_bass()
-            )
+            return self.canonical_key() == other.canonical_key()
         return False
 
+    def __hash__(self):
+        """
+        Method to compute the hash of the HarteChord object, consistent with
+        the equality (i.e. based on the spelling-sensitive canonical key).
+        Since the key is derived from the input chord, the hash does not
+        change when the music21 chord is mutated (e.g. transposed in place),
+        so that the object can be safely stored in sets and dictionaries
+        :return: the hash of the object
+        """
+        return hash(self.canonical_key())
+
+    def canonical_key(self, level: str = "spelling") -> tuple:
+        """
+        Method to compute a hashable key identifying the chord at the given
+        level of equivalence (see HarteCore.canonical_key). Two Harte objects
+        are equal if their spelling-sensitive keys are equal, so that, for
+        example, C:maj and C:(3,5) are equal. Note that the key is based on
+        the input chord, and does not reflect changes made to the music21
+        chord after its construction. The key is computed once per level and
+        cached along with the other values derived from the chord
+        :param level: one of 'spelling', 'enharmonic' and 'pitch_class_set'
+        :type level: str
+        :return: the canonical key of the chord
+        :rtype: tuple
+        """
+        return self._cached(
+            f"canonical_key_{level}",
+            lambda: HarteCore.from_parsed(
+                self.chord, self._parsed_chord).canonical_key(level))
+
     def __repr__(self):
         """
         Method to represent the HarteChord object as a string
@@ -293,3 +498,11 @@ class Harte(Chord):
             chord_str = "N"
 
         return chord_str
+
+
+def _new_harte(cls: type) -> Harte:
+    """
+    Create an uninitialised Harte object, which is then initialised by
+    __setstate__ when unpickling
+    """
+    return cls.__new__(cls)
@@ -1,11 +1,159 @@
 """
 Extension of the Interval class from music21.interval to support the
 Harte notation.
+Transposing a note by a Harte degree is resolved through PITCH_TABLE, a
+process-wide table mapping each pair of root spelling and degree to the
+spelling, octave offset and MIDI number of the resulting pitch, so that the
+music21 interval arithmetic runs at most once per pair. The table is filled
+lazily, or upfront with PitchTable.fill.
 """
 
+import re
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from music21.exceptions21 import Music21Exception
 from music21.interval import Interval, IntervalException
+from music21.note import Note
+from music21.pitch import Pitch
+
+from harte.core import MAX_ROOT_ALTERATIONS, NOTE_STEPS
+from harte.utils import DEGREE_TABLE, convert_interval
+
+# octave of the root used to compute the MIDI numbers of the table
+TABLE_OCTAVE = 4
+# music21 names of the pitches that can be looked up in the table
+_TABLE_NAME = re.compile(r"[A-G](#*|-*)")
+
+
+class PitchEntry(NamedTuple):
+    """
+    Pitch obtained by transposing a root by a degree: its spelling (in
+    music21 notation, e.g. 'E-'), its octave relative to the one of the root
+    and its MIDI number when the root is in octave TABLE_OCTAVE
+    """
+    name: str
+    octave_offset: int
+    midi: int
+
+
+class PitchTable:
+    """
+    Table of the pitches obtained by transposing each root spelling by each
+    Harte degree, shared by all the Harte chords and intervals.
+    """
+
+    def __init__(self):
+        """
+        Constructor of the PitchTable class
+        """
+        self._entries: Dict[Tuple[str, str], PitchEntry] = {}
+
+    def get(self, root: str, degree: str) -> PitchEntry:
+        """
+        Retrieve the pitch obtained by transposing a root by a degree,
+        computing it with music21 the first time the pair is seen
+        :param root: the root, spelled according to the Harte notation
+        (e.g. 'Bb')
+        :type root: str
+        :param degree: a degree expressed in the Harte notation (e.g. 'b3')
+        :type degree: str
+        :return: the spelling, octave offset and MIDI number of the pitch
+        :rtype: PitchEntry
+        """
+        entry = self._entries.get((root, degree))
+        if entry is None:
+            m21_root = Pitch(root.replace("b", "-"), octave=TABLE_OCTAVE)
+            # call the music21 implementation, bypassing the table
+            pitch = Interval.transposePitch(HarteInterval(degree), m21_root)
+            entry = PitchEntry(pitch.name, pitch.octave - TABLE_OCTAVE,
+                               pitch.midi)
+            self._entries[(root, degree)] = entry
+        return entry
+
+    def pitch(self, root: str, degree: str,
+              octave: int = TABLE_OCTAVE) -> Pitch:
+        """
+        Build the pitch obtained by transposing a root by a degree
+        :param root: the root, spelled according to the Harte notation
+        :type root: str
+        :param degree: a degree expressed in the Harte notation
+        :type degree: str
+        :param octave: the octave of the root
+        :type octave: int
+        :return: the transposed pitch
+        :rtype: Pitch
+        """
+        entry = self.get(root, degree)
+        return Pitch(entry.name, octave=octave + entry.octave_offset)
+
+    def note(self, root: str, degree: str,
+             octave: int = TABLE_OCTAVE) -> Note:
+        """
+        Build the note obtained by transposing a root by a degree
+        :param root: the root, spelled according to the Harte notation
+        :type root: str
+        :param degree: a degree expressed in the Harte notation
+        :type degree: str
+        :param octave: the octave of the root
+        :type octave: int
+        :return: the transposed note
+        :rtype: Note
+        """
+        return Note(self.pitch(root, degree, octave))
+
+    def fill(self, roots: Optional[Iterable[str]] = None,
+             degrees: Optional[Iterable[str]] = None) -> int:
+        """
+        Precompute the pitches of all the pairs of roots and degrees, skipping
+        those that cannot be computed by music21
+        :param roots: the roots, defaults to all the natural notes with up to
+        MAX_ROOT_ALTERATIONS sharps or flats
+        :type roots: Optional[Iterable[str]]
+        :param degrees: the degrees, defaults to all the valid degrees of
+        DEGREE_TABLE (excluding the missing ones)
+        :type degrees: Optional[Iterable[str]]
+        :return: the number of entries of the table
+        :rtype: int
+        """
+        if roots is None:
+            roots = [step + modifier * count for step in NOTE_STEPS
+                     for modifier in "#b"
+                     for count in range(MAX_ROOT_ALTERATIONS + 1)
+                     if modifier == "#" or count]
+        degrees = [degree for degree, info in DEGREE_TABLE.items()
+                   if info.valid and not degree.startswith("*")] \
+            if degrees is None else list(degrees)
+        for root in roots:
+            for degree in degrees:
+                try:
+                    self.get(root, degree)
+                except Music21Exception:
+                    # music21 cannot spell the pitch (e.g. 'F####' and '#9')
+                    continue
+        return len(self)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries of the table
+        """
+        self._entries.clear()
 
-from harte.utils import convert_interval
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+PITCH_TABLE = PitchTable()
+
+
+def _in_table(pitch: Pitch) -> bool:
+    """
+    Check whether the transpositions of a pitch can be looked up in
+    PITCH_TABLE, i.e. whether the pitch has an octave and a table name, and
+    neither a microtone nor a fundamental
+    """
+    return pitch.octave is not None and pitch.fundamental is None \
+        and pitch.microtone.cents == 0 \
+        and _TABLE_NAME.fullmatch(pitch.name) is not None
 
 
 class HarteInterval(Interval):
@@ -30,9 +178,26 @@ class HarteInterval(Interval):
             raise IntervalException(
                 "Harte Interval cannot be converted"
             ) from value_error
-        self._converted_interval = convert_interval(self._harte_interval)
         super().__init__(self._converted_interval, **keywords)
 
+    def transposePitch(self, p: Pitch, *, reverse: bool = False,
+                       maxAccidental: Optional[int] = 4,
+                       inPlace: bool = False):
+        """
+        Transpose a pitch by the interval, looking the result up in
+        PITCH_TABLE when possible (see music21.interval.Interval)
+        :param p: the pitch to be transposed
+        :type p: Pitch
+        :return: the transposed pitch, or None if inPlace is True
+        :rtype: Pitch
+        """
+        if reverse or inPlace or maxAccidental != 4 or not _in_table(p):
+            return super().transposePitch(p, reverse=reverse,
+                                          maxAccidental=maxAccidental,
+                                          inPlace=inPlace)
+        return PITCH_TABLE.pitch(p.name.replace("-", "b"),
+                                 self._harte_interval, p.octave)
+
     def __eq__(self, other) -> bool:
         """
         Defines the equality operator for the HarteInterval class
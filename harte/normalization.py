@@ -0,0 +1,123 @@
+"""
+Bulk normalization of Harte chords, i.e. the computation of the prettified
+form of large collections of labels, optionally spread over a pool of worker
+processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from harte.core import HarteCore
+from harte.encoding import index_labels
+from harte.parse_harte import get_parser
+
+ERRORS_RAISE = "raise"
+ERRORS_COLLECT = "collect"
+
+
+class NormalizationResult(NamedTuple):
+    """
+    Result of a bulk normalization. Labels that could not be normalized are
+    set to None in ``labels`` and reported in ``errors``, which maps each of
+    them to the corresponding error message
+    """
+    labels: List[Optional[str]]
+    errors: Dict[str, str]
+
+
+def normalize(label: str) -> str:
+    """
+    Normalize a chord, returning its prettified form
+    (see harte.harte.Harte.prettify)
+    :param label: a chord annotated according to the Harte notation
+    :type label: str
+    :return: the prettified chord
+    :rtype: str
+    """
+    return HarteCore(label).prettify()
+
+
+def _warm_worker() -> None:
+    """
+    Initializer of the worker processes, preloading the parser (the degree
+    tables are built when the modules are imported)
+    """
+    get_parser()
+
+
+def _normalize_chunk(labels: List[str],
+                     collect: bool) -> List[Tuple[bool, str]]:
+    """
+    Normalize a list of labels, returning for each of them whether it was
+    normalized and either the result or the error message
+    """
+    results = []
+    for label in labels:
+        try:
+            results.append((True, normalize(label)))
+        except Exception as error:  # pylint: disable=broad-except
+            if not collect:
+                raise
+            results.append((False, f"{type(error).__name__}: {error}"))
+    return results
+
+
+def _normalize_distinct(distinct: List[str], workers: Optional[int],
+                        chunksize: int, collect: bool) \
+        -> Tuple[List[Optional[str]], Dict[str, str]]:
+    """
+    Normalize a list of distinct labels in chunks, returning the normalized
+    labels (None for the failures) and the error message of each failure
+    """
+    chunks = [distinct[i:i + chunksize]
+              for i in range(0, len(distinct), chunksize)]
+    if workers is None or workers <= 1 or len(chunks) <= 1:
+        results = [_normalize_chunk(chunk, collect) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_warm_worker) as executor:
+            results = list(executor.map(_normalize_chunk, chunks,
+                                        [collect] * len(chunks)))
+
+    normalized, failures = [], {}
+    for chunk, chunk_results in zip(chunks, results):
+        for label, (success, value) in zip(chunk, chunk_results):
+            if success:
+                normalized.append(value)
+            else:
+                normalized.append(None)
+                failures[label] = value
+    return normalized, failures
+
+
+def normalize_many(labels: Iterable[str],
+                   workers: Optional[int] = None,
+                   chunksize: int = 1024,
+                   errors: str = ERRORS_RAISE) -> NormalizationResult:
+    """
+    Normalize a collection of chords. Labels are deduplicated, and the
+    distinct ones are normalized by a pool of worker processes (or in the
+    current process if workers is None or 1). The results are returned in the
+    order of the input labels
+    :param labels: a sequence of chords annotated according to the Harte
+    notation
+    :type labels: Iterable[str]
+    :param workers: number of worker processes
+    :type workers: int
+    :param chunksize: number of distinct labels sent to a worker at once
+    :type chunksize: int
+    :param errors: either 'raise', to raise the first error encountered, or
+    'collect', to report the labels that cannot be normalized in the result
+    :type errors: str
+    :return: the normalized labels and the errors encountered
+    :rtype: NormalizationResult
+    """
+    if errors not in (ERRORS_RAISE, ERRORS_COLLECT):
+        raise ValueError(f"errors must be either '{ERRORS_RAISE}' or "
+                         f"'{ERRORS_COLLECT}', not {errors!r}.")
+    if chunksize <= 0:
+        raise ValueError("The size of the chunks must be positive.")
+    distinct, inverse = index_labels(labels)
+    normalized, failures = _normalize_distinct(
+        distinct, workers, chunksize, errors == ERRORS_COLLECT)
+    return NormalizationResult([normalized[i] for i in inverse], failures)
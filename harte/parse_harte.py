@@ -3,10 +3,17 @@ Parser for Harte chord data
 """
 
 import os
-from typing import Dict, List
+import re
+import sys
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, \
+    Optional, Tuple, Union
 
 import more_itertools as mitertools
-from lark import Lark, Transformer
+from lark import Lark, Transformer, __version__ as LARK_VERSION
+from lark.exceptions import UnexpectedEOF, UnexpectedInput, \
+    UnexpectedToken
 
 GRAMMAR = os.path.join(os.path.dirname(__file__), 'harte.lark')
 
@@ -102,13 +109,399 @@ class TreeToHarteTransformer(Transformer):
         return chord_dict
 
 
-PARSER = Lark(HARTE_LARK_GRAMMAR,
-              parser='lalr',
-              start="chord",
-              propagate_positions=False,
-              maybe_placeholders=False,
-              transformer=TreeToHarteTransformer())
+# the compiled parser tables are persisted to a cache file in a per-user
+# directory (Lark checks the hash of the grammar stored in the file, see its
+# cache option). The cache can be disabled, or moved to a given file, through
+# the HARTE_LARK_CACHE environment variable
+LARK_CACHE = os.environ.get('HARTE_LARK_CACHE', '1')
+
+_PARSER = None
+
+
+def _default_cache_file() -> Optional[str]:
+    """
+    Build the path of the default cache file of the parser tables, within a
+    directory readable and writable only by the current user (unlike the
+    shared temporary directory used by Lark)
+    :return: the path of the cache file, or None if the directory cannot be
+    created
+    :rtype: Optional[str]
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+    directory = os.path.join(base, 'harte')
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    except OSError:
+        return None
+    return os.path.join(directory, f'lark_{LARK_VERSION}_py'
+                                   f'{sys.version_info[0]}'
+                                   f'{sys.version_info[1]}.cache')
+
+
+def get_parser() -> Lark:
+    """
+    Retrieve the Lark parser of the Harte grammar. The parser is built on the
+    first call, loading the parsing tables from the cache when possible
+    :return: the Lark parser of the Harte grammar
+    :rtype: Lark
+    """
+    global _PARSER  # pylint: disable=global-statement
+    if _PARSER is None:
+        if LARK_CACHE in ('0', ''):
+            cache = False
+        elif LARK_CACHE == '1':
+            cache = _default_cache_file() or False
+        else:
+            cache = LARK_CACHE
+        _PARSER = Lark(HARTE_LARK_GRAMMAR,
+                       parser='lalr',
+                       start="chord",
+                       propagate_positions=False,
+                       maybe_placeholders=False,
+                       transformer=TreeToHarteTransformer(),
+                       cache=cache)
+    return _PARSER
+
+
+def __getattr__(name: str):
+    """
+    Build the Lark parser lazily when PARSER is accessed for the first time
+    """
+    if name == 'PARSER':
+        return get_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ParsedChord(NamedTuple):
+    """
+    Immutable record of a parsed Harte chord. Fields that are not specified
+    in the chord are set to None, while ``degrees`` is an empty tuple when the
+    chord has no explicit degree list. A no-chord (N/X) has every field unset.
+    """
+    root: Optional[str] = None
+    shorthand: Optional[str] = None
+    degrees: Tuple[str, ...] = ()
+    bass: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, chord_dict: Dict) -> 'ParsedChord':
+        """
+        Build a ParsedChord out of the dictionary returned by the parser
+        :param chord_dict: the dictionary produced by TreeToHarteTransformer
+        :type chord_dict: dict
+        :return: the corresponding immutable record
+        :rtype: ParsedChord
+        """
+        return cls(root=chord_dict.get('root'),
+                   shorthand=chord_dict.get('shorthand'),
+                   degrees=tuple(chord_dict.get('degrees', ())),
+                   bass=chord_dict.get('bass'))
+
+    def to_dict(self) -> Dict:
+        """
+        Convert the record back to the dictionary format returned by the
+        parser, omitting the fields that are not set
+        :return: a Harte chord representation
+        :rtype: dict
+        """
+        chord_dict = {}
+        if self.root is not None:
+            chord_dict['root'] = self.root
+        if self.shorthand is not None:
+            chord_dict['shorthand'] = self.shorthand
+        if self.degrees:
+            chord_dict['degrees'] = list(self.degrees)
+        if self.bass is not None:
+            chord_dict['bass'] = self.bass
+        return chord_dict
+
+
+# whether to parse chords with the dedicated parser (fast_parse), falling
+# back to the Lark parser only for reporting errors
+USE_FAST_PARSER = True
+
+# the terminals of the grammar, to be kept aligned with harte.lark
+_SHORTHANDS = re.findall(r'"([^"]+)"', re.search(
+    r"^SHORTHAND:(.*\n(?:[ \t]+\|.*\n?)*)", HARTE_LARK_GRAMMAR, re.M).group(1))
+_DEGREE = r"\*?[b#]*(?:1[0-3]|[1-9])"
+_CHORD_REGEX = re.compile(
+    r"(?P<root>[A-G][b#]*)"
+    r"(?::(?:(?P<shorthand>"
+    + "|".join(sorted(map(re.escape, _SHORTHANDS), key=len, reverse=True))
+    + rf")(?:\((?P<degrees>{_DEGREE}(?:,{_DEGREE})*)\))?"
+    rf"|\((?P<only_degrees>{_DEGREE}(?:,{_DEGREE})*)\)))?"
+    rf"(?:/(?P<bass>{_DEGREE}))?"
+    r"|(?P<na>[NX])"
+)
+
+
+def fast_parse(chord: str) -> Optional[Dict]:
+    """
+    Parse a chord in a single pass, without going through the Lark parser.
+    The result is the same dictionary returned by TreeToHarteTransformer.
+    Chords containing spaces, which the grammar ignores between tokens, are
+    not handled and must be parsed with the Lark parser
+    :param chord: a chord annotated according to the Harte notation
+    :type chord: str
+    :return: a Harte chord representation, or None if the chord cannot be
+    parsed
+    :rtype: dict
+    """
+    match = _CHORD_REGEX.fullmatch(chord)
+    if match is None:
+        return None
+    return _match_to_dict(match)
+
+
+def _match_to_dict(match: re.Match) -> Dict:
+    """
+    Build the dictionary representation of a chord matched by _CHORD_REGEX
+    """
+    root, shorthand, degrees, only_degrees, bass = match.group(
+        'root', 'shorthand', 'degrees', 'only_degrees', 'bass')
+    chord_dict = {}
+    if root is not None:
+        chord_dict['root'] = root
+    if shorthand is not None:
+        chord_dict['shorthand'] = shorthand
+    degrees = degrees or only_degrees
+    if degrees is not None:
+        chord_dict['degrees'] = degrees.split(',')
+    if bass is not None:
+        chord_dict['bass'] = bass
+    return chord_dict
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+DEFAULT_CACHE_SIZE = 8192
+
+
+def _parse_uncached(chord: str) -> ParsedChord:
+    """
+    Parse a chord bypassing any cache. Unless USE_FAST_PARSER is disabled,
+    the chord is parsed with fast_parse and the Lark parser is only used when
+    fast_parse fails, so that errors are reported by Lark
+    :param chord: a chord annotated according to the Harte notation
+    :type chord: str
+    :return: the parsed chord
+    :rtype: ParsedChord
+    """
+    if USE_FAST_PARSER:
+        chord_dict = fast_parse(chord)
+        if chord_dict is not None:
+            return ParsedChord.from_dict(chord_dict)
+    return ParsedChord.from_dict(get_parser().parse(chord))
+
+
+class ParseCache:
+    """
+    Bounded least-recently-used cache of parsed Harte chords, keyed on the
+    raw chord string. Parsing errors are propagated and never cached.
+    A ``maxsize`` of None makes the cache unbounded, while a ``maxsize`` of 0
+    disables caching altogether.
+    """
+
+    def __init__(self,
+                 maxsize: Optional[int] = DEFAULT_CACHE_SIZE,
+                 parse_function: Callable[[str], ParsedChord] = None):
+        """
+        Constructor of the ParseCache class
+        :param maxsize: maximum number of chords kept in the cache
+        :type maxsize: int
+        :param parse_function: function used to parse the chords that are
+        not in the cache, defaults to the Lark parser
+        :type parse_function: Callable[[str], ParsedChord]
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("The size of the cache cannot be negative.")
+        self._maxsize = maxsize
+        self._parse_function = parse_function or _parse_uncached
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def parse(self, chord: str) -> ParsedChord:
+        """
+        Retrieve the parsed version of a chord, parsing it only if it is not
+        already in the cache
+        :param chord: a chord annotated according to the Harte notation
+        :type chord: str
+        :return: the parsed chord
+        :rtype: ParsedChord
+        """
+        with self._lock:
+            parsed = self._entries.get(chord)
+            if parsed is not None:
+                self._entries.move_to_end(chord)
+                self._hits += 1
+                return parsed
+            self._misses += 1
+        parsed = self._parse_function(chord)
+        if self._maxsize == 0:
+            return parsed
+        with self._lock:
+            self._entries[chord] = parsed
+            if self._maxsize is not None and len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return parsed
+
+    def info(self) -> CacheInfo:
+        """
+        Retrieve the statistics of the cache
+        :return: the number of hits and misses, the maximum size and the
+        current size of the cache
+        :rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize,
+                             len(self._entries))
+
+    def clear(self) -> None:
+        """
+        Empty the cache and reset its statistics
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        """
+        Change the maximum size of the cache, evicting the least recently
+        used chords if needed
+        :param maxsize: the new maximum number of chords kept in the cache
+        :type maxsize: int
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("The size of the cache cannot be negative.")
+        with self._lock:
+            self._maxsize = maxsize
+            if maxsize is not None:
+                while len(self._entries) > maxsize:
+                    self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, chord: str) -> bool:
+        return chord in self._entries
+
+
+PARSE_CACHE = ParseCache()
+
+
+def try_parse(chord: str) -> Tuple[Optional[ParsedChord], int]:
+    """
+    Parse a chord without raising errors and without using the cache. The
+    Lark parser is only used when fast_parse fails, either to parse the chord
+    or to locate the error
+    :param chord: a chord annotated according to the Harte notation
+    :type chord: str
+    :return: a tuple containing the parsed chord and -1, or None and the
+    position of the syntax error (the length of the chord if the chord is
+    truncated)
+    :rtype: Tuple[Optional[ParsedChord], int]
+    """
+    chord_dict = fast_parse(chord)
+    if chord_dict is None:
+        try:
+            chord_dict = get_parser().parse(chord)
+        except UnexpectedEOF:
+            return None, len(chord)
+        except UnexpectedToken as error:
+            # at the end of the input Lark reports the start of the last token
+            position = None if error.token.type == '$END' else \
+                error.pos_in_stream
+            return None, len(chord) if position is None else position
+        except UnexpectedInput as error:
+            position = getattr(error, 'pos_in_stream', None)
+            return None, len(chord) if position is None else position
+    return ParsedChord.from_dict(chord_dict), -1
+
+
+DEFAULT_DELIMITERS = " \t\r\n|"
+
+
+class SequenceToken(NamedTuple):
+    """
+    Chord of a sequence parsed by parse_sequence. The span (start and end) of
+    the token refers to the whole text; chord is None if the token is not a
+    valid chord, in which case error is the position of the syntax error in
+    the whole text (-1 for the valid chords)
+    """
+    index: int
+    start: int
+    end: int
+    label: str
+    chord: Optional[ParsedChord]
+    error: int = -1
+
+
+def _sequence_regex(delimiters: str) -> re.Pattern:
+    """
+    Build the regex scanning a sequence of chords separated by delimiters
+    """
+    if not delimiters:
+        raise ValueError("At least a delimiter is needed.")
+    delimiter_class = "[" + "".join(re.escape(x) for x in delimiters) + "]"
+    return re.compile(
+        rf"(?:{_CHORD_REGEX.pattern})(?={delimiter_class}|\Z)"
+        rf"|(?P<bad>(?:(?!{delimiter_class}).)+)", re.DOTALL)
+
+
+def parse_sequence(text: Union[str, Iterable[str]],
+                   delimiters: str = DEFAULT_DELIMITERS) \
+        -> Iterator[SequenceToken]:
+    """
+    Parse a progression of chords separated by delimiters (by default
+    whitespace and bar lines, e.g. 'C:maj | A:min7 D:7 | G:maj'). The
+    progression is scanned in a single pass and the chords are yielded lazily,
+    so that very long inputs can be processed in constant memory. Invalid
+    tokens do not interrupt the parsing: they are yielded with the position
+    of their error
+    :param text: the progression, either as a string or as an iterable of
+    chunks (e.g. the lines of a file), each ending with a delimiter or at the
+    end of the progression
+    :type text: Union[str, Iterable[str]]
+    :param delimiters: the characters separating the chords
+    :type delimiters: str
+    :return: an iterator over the tokens of the progression
+    :rtype: Iterator[SequenceToken]
+    """
+    regex = _sequence_regex(delimiters)
+    chunks = [text] if isinstance(text, str) else text
+    index = 0
+    offset = 0
+    for chunk in chunks:
+        for match in regex.finditer(chunk):
+            start, end = match.start() + offset, match.end() + offset
+            label = match.group()
+            if match.group('bad') is None:
+                yield SequenceToken(index, start, end, label, ParsedChord.
+                                    from_dict(_match_to_dict(match)))
+            else:
+                parsed, position = try_parse(label)
+                yield SequenceToken(index, start, end, label, parsed,
+                                    -1 if parsed else start + position)
+            index += 1
+        offset += len(chunk)
+
+
+def parse_chord(chord: str) -> ParsedChord:
+    """
+    Parse a chord through the shared PARSE_CACHE, so that the parsing cost is
+    paid only once per distinct chord string
+    :param chord: a chord annotated according to the Harte notation
+    :type chord: str
+    :return: the parsed chord
+    :rtype: ParsedChord
+    """
+    return PARSE_CACHE.parse(chord)
+
 
 if __name__ == '__main__':
     # test the grammar parsed Tree
-    print(PARSER.parse('C:maj7(4,b6)/b4'))
+    print(get_parser().parse('C:maj7(4,b6)/b4'))
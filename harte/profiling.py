@@ -0,0 +1,152 @@
+"""
+Opt-in instrumentation of the construction of Harte objects.
+When enabled, the number of executions and the cumulative time (in
+nanoseconds) of each stage of Harte.__init__ are accumulated across all the
+constructions:
+  * parse       parsing of the label
+  * degrees     resolution of the degrees of the chord
+  * intervals   creation of the music21 notes, whose pitches are looked up
+                in PITCH_TABLE (see harte.interval)
+  * chord       initialization of the music21 Chord
+When disabled (the default) each stage only costs an attribute lookup.
+"""
+
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter_ns
+from typing import Dict, Iterator, NamedTuple
+
+STAGES = ("parse", "degrees", "intervals", "chord")
+
+
+class StageStats(NamedTuple):
+    """
+    Statistics of a stage of the construction of Harte objects
+    """
+    count: int
+    total_ns: int
+
+    @property
+    def mean_ns(self) -> float:
+        """
+        Average time spent in the stage, in nanoseconds
+        """
+        return self.total_ns / self.count if self.count else 0.0
+
+
+class StageProfiler:
+    """
+    Accumulator of the count and the cumulative time of each stage.
+    Instrumented code checks the enabled attribute and, only if it is set,
+    calls start() and then record() at the end of each stage.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = Lock()
+        self._counts = dict.fromkeys(STAGES, 0)
+        self._totals = dict.fromkeys(STAGES, 0)
+
+    @staticmethod
+    def start() -> int:
+        """
+        Read the clock at the beginning of the first stage
+        :return: the current time, in nanoseconds
+        :rtype: int
+        """
+        return perf_counter_ns()
+
+    def record(self, stage: str, start: int) -> int:
+        """
+        Record the end of a stage
+        :param stage: the name of the stage
+        :type stage: str
+        :param start: the time at which the stage started, in nanoseconds
+        :type start: int
+        :return: the current time, which is the start of the next stage
+        :rtype: int
+        """
+        now = perf_counter_ns()
+        with self._lock:
+            self._counts[stage] += 1
+            self._totals[stage] += now - start
+        return now
+
+    def snapshot(self) -> Dict[str, StageStats]:
+        """
+        Retrieve the statistics accumulated so far
+        :return: a dictionary mapping each stage to its statistics
+        :rtype: Dict[str, StageStats]
+        """
+        with self._lock:
+            return {stage: StageStats(self._counts[stage],
+                                      self._totals[stage])
+                    for stage in STAGES}
+
+    def reset(self) -> None:
+        """
+        Discard the statistics accumulated so far
+        """
+        with self._lock:
+            for stage in STAGES:
+                self._counts[stage] = 0
+                self._totals[stage] = 0
+
+
+PROFILER = StageProfiler()
+
+
+def enable() -> None:
+    """
+    Start accumulating the statistics of the construction of Harte objects
+    """
+    PROFILER.enabled = True
+
+
+def disable() -> None:
+    """
+    Stop accumulating the statistics of the construction of Harte objects
+    """
+    PROFILER.enabled = False
+
+
+def snapshot() -> Dict[str, StageStats]:
+    """
+    Retrieve the statistics accumulated so far
+    :return: a dictionary mapping each stage to its statistics
+    :rtype: Dict[str, StageStats]
+    """
+    return PROFILER.snapshot()
+
+
+def reset() -> None:
+    """
+    Discard the statistics accumulated so far
+    """
+    PROFILER.reset()
+
+
+@contextmanager
+def profile(clear: bool = True) -> Iterator[StageProfiler]:
+    """
+    Context manager enabling the profiling of the construction of Harte
+    objects, restoring the previous state on exit. The statistics can be
+    retrieved with snapshot(), also after the block:
+
+        with profile() as profiler:
+            chords = [Harte(label) for label in labels]
+        print(profiler.snapshot())
+
+    :param clear: whether to discard the statistics accumulated before
+    :type clear: bool
+    :return: the profiler
+    :rtype: Iterator[StageProfiler]
+    """
+    if clear:
+        PROFILER.reset()
+    previous = PROFILER.enabled
+    PROFILER.enabled = True
+    try:
+        yield PROFILER
+    finally:
+        PROFILER.enabled = previous
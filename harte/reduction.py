@@ -0,0 +1,187 @@
+"""
+Reduction of Harte chords to smaller vocabularies, e.g. major/minor triads
+or seventh chords. Each chord is reduced to the shorthand of the vocabulary
+whose notes (taken from SHORTHAND_DEGREE_MAP) are the largest subset of the
+notes of the chord, preferring the shorthands listed first in case of ties
+(e.g. 'C:7(#9)' is reduced to 'C:maj' rather than 'C:min'). Chords not
+containing any shorthand of the vocabulary are handled according to one of
+the UNMATCHED_RULES, while the bass of the inversions is handled according
+to one of the INVERSION_RULES:
+  * drop      the reduced chord is always in root position
+  * keep      the bass is kept if it is a note of the reduced chord
+  * strict    chords whose bass is not a note of the reduced chord are
+              unmatched
+Each distinct label is reduced only once, so that reducing a collection of
+labels amounts to a single gather from a table of reduced labels.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from harte.core import HarteCore
+from harte.encoding import index_labels
+from harte.mappings import SHORTHAND_DEGREE_MAP, SHORTHAND_DEGREES
+from harte.utils import interval_offsets
+from harte.vocabulary import NO_CHORD, UNKNOWN_CHORD, ChordVocabulary
+
+VOCABULARIES = {
+    "majmin": ("maj", "min"),
+    "sevenths": ("maj", "min", "maj7", "7", "min7"),
+    "tetrads": ("maj", "min", "aug", "dim", "sus4", "maj7", "7", "min7",
+                "minmaj7", "dim7", "hdim7", "maj6", "min6"),
+}
+INVERSION_RULES = ("drop", "keep", "strict")
+UNMATCHED_RULES = ("no_chord", "unknown", "raise")
+
+
+def _degree_semitones(degrees: Iterable[str]) -> Dict[int, str]:
+    """
+    Map the semitones of the degrees of a chord, within the octave, to the
+    degrees themselves
+    """
+    return {interval_offsets(degree)[1] % 12: degree for degree in degrees}
+
+
+class Reducer:
+    """
+    Reduction of Harte chords to a vocabulary of shorthands. The reduction
+    of each distinct label is computed once and cached.
+    """
+
+    def __init__(self, vocabulary: Union[str, Sequence[str]] = "majmin",
+                 inversions: str = "drop", unmatched: str = "no_chord"):
+        """
+        Constructor of the Reducer class
+        :param vocabulary: the name of one of the VOCABULARIES, or a sequence
+        of shorthands sorted by preference
+        :type vocabulary: Union[str, Sequence[str]]
+        :param inversions: one of INVERSION_RULES
+        :type inversions: str
+        :param unmatched: one of UNMATCHED_RULES: unmatched chords are
+        reduced to 'N' (no_chord) or 'X' (unknown), or raise a ValueError
+        :type unmatched: str
+        """
+        if isinstance(vocabulary, str):
+            if vocabulary not in VOCABULARIES:
+                raise ValueError(f"vocabulary must be one of "
+                                 f"{tuple(VOCABULARIES)}, not "
+                                 f"{vocabulary!r}.")
+            vocabulary = VOCABULARIES[vocabulary]
+        if inversions not in INVERSION_RULES:
+            raise ValueError(f"inversions must be one of {INVERSION_RULES}, "
+                             f"not {inversions!r}.")
+        if unmatched not in UNMATCHED_RULES:
+            raise ValueError(f"unmatched must be one of {UNMATCHED_RULES}, "
+                             f"not {unmatched!r}.")
+        self.vocabulary = tuple(vocabulary)
+        self.inversions = inversions
+        self.unmatched = unmatched
+        # the notes of each shorthand, as root-relative semitones
+        self._notes: List[Tuple[str, Dict[int, str]]] = []
+        for shorthand in self.vocabulary:
+            if shorthand not in SHORTHAND_DEGREES:
+                raise ValueError(f"Unknown shorthand {shorthand!r}.")
+            degrees = ("1",) + tuple(SHORTHAND_DEGREE_MAP.get(
+                shorthand, SHORTHAND_DEGREES[shorthand][1:]))
+            self._notes.append((shorthand, _degree_semitones(degrees)))
+        self._cache: Dict[str, str] = {}
+
+    def _unmatched(self, label: str) -> str:
+        """
+        Reduce a chord that does not match the vocabulary
+        """
+        if self.unmatched == "raise":
+            raise ValueError(f"The chord {label!r} does not match the "
+                             f"vocabulary {self.vocabulary}.")
+        return NO_CHORD if self.unmatched == "no_chord" else UNKNOWN_CHORD
+
+    def _reduce(self, label: str) -> str:
+        """
+        Reduce a chord to the vocabulary
+        """
+        if label.strip() == UNKNOWN_CHORD:
+            return UNKNOWN_CHORD
+        core = HarteCore(label)
+        if core.is_empty():
+            return NO_CHORD
+        chord_notes = {semitones % 12 for semitones in core.semitones}
+        # the first of the largest shorthands contained in the chord
+        best_shorthand: Optional[str] = None
+        best_notes: Dict[int, str] = {}
+        for shorthand, notes in self._notes:
+            if notes.keys() <= chord_notes and \
+                    (best_shorthand is None or len(notes) > len(best_notes)):
+                best_shorthand, best_notes = shorthand, notes
+        if best_shorthand is None:
+            return self._unmatched(label)
+        reduced = f"{core.root}:{best_shorthand}"
+        bass = interval_offsets(core.bass)[1] % 12
+        if bass == 0 or self.inversions == "drop":
+            return reduced
+        if bass in best_notes:
+            return f"{reduced}/{best_notes[bass]}"
+        return reduced if self.inversions == "keep" else \
+            self._unmatched(label)
+
+    def reduce_label(self, label: str) -> str:
+        """
+        Reduce a chord to the vocabulary
+        :param label: a chord annotated according to the Harte notation
+        :type label: str
+        :return: the reduced chord
+        :rtype: str
+        """
+        reduced = self._cache.get(label)
+        if reduced is None:
+            reduced = self._cache[label] = self._reduce(label)
+        return reduced
+
+    def table(self, chord_vocabulary: ChordVocabulary) -> np.ndarray:
+        """
+        Build the table of the reduced chords of a ChordVocabulary, so that
+        encoded chords can be reduced with table[chord_ids]
+        :param chord_vocabulary: a vocabulary of chords
+        :type chord_vocabulary: ChordVocabulary
+        :return: the reduced chord of each ID of the vocabulary
+        :rtype: np.ndarray
+        """
+        return np.array([self.reduce_label(label)
+                         for label in chord_vocabulary.labels],
+                        dtype=np.str_)
+
+    def __call__(self, labels: Iterable[str]) -> np.ndarray:
+        """
+        Reduce a collection of chords to the vocabulary
+        :param labels: a sequence of chords annotated according to the Harte
+        notation
+        :type labels: Iterable[str]
+        :return: the reduced chords
+        :rtype: np.ndarray
+        """
+        distinct, inverse = index_labels(labels)
+        reduced = np.array([self.reduce_label(label) for label in distinct],
+                           dtype=np.str_)
+        return reduced[inverse]
+
+
+def reduce(labels: Iterable[str],
+           vocabulary: Union[str, Sequence[str]] = "majmin",
+           inversions: str = "drop",
+           unmatched: str = "no_chord") -> np.ndarray:
+    """
+    Reduce a collection of chords to a vocabulary (see Reducer)
+    :param labels: a sequence of chords annotated according to the Harte
+    notation
+    :type labels: Iterable[str]
+    :param vocabulary: the name of one of the VOCABULARIES, or a sequence
+    of shorthands sorted by preference
+    :type vocabulary: Union[str, Sequence[str]]
+    :param inversions: one of INVERSION_RULES
+    :type inversions: str
+    :param unmatched: one of UNMATCHED_RULES
+    :type unmatched: str
+    :return: the reduced chords
+    :rtype: np.ndarray
+    """
+    return Reducer(vocabulary, inversions, unmatched)(labels)
@@ -0,0 +1,253 @@
+"""
+Frame-level rendering of timed chord annotations, as (frames, 128) piano
+rolls or (frames, 12) chroma targets sampled at a fixed hop size.
+The notes of each distinct chord are resolved once into a row of a small
+table, and frames are filled by gathering rows from that table, optionally
+into a preallocated or memory-mapped output array.
+Chords are voiced according to one of the VOICINGS:
+  * close     the notes are placed within the octave above the root
+  * open      as close, but the compound degrees (e.g. 9, 11 and 13) are
+              placed in the octave above
+in both cases the bass of the inversions is moved to a separate octave. The
+close voicing with the root in octave 4 and the bass in octave 3 (the
+default) reproduces the pitches of Harte.get_midi_pitches.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from harte.core import NATURAL_PITCH_CLASSES, NOTE_STEPS, HarteCore
+from harte.encoding import index_labels
+from harte.utils import interval_offsets
+
+MODES = {"piano_roll": 128, "chroma": 12}
+VOICINGS = ("close", "open")
+
+
+def _octave_midi(step: int, alter: int, octave: int) -> int:
+    """
+    Compute the MIDI number of a note given its staff step, alteration and
+    octave (e.g. Cb4 is 59)
+    """
+    return 12 * (octave + 1) + NATURAL_PITCH_CLASSES[NOTE_STEPS[step % 7]] \
+        + alter
+
+
+def _frame_rows(starts: np.ndarray, ends: np.ndarray, inverse: np.ndarray,
+                n_frames: int, empty_row: int) -> np.ndarray:
+    """
+    Compute the row of the table of the chord active in each frame, given
+    the first and the past-the-end frame of each chord and its row (the
+    frames without a chord get the empty row)
+    """
+    order = np.argsort(starts, kind="stable")
+    starts, ends, inverse = starts[order], ends[order], inverse[order]
+    frames = np.arange(n_frames)
+    segments = np.searchsorted(starts, frames, side="right") - 1
+    active = segments >= 0
+    active[active] = frames[active] < ends[segments[active]]
+    rows = np.full(n_frames, empty_row, dtype=np.intp)
+    rows[active] = inverse[segments[active]]
+    return rows
+
+
+class FrameRenderer:
+    """
+    Renderer of timed chord annotations to piano rolls or chroma frames.
+    The rows of the distinct chords are computed once and cached.
+    """
+
+    def __init__(self, mode: str = "piano_roll", voicing: str = "close",
+                 root_octave: int = 4, bass_octave: Optional[int] = 3,
+                 dtype: np.dtype = np.uint8):
+        """
+        Constructor of the FrameRenderer class
+        :param mode: one of MODES, i.e. 'piano_roll' (128 MIDI pitches) or
+        'chroma' (12 pitch classes)
+        :type mode: str
+        :param voicing: one of VOICINGS
+        :type voicing: str
+        :param root_octave: the octave of the root
+        :type root_octave: int
+        :param bass_octave: the octave of the bass of the inversions, or None
+        to keep the bass within the voicing of the chord
+        :type bass_octave: Optional[int]
+        :param dtype: data type of the output
+        :type dtype: np.dtype
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {tuple(MODES)}, "
+                             f"not {mode!r}.")
+        if voicing not in VOICINGS:
+            raise ValueError(f"voicing must be one of {VOICINGS}, "
+                             f"not {voicing!r}.")
+        self.mode = mode
+        self.voicing = voicing
+        self.root_octave = root_octave
+        self.bass_octave = bass_octave
+        self.dtype = np.dtype(dtype)
+        self._rows: Dict[str, np.ndarray] = {}
+
+    @property
+    def n_bins(self) -> int:
+        """
+        Number of bins of each frame (128 for piano rolls, 12 for chroma)
+        """
+        return MODES[self.mode]
+
+    def pitches(self, label: str) -> List[int]:
+        """
+        Compute the MIDI pitches of a chord according to the voicing
+        :param label: a chord annotated according to the Harte notation
+        :type label: str
+        :return: the sorted MIDI pitches of the chord (empty for no-chords)
+        :rtype: List[int]
+        """
+        core = HarteCore(label)
+        if core.is_empty():
+            return []
+        root_step = NOTE_STEPS.index(core.root[0])
+        root_alter = core.root.count("#") - core.root.count("b")
+        root_midi = _octave_midi(root_step, root_alter, self.root_octave)
+        notes: List[Tuple[str, int]] = []
+        for degree, semitones in zip(core.all_degrees, core.semitones):
+            number = int("".join(x for x in degree if x.isdigit()))
+            if self.voicing == "open" and number > 7:
+                semitones += 12
+            notes.append((degree, root_midi + semitones))
+
+        bass_step, bass_semitones = interval_offsets(core.bass)
+        if self.bass_octave is not None and \
+                (bass_step, bass_semitones) != (0, 0):
+            # move the bass degree (but not its enharmonic duplicates)
+            notes.remove(next(x for x in notes if x[0] == core.bass))
+            step = root_step + bass_step
+            natural = NATURAL_PITCH_CLASSES[NOTE_STEPS[step % 7]] + \
+                12 * (step // 7)
+            alter = NATURAL_PITCH_CLASSES[core.root[0]] + root_alter + \
+                bass_semitones - natural
+            notes.append((core.bass,
+                          _octave_midi(step, alter, self.bass_octave)))
+        return sorted({midi for _, midi in notes})
+
+    def row(self, label: str) -> np.ndarray:
+        """
+        Compute the frame of a chord
+        :param label: a chord annotated according to the Harte notation
+        :type label: str
+        :return: an array of n_bins values, set to 1 for the active pitches
+        (or pitch classes)
+        :rtype: np.ndarray
+        """
+        row = self._rows.get(label)
+        if row is None:
+            row = np.zeros(self.n_bins, dtype=self.dtype)
+            pitches = np.array(self.pitches(label), dtype=np.intp)
+            if self.mode == "chroma":
+                pitches %= 12
+            elif len(pitches) and (pitches.min() < 0 or pitches.max() > 127):
+                raise ValueError(f"The pitches of {label!r} exceed the MIDI "
+                                 f"range.")
+            row[pitches] = 1
+            row.flags.writeable = False
+            self._rows[label] = row
+        return row
+
+    def table(self, labels: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build the table of the frames of the distinct chords of a sequence
+        :param labels: a sequence of chords annotated according to the Harte
+        notation
+        :type labels: Iterable[str]
+        :return: a tuple containing the (distinct + 1, n_bins) table, whose
+        last row is empty, and the index of the row of each label
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        distinct, inverse = index_labels(labels)
+        table = np.zeros((len(distinct) + 1, self.n_bins), dtype=self.dtype)
+        for index, label in enumerate(distinct):
+            table[index] = self.row(label)
+        return table, inverse
+
+    # the options following the hop size are keyword-only
+    def render(self,  # pylint: disable=too-many-arguments
+               onsets: np.ndarray, offsets: np.ndarray,
+               labels: Iterable[str], hop_size: float, *,
+               n_frames: Optional[int] = None,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Render timed chords to frames. Frame i starts at time i * hop_size
+        and is filled with the chord active at that time, or left empty if no
+        chord is active. Chords should not overlap: each frame is assigned
+        to the chord with the latest onset before it
+        :param onsets: the onsets of the chords, in seconds
+        :type onsets: np.ndarray
+        :param offsets: the offsets of the chords, in seconds
+        :type offsets: np.ndarray
+        :param labels: the chords, annotated according to the Harte notation
+        :type labels: Iterable[str]
+        :param hop_size: the time between two consecutive frames, in seconds
+        :type hop_size: float
+        :param n_frames: the number of frames, defaults to the length of
+        out or to the number of frames needed to cover the last offset
+        :type n_frames: Optional[int]
+        :param out: a preallocated (or memory-mapped) output array of shape
+        (n_frames, n_bins) and of the data type of the renderer
+        :type out: Optional[np.ndarray]
+        :return: the (n_frames, n_bins) array of the frames
+        :rtype: np.ndarray
+        """
+        if hop_size <= 0:
+            raise ValueError("The hop size must be positive.")
+        onsets = np.asarray(onsets, dtype=np.float64)
+        offsets = np.asarray(offsets, dtype=np.float64)
+        table, inverse = self.table(labels)
+        if not len(onsets) == len(offsets) == len(inverse):
+            raise ValueError("onsets, offsets and labels must have the same "
+                             "length.")
+        # rounding avoids spurious frames due to floating point errors
+        starts = np.ceil(np.round(onsets / hop_size, 6)).astype(np.intp)
+        ends = np.ceil(np.round(offsets / hop_size, 6)).astype(np.intp)
+        if n_frames is None:
+            n_frames = len(out) if out is not None else \
+                int(max(ends.max(initial=0), 0))
+        if out is None:
+            out = np.empty((n_frames, self.n_bins), dtype=self.dtype)
+        elif out.shape != (n_frames, self.n_bins) or out.dtype != self.dtype:
+            raise ValueError(f"out should be a {self.dtype} array of shape "
+                             f"{(n_frames, self.n_bins)}.")
+
+        rows = _frame_rows(starts, ends, inverse, n_frames, len(table) - 1)
+        np.take(table, rows, axis=0, out=out, mode="clip")
+        return out
+
+
+# the options following the hop size are keyword-only
+def render(onsets: np.ndarray,  # pylint: disable=too-many-arguments
+           offsets: np.ndarray, labels: Iterable[str], hop_size: float, *,
+           mode: str = "piano_roll", n_frames: Optional[int] = None,
+           out: Optional[np.ndarray] = None, **keywords) -> np.ndarray:
+    """
+    Render timed chords to frames (see FrameRenderer)
+    :param onsets: the onsets of the chords, in seconds
+    :type onsets: np.ndarray
+    :param offsets: the offsets of the chords, in seconds
+    :type offsets: np.ndarray
+    :param labels: the chords, annotated according to the Harte notation
+    :type labels: Iterable[str]
+    :param hop_size: the time between two consecutive frames, in seconds
+    :type hop_size: float
+    :param mode: one of MODES
+    :type mode: str
+    :param n_frames: the number of frames
+    :type n_frames: Optional[int]
+    :param out: a preallocated (or memory-mapped) output array
+    :type out: Optional[np.ndarray]
+    :param keywords: further arguments of FrameRenderer (voicing,
+    root_octave, bass_octave, dtype)
+    :return: the (n_frames, n_bins) array of the frames
+    :rtype: np.ndarray
+    """
+    return FrameRenderer(mode, **keywords).render(
+        onsets, offsets, labels, hop_size, n_frames=n_frames, out=out)
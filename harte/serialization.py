@@ -0,0 +1,135 @@
+"""
+Compact binary serialization of sequences of chords.
+The distinct chords are stored once, together with their parsed fields, in a
+string pool; the sequence is stored as an array of indices into the pool,
+using the smallest unsigned integer type that fits. Deserialization rebuilds
+the chords from their parsed fields, without parsing them again.
+
+Layout (little endian):
+    magic (4 bytes) | version (u1) | index size (u1) | distinct chords (u4) |
+    chords (u4) | pool size (u4) | pool (UTF-8) | indices
+"""
+
+import struct
+from typing import Iterable, List, Type, Union
+
+import numpy as np
+
+from harte.core import HarteCore
+from harte.harte import Harte
+from harte.parse_harte import ParsedChord, parse_chord
+
+MAGIC = b"HRTE"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sBBIII")
+_FIELD_SEPARATOR = "\x1f"
+_RECORD_SEPARATOR = "\x1e"
+_INDEX_TYPES = {1: np.uint8, 2: np.uint16, 4: np.uint32}
+
+Chord = Union[str, Harte, HarteCore]
+
+
+def _index_dtype(index_size: int) -> np.dtype:
+    """
+    Retrieve the little-endian type of the indices of the given size
+    """
+    return np.dtype(_INDEX_TYPES[index_size]).newbyteorder("<")
+
+
+def _encode_record(chord: str, parsed_chord: ParsedChord) -> str:
+    """
+    Encode a chord and its parsed fields as a record of the string pool
+    """
+    return _FIELD_SEPARATOR.join([
+        chord, parsed_chord.root or "", parsed_chord.shorthand or "",
+        ",".join(parsed_chord.degrees), parsed_chord.bass or ""])
+
+
+def _decode_record(record: str) -> tuple:
+    """
+    Decode a record of the string pool into a chord and its parsed fields
+    """
+    chord, root, shorthand, degrees, bass = record.split(_FIELD_SEPARATOR)
+    return chord, ParsedChord(root or None, shorthand or None,
+                              tuple(degrees.split(",")) if degrees else (),
+                              bass or None)
+
+
+def dumps(chords: Iterable[Chord]) -> bytes:
+    """
+    Serialize a sequence of chords
+    :param chords: the chords, either as labels or as Harte or HarteCore
+    objects
+    :type chords: Iterable[Chord]
+    :return: the serialized chords
+    :rtype: bytes
+    """
+    pool = {}
+    indices = []
+    for chord in chords:
+        label = chord if isinstance(chord, str) else chord.chord
+        indices.append(pool.setdefault(label, len(pool)))
+    if any(_FIELD_SEPARATOR in label or _RECORD_SEPARATOR in label
+           for label in pool):
+        raise ValueError("The chords contain reserved control characters.")
+    encoded_pool = _RECORD_SEPARATOR.join(
+        _encode_record(label, parse_chord(label)) for label in pool
+    ).encode("UTF-8")
+    index_size = next(size for size, dtype in _INDEX_TYPES.items()
+                      if len(pool) <= np.iinfo(dtype).max + 1)
+    header = _HEADER.pack(MAGIC, VERSION, index_size, len(pool),
+                          len(indices), len(encoded_pool))
+    return header + encoded_pool + np.array(
+        indices, dtype=_index_dtype(index_size)).tobytes()
+
+
+def _read(data: bytes) -> tuple:
+    """
+    Read the pool and the indices of serialized chords
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("The data are too short to contain chords.")
+    magic, version, index_size, n_distinct, n_chords, pool_size = \
+        _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("The data do not contain serialized chords.")
+    expected = _HEADER.size + pool_size + n_chords * index_size
+    if len(data) != expected:
+        raise ValueError(f"The serialized chords should take {expected} "
+                         f"bytes, not {len(data)}.")
+    pool = data[_HEADER.size:_HEADER.size + pool_size].decode("UTF-8")
+    records = [_decode_record(record)
+               for record in pool.split(_RECORD_SEPARATOR)] \
+        if n_distinct else []
+    indices = np.frombuffer(
+        data, dtype=_index_dtype(index_size),
+        count=n_chords, offset=_HEADER.size + pool_size)
+    return records, indices
+
+
+def loads(data: bytes, cls: Type = Harte) -> List:
+    """
+    Deserialize a sequence of chords. Each chord is a distinct object, but
+    chords with the same label share their parsed version
+    :param data: the serialized chords
+    :type data: bytes
+    :param cls: the class of the returned chords, either Harte or HarteCore
+    :type cls: Type
+    :return: the chords
+    :rtype: List
+    """
+    records, indices = _read(data)
+    return [cls.from_parsed(*records[index]) for index in indices.tolist()]
+
+
+def loads_labels(data: bytes) -> List[str]:
+    """
+    Deserialize a sequence of chords as labels
+    :param data: the serialized chords
+    :type data: bytes
+    :return: the labels of the chords
+    :rtype: List[str]
+    """
+    records, indices = _read(data)
+    return [records[index][0] for index in indices.tolist()]
@@ -0,0 +1,275 @@
+"""
+Vectorized similarity and distance between collections of Harte chords.
+Chords are encoded as binary vectors at one of three levels:
+  * pitch_class
+      12 bins, one for each pitch class of the chord
+  * root_relative
+      12 bins, one for each pitch class of the chord transposed to C
+  * degree
+      one bin for each degree of the chord (see harte.utils.degrees_to_key)
+and compared with the Jaccard, cosine or Hamming metric through matrix
+products, computed in chunks to bound the memory used.
+"""
+
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from harte.core import HarteCore
+from harte.vocabulary import ChordVocabulary
+
+ENCODINGS = ("pitch_class", "root_relative", "degree")
+METRICS = ("jaccard", "cosine", "hamming")
+DEFAULT_CHUNK_SIZE = 4096
+
+Chords = Union[ChordVocabulary, np.ndarray, Iterable]
+
+
+def _interval_keys(chords: Chords) -> list:
+    """
+    Retrieve the interval-set keys of a collection of chords
+    """
+    if isinstance(chords, ChordVocabulary):
+        chords = chords.labels.tolist()
+    return [(HarteCore(chord) if isinstance(chord, str) else chord)
+            .get_interval_key() for chord in chords]
+
+
+def _degree_matrix(keys: list, n_degrees: Optional[int]) -> np.ndarray:
+    """
+    Expand a list of interval-set keys into a boolean matrix
+    """
+    if n_degrees is None:
+        n_degrees = max((key.bit_length() for key in keys), default=0)
+    n_bytes = (n_degrees + 7) // 8
+    packed = np.frombuffer(b"".join(key.to_bytes(n_bytes, "little")
+                                    for key in keys), dtype=np.uint8)
+    bits = np.unpackbits(packed.reshape(len(keys), n_bytes), axis=1,
+                         bitorder="little")
+    return bits[:, :n_degrees].astype(bool)
+
+
+def encode_chords(chords: Chords, encoding: str = "pitch_class",
+                  n_degrees: Optional[int] = None) -> np.ndarray:
+    """
+    Encode a collection of chords as binary vectors
+    :param chords: a ChordVocabulary, or a sequence of labels, Harte or
+    HarteCore objects. A 2-dimensional array is considered already encoded
+    and returned as is
+    :type chords: Chords
+    :param encoding: one of 'pitch_class', 'root_relative' and 'degree'
+    :type encoding: str
+    :param n_degrees: number of bins of the degree encoding, defaults to the
+    minimum number of bins needed for the given chords
+    :type n_degrees: int
+    :return: an (N, D) boolean array
+    :rtype: np.ndarray
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"encoding must be one of {ENCODINGS}, "
+                         f"not {encoding!r}.")
+    if isinstance(chords, np.ndarray) and chords.ndim == 2:
+        return chords
+    if encoding == "degree":
+        return _degree_matrix(_interval_keys(chords), n_degrees)
+    transpose = encoding == "root_relative"
+    if isinstance(chords, ChordVocabulary):
+        return chords.multi_hot(np.arange(len(chords)), transpose).astype(bool)
+    encoded = [(HarteCore(chord) if isinstance(chord, str) else chord)
+               .multi_hot_encoding(transpose) for chord in chords]
+    return np.array(encoded, dtype=bool).reshape(len(encoded), 12)
+
+
+def _encode_pair(x: Chords, y: Optional[Chords],
+                 encoding: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode two collections of chords with the same number of bins
+    """
+    if encoding == "degree":
+        x_keys = None if isinstance(x, np.ndarray) else _interval_keys(x)
+        y_keys = None if y is None or isinstance(y, np.ndarray) \
+            else _interval_keys(y)
+        n_degrees = max((key.bit_length()
+                         for key in (x_keys or []) + (y_keys or [])),
+                        default=0)
+        x_encoded = x if x_keys is None else _degree_matrix(x_keys, n_degrees)
+        if y is None:
+            y_encoded = x_encoded
+        else:
+            y_encoded = y if y_keys is None \
+                else _degree_matrix(y_keys, n_degrees)
+    else:
+        x_encoded = encode_chords(x, encoding)
+        y_encoded = x_encoded if y is None else encode_chords(y, encoding)
+    if x_encoded.shape[1] != y_encoded.shape[1]:
+        raise ValueError("The two collections of chords must be encoded with "
+                         "the same number of bins.")
+    return x_encoded.astype(np.float32), y_encoded.astype(np.float32)
+
+
+def _compare(x: np.ndarray, y: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Compare two blocks of encoded chords
+    """
+    intersection = x @ y.T
+    x_sizes = x.sum(axis=1)[:, None]
+    y_sizes = y.sum(axis=1)[None, :]
+    if metric == "hamming":
+        return x_sizes + y_sizes - 2 * intersection
+    if metric == "jaccard":
+        union = x_sizes + y_sizes - intersection
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(union > 0, intersection / union, 1.0) \
+                .astype(np.float32)
+    norms = np.sqrt(x_sizes * y_sizes)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(norms > 0, intersection / norms, 0.0) \
+            .astype(np.float32)
+
+
+def _check_arguments(metric: str, chunk_size: int) -> None:
+    """
+    Validate the arguments shared by the comparison functions
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, not {metric!r}.")
+    if chunk_size <= 0:
+        raise ValueError("The size of the chunks must be positive.")
+
+
+def _iter_blocks(x_encoded: np.ndarray, y_encoded: np.ndarray, metric: str,
+                 chunk_size: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Compare two collections of encoded chords in blocks of rows
+    """
+    for start in range(0, len(x_encoded), chunk_size):
+        yield start, _compare(x_encoded[start:start + chunk_size], y_encoded,
+                              metric)
+
+
+def iter_pairwise(x: Chords, y: Optional[Chords] = None,
+                  metric: str = "jaccard", encoding: str = "pitch_class",
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) \
+        -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Compute the pairwise comparison of two collections of chords in chunks
+    of rows, so that only a (chunk_size, M) block is in memory at once
+    :param x: the first collection of chords (see encode_chords)
+    :type x: Chords
+    :param y: the second collection of chords, defaults to the first one
+    :type y: Chords
+    :param metric: 'jaccard' or 'cosine' for similarities, 'hamming' for the
+    number of bins in which the chords differ
+    :type metric: str
+    :param encoding: one of 'pitch_class', 'root_relative' and 'degree'
+    :type encoding: str
+    :param chunk_size: number of rows of each block
+    :type chunk_size: int
+    :return: an iterator over tuples containing the index of the first row
+    of a block and the block
+    :rtype: Iterator[Tuple[int, np.ndarray]]
+    """
+    _check_arguments(metric, chunk_size)
+    x_encoded, y_encoded = _encode_pair(x, y, encoding)
+    yield from _iter_blocks(x_encoded, y_encoded, metric, chunk_size)
+
+
+# the options following the chords are keyword-only
+def pairwise(x: Chords,  # pylint: disable=too-many-arguments
+             y: Optional[Chords] = None, *, metric: str = "jaccard",
+             encoding: str = "pitch_class",
+             chunk_size: int = DEFAULT_CHUNK_SIZE,
+             out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute the full N x M matrix comparing two collections of chords
+    :param x: the first collection of chords (see encode_chords)
+    :type x: Chords
+    :param y: the second collection of chords, defaults to the first one
+    :type y: Chords
+    :param metric: 'jaccard' or 'cosine' for similarities, 'hamming' for the
+    number of bins in which the chords differ
+    :type metric: str
+    :param encoding: one of 'pitch_class', 'root_relative' and 'degree'
+    :type encoding: str
+    :param chunk_size: number of rows computed at once
+    :type chunk_size: int
+    :param out: an optional (N, M) array (e.g. a numpy.memmap) in which the
+    result is stored
+    :type out: np.ndarray
+    :return: the N x M matrix of float32
+    :rtype: np.ndarray
+    """
+    _check_arguments(metric, chunk_size)
+    x_encoded, y_encoded = _encode_pair(x, y, encoding)
+    shape = (len(x_encoded), len(y_encoded))
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    elif out.shape != shape:
+        raise ValueError(f"The output array should have shape {shape}, "
+                         f"not {out.shape}.")
+    for start, block in _iter_blocks(x_encoded, y_encoded, metric,
+                                     chunk_size):
+        out[start:start + len(block)] = block
+    return out
+
+
+def _top_k(block: np.ndarray, top_k: int,
+           metric: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the top_k nearest candidates of each row of a block of scores,
+    returning their indices and scores sorted from the nearest
+    """
+    keys = block if metric == "hamming" else -block
+    if top_k < block.shape[1]:
+        candidates = np.argpartition(keys, top_k - 1, axis=1)[:, :top_k]
+    else:
+        candidates = np.broadcast_to(np.arange(block.shape[1]), block.shape)
+    order = np.argsort(np.take_along_axis(keys, candidates, axis=1),
+                       axis=1, kind="stable")
+    indices = np.take_along_axis(candidates, order, axis=1)
+    return indices, np.take_along_axis(block, indices, axis=1)
+
+
+# the options following k are keyword-only
+def nearest(queries: Chords,  # pylint: disable=too-many-arguments
+            candidates: Optional[Chords] = None, k: int = 5, *,
+            metric: str = "jaccard", encoding: str = "pitch_class",
+            chunk_size: int = DEFAULT_CHUNK_SIZE) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k candidates that are the most similar to each query (i.e. with
+    the highest similarity, or the lowest Hamming distance)
+    :param queries: the chords to be looked up (see encode_chords)
+    :type queries: Chords
+    :param candidates: the chords among which the nearest are searched,
+    defaults to the queries
+    :type candidates: Chords
+    :param k: number of nearest chords returned for each query (fewer if
+    there are less than k candidates)
+    :type k: int
+    :param metric: one of 'jaccard', 'cosine' and 'hamming'
+    :type metric: str
+    :param encoding: one of 'pitch_class', 'root_relative' and 'degree'
+    :type encoding: str
+    :param chunk_size: number of queries processed at once
+    :type chunk_size: int
+    :return: a tuple containing the (N, k) arrays of the indices of the
+    nearest candidates and of the corresponding scores, both sorted from the
+    nearest candidate
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    _check_arguments(metric, chunk_size)
+    if k <= 0:
+        raise ValueError("The number of nearest chords must be positive.")
+    x_encoded, y_encoded = _encode_pair(queries, candidates, encoding)
+    top_k = min(k, len(y_encoded))
+    indices = np.empty((len(x_encoded), top_k), dtype=np.intp)
+    scores = np.empty((len(x_encoded), top_k), dtype=np.float32)
+    if top_k == 0:
+        return indices, scores
+    for start, block in _iter_blocks(x_encoded, y_encoded, metric,
+                                     chunk_size):
+        block_indices, block_scores = _top_k(block, top_k, metric)
+        indices[start:start + len(block)] = block_indices
+        scores[start:start + len(block)] = block_scores
+    return indices, scores
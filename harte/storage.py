@@ -0,0 +1,78 @@
+"""
+Storage of collections of NumPy arrays in uncompressed .npz files, which can
+be memory-mapped to allow zero-copy reads (e.g. from worker processes).
+"""
+
+import os
+import zipfile
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+# size of the fixed part of the local file header of a zip archive, and
+# position of the lengths of file name and extra field within it
+_LOCAL_HEADER_SIZE = 30
+_NAME_LENGTH_OFFSET = 26
+
+
+def save_arrays(path: Union[str, os.PathLike], **arrays: np.ndarray) -> None:
+    """
+    Save a collection of arrays to an uncompressed .npz file
+    :param path: path of the .npz file
+    :type path: Union[str, os.PathLike]
+    :param arrays: the arrays to be saved, by name
+    :type arrays: np.ndarray
+    """
+    for name, array in arrays.items():
+        if np.asarray(array).dtype.hasobject:
+            raise ValueError(f"The array {name} cannot be saved as it "
+                             f"contains Python objects.")
+    np.savez(path, **arrays)
+
+
+def _mmap_member(file, path: Union[str, os.PathLike],
+                 info: zipfile.ZipInfo, mmap_mode: str) -> np.ndarray:
+    """
+    Memory-map an array stored (uncompressed) in a .npz file
+    """
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"The array {info.filename} is compressed and "
+                         f"cannot be memory-mapped.")
+    file.seek(info.header_offset + _NAME_LENGTH_OFFSET)
+    name_length = int.from_bytes(file.read(2), "little")
+    extra_length = int.from_bytes(file.read(2), "little")
+    file.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_length
+              + extra_length)
+    version = np.lib.format.read_magic(file)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+    if 0 in shape:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mmap_mode, offset=file.tell(),
+                     shape=shape, order="F" if fortran_order else "C")
+
+
+def load_arrays(path: Union[str, os.PathLike],
+                mmap_mode: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Load the arrays stored in a .npz file
+    :param path: path of the .npz file
+    :type path: Union[str, os.PathLike]
+    :param mmap_mode: if given, the arrays are memory-mapped with this mode
+    (see numpy.memmap) instead of being read in memory
+    :type mmap_mode: str
+    :return: the arrays stored in the file, by name
+    :rtype: Dict[str, np.ndarray]
+    """
+    if mmap_mode is None:
+        with np.load(path, allow_pickle=False) as npz:
+            return {name: npz[name] for name in npz.files}
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as file:
+        for info in archive.infolist():
+            name = info.filename[:-len(".npy")] \
+                if info.filename.endswith(".npy") else info.filename
+            arrays[name] = _mmap_member(file, path, info, mmap_mode)
+    return arrays
@@ -0,0 +1,390 @@
+"""
+Columnar storage of large collections of chords.
+A ChordTable keeps one row per chord in parallel NumPy arrays (a
+struct-of-arrays), instead of one music21 object per chord:
+  * label_ids       ID of the label of the chord in the string pool
+  * root_pcs        pitch class of the root (-1 for the no-chords)
+  * root_ids        ID of the spelling of the root in the string pool
+  * shorthand_ids   ID of the shorthand in the string pool (-1 if none)
+  * bass_offsets    semitones between root and bass (-1 for the no-chords)
+  * masks           12-bit mask of the pitch classes of the chord
+  * onsets, offsets optional times of the chord, in seconds
+All the strings are stored once in a shared StringPool. Slicing and
+filtering return tables sharing the pool, and Harte objects are only built
+when a row is accessed. Tables are saved to uncompressed .npz files, which
+can be memory-mapped for zero-copy reads (e.g. from worker processes).
+"""
+
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, \
+    Tuple, Union, overload
+
+import numpy as np
+
+from harte.core import HarteCore
+from harte.encoding import index_labels
+from harte.harte import Harte
+from harte.storage import load_arrays, save_arrays
+from harte.utils import interval_offsets
+
+COLUMNS = ("label_ids", "root_pcs", "root_ids", "shorthand_ids",
+           "bass_offsets", "masks")
+TIME_COLUMNS = ("onsets", "offsets")
+
+_DTYPES = {
+    "label_ids": np.int32,
+    "root_pcs": np.int8,
+    "root_ids": np.int32,
+    "shorthand_ids": np.int32,
+    "bass_offsets": np.int8,
+    "masks": np.uint16,
+    "onsets": np.float64,
+    "offsets": np.float64,
+}
+
+
+def _row_values(label: str, strings: Dict[str, int]) -> Tuple[int, ...]:
+    """
+    Compute the values of the columns of a chord, adding its strings to the
+    pool being built
+    """
+    core = HarteCore(label)
+    label_id = strings.setdefault(label, len(strings))
+    if core.is_empty():
+        return label_id, -1, -1, -1, -1, 0
+    mask = 0
+    for pitch_class in core.get_pitch_classes():
+        mask |= 1 << pitch_class
+    return (label_id, core.root_pc,
+            strings.setdefault(core.root, len(strings)),
+            strings.setdefault(core.shorthand, len(strings))
+            if core.shorthand else -1,
+            interval_offsets(core.bass)[1] % 12, mask)
+
+
+class StringPool:
+    """
+    Immutable pool of strings, stored as a single UTF-8 buffer and the
+    offsets of each string within it. Strings are decoded on access.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        """
+        Constructor of the StringPool class
+        :param data: the UTF-8 encoded strings, one after the other
+        :type data: np.ndarray
+        :param offsets: the N + 1 offsets delimiting the N strings
+        :type offsets: np.ndarray
+        """
+        self.data = data
+        self.offsets = offsets
+        self._strings: Optional[List[str]] = None
+        self._ids: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_strings(cls, strings: Sequence[str]) -> "StringPool":
+        """
+        Build a pool out of a sequence of distinct strings
+        :param strings: the strings of the pool
+        :type strings: Sequence[str]
+        :return: the string pool
+        :rtype: StringPool
+        """
+        encoded = [string.encode("UTF-8") for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(string) for string in encoded], out=offsets[1:])
+        pool = cls(np.frombuffer(b"".join(encoded), dtype=np.uint8).copy(),
+                   offsets)
+        pool._strings = list(strings)
+        return pool
+
+    @property
+    def strings(self) -> List[str]:
+        """
+        All the strings of the pool
+        """
+        if self._strings is None:
+            buffer = self.data.tobytes()
+            offsets = self.offsets.tolist()
+            self._strings = [buffer[start:end].decode("UTF-8") for start, end
+                             in zip(offsets[:-1], offsets[1:])]
+        return self._strings
+
+    def get(self, string: str, default: int = -1) -> int:
+        """
+        Retrieve the ID of a string
+        :param string: the string to be looked up
+        :type string: str
+        :param default: the value returned if the string is not in the pool
+        :type default: int
+        :return: the ID of the string
+        :rtype: int
+        """
+        if self._ids is None:
+            self._ids = {string: i for i, string in enumerate(self.strings)}
+        return self._ids.get(string, default)
+
+    def __getitem__(self, string_id: int) -> str:
+        if self._strings is not None:
+            return self._strings[string_id]
+        start, end = self.offsets[string_id], self.offsets[string_id + 1]
+        return self.data[start:end].tobytes().decode("UTF-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class ChordTable:
+    """
+    Columnar container of chords (see the module documentation). Rows are
+    selected with integers (returning a Harte object), slices, integer
+    arrays and boolean masks (returning a ChordTable).
+    """
+
+    def __init__(self, labels: Iterable[str] = (),
+                 onsets: Optional[Iterable[float]] = None,
+                 offsets: Optional[Iterable[float]] = None):
+        """
+        Constructor of the ChordTable class. Each distinct label is parsed
+        only once
+        :param labels: the chords, annotated according to the Harte notation
+        :type labels: Iterable[str]
+        :param onsets: the onset of each chord, if any
+        :type onsets: Iterable[float]
+        :param offsets: the offset of each chord, if any
+        :type offsets: Iterable[float]
+        """
+        distinct, inverse = index_labels(labels)
+        strings: Dict[str, int] = {}
+        rows = {name: [] for name in COLUMNS}
+        for label in distinct:
+            for name, value in zip(COLUMNS, _row_values(label, strings)):
+                rows[name].append(value)
+        self._columns = {name: np.array(rows[name],
+                                        dtype=_DTYPES[name])[inverse]
+                         for name in COLUMNS}
+        for name, times in zip(TIME_COLUMNS, (onsets, offsets)):
+            if times is not None:
+                times = np.asarray(times, dtype=_DTYPES[name])
+                if times.shape != inverse.shape:
+                    raise ValueError(f"The table has {len(inverse)} rows, "
+                                     f"but {len(times)} {name} were given.")
+                self._columns[name] = times
+        self.pool = StringPool.from_strings(list(strings))
+
+    @classmethod
+    def _from_columns(cls, columns: Dict[str, np.ndarray],
+                      pool: StringPool) -> "ChordTable":
+        """
+        Build a table out of its columns and string pool
+        """
+        table = cls.__new__(cls)
+        table._columns = columns
+        table.pool = pool
+        return table
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        The columns of the table, by name
+        """
+        return dict(self._columns)
+
+    @property
+    def label_ids(self) -> np.ndarray:
+        """
+        ID of the label of each chord in the string pool
+        """
+        return self._columns["label_ids"]
+
+    @property
+    def root_pcs(self) -> np.ndarray:
+        """
+        Root pitch class of each chord (-1 for the no-chords)
+        """
+        return self._columns["root_pcs"]
+
+    @property
+    def root_ids(self) -> np.ndarray:
+        """
+        ID of the spelling of the root of each chord in the string pool (-1
+        for the no-chords)
+        """
+        return self._columns["root_ids"]
+
+    @property
+    def shorthand_ids(self) -> np.ndarray:
+        """
+        ID of the shorthand of each chord in the string pool (-1 if the chord
+        has no shorthand)
+        """
+        return self._columns["shorthand_ids"]
+
+    @property
+    def bass_offsets(self) -> np.ndarray:
+        """
+        Semitones between root and bass of each chord (-1 for the no-chords)
+        """
+        return self._columns["bass_offsets"]
+
+    @property
+    def masks(self) -> np.ndarray:
+        """
+        12-bit mask of the pitch classes of each chord (bit i is set if the
+        pitch class i is part of the chord)
+        """
+        return self._columns["masks"]
+
+    @property
+    def onsets(self) -> Optional[np.ndarray]:
+        """
+        Onset of each chord, None if the table has no times
+        """
+        return self._columns.get("onsets")
+
+    @property
+    def offsets(self) -> Optional[np.ndarray]:
+        """
+        Offset of each chord, None if the table has no times
+        """
+        return self._columns.get("offsets")
+
+    def label(self, row: int) -> str:
+        """
+        Retrieve the label of a chord
+        :param row: the index of the row
+        :type row: int
+        :return: the label of the chord
+        :rtype: str
+        """
+        return self.pool[int(self.label_ids[row])]
+
+    @property
+    def labels(self) -> List[str]:
+        """
+        The label of each chord
+        """
+        strings = self.pool.strings
+        return [strings[label_id] for label_id in self.label_ids.tolist()]
+
+    def harte(self, row: int) -> Harte:
+        """
+        Build the Harte object of a chord
+        :param row: the index of the row
+        :type row: int
+        :return: the chord
+        :rtype: Harte
+        """
+        return Harte(self.label(row))
+
+    def iter_harte(self) -> Iterator[Harte]:
+        """
+        Iterate over the chords of the table, building each Harte object
+        only when it is reached
+        :return: an iterator over the chords
+        :rtype: Iterator[Harte]
+        """
+        for row in range(len(self)):
+            yield self.harte(row)
+
+    def where(self, root_pc: Optional[int] = None,
+              shorthand: Optional[str] = None,
+              bass_offset: Optional[int] = None,
+              contains: Optional[Iterable[int]] = None) -> np.ndarray:
+        """
+        Compute the boolean mask of the rows satisfying all the given
+        conditions, which can be used to filter the table
+        :param root_pc: the pitch class of the root
+        :type root_pc: int
+        :param shorthand: the shorthand of the chords (e.g. 'min7')
+        :type shorthand: str
+        :param bass_offset: the semitones between root and bass
+        :type bass_offset: int
+        :param contains: pitch classes that must be part of the chords
+        :type contains: Iterable[int]
+        :return: the boolean mask of the selected rows
+        :rtype: np.ndarray
+        """
+        selected = np.ones(len(self), dtype=bool)
+        if root_pc is not None:
+            selected &= self.root_pcs == root_pc
+        if shorthand is not None:
+            shorthand_id = self.pool.get(shorthand)
+            selected &= (self.shorthand_ids == shorthand_id) & \
+                (shorthand_id >= 0)
+        if bass_offset is not None:
+            selected &= self.bass_offsets == bass_offset
+        if contains is not None:
+            required = 0
+            for pitch_class in contains:
+                required |= 1 << pitch_class
+            selected &= (self.masks & required) == required
+        return selected
+
+    def multi_hot(self, transpose: bool = False) -> np.ndarray:
+        """
+        Compute the multi-hot encoding of the chords of the table
+        :param transpose: whether to transpose each chord so that its root
+        note is at the 0th position
+        :type transpose: bool
+        :return: an (N, 12) array of uint8 containing the encodings
+        :rtype: np.ndarray
+        """
+        masks = self.masks.astype(np.int32)
+        if transpose:
+            shift = np.maximum(self.root_pcs, 0).astype(np.int32)
+            masks = ((masks >> shift) | (masks << (12 - shift))) & 0xFFF
+        return ((masks[:, None] >> np.arange(12)) & 1).astype(np.uint8)
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Save the table to an uncompressed .npz file
+        :param path: path of the .npz file
+        :type path: Union[str, os.PathLike]
+        """
+        save_arrays(path, pool_data=self.pool.data,
+                    pool_offsets=self.pool.offsets, **self._columns)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike],
+             mmap_mode: Optional[str] = None) -> "ChordTable":
+        """
+        Load a table from a .npz file
+        :param path: path of the .npz file
+        :type path: Union[str, os.PathLike]
+        :param mmap_mode: if given, the arrays are memory-mapped with this
+        mode (see numpy.memmap)
+        :type mmap_mode: str
+        :return: the loaded table
+        :rtype: ChordTable
+        """
+        arrays = load_arrays(path, mmap_mode)
+        pool = StringPool(arrays.pop("pool_data"), arrays.pop("pool_offsets"))
+        return cls._from_columns(arrays, pool)
+
+    def __len__(self) -> int:
+        return len(self.label_ids)
+
+    @overload
+    def __getitem__(self, key: Union[int, np.integer]) -> Harte:
+        ...
+
+    @overload
+    def __getitem__(self, key: Union[slice, Sequence[int], np.ndarray]) \
+            -> "ChordTable":
+        ...
+
+    def __getitem__(self, key) -> Union[Harte, "ChordTable"]:
+        if isinstance(key, (int, np.integer)):
+            return self.harte(key)
+        if not isinstance(key, slice):
+            key = np.asarray(key)
+            if key.dtype == bool and key.shape != (len(self),):
+                raise IndexError(f"The boolean mask should have shape "
+                                 f"({len(self)},), not {key.shape}.")
+        return self._from_columns(
+            {name: column[key] for name, column in self._columns.items()},
+            self.pool)
+
+    def __repr__(self) -> str:
+        return f"ChordTable({len(self)} chords)"
@@ -0,0 +1,235 @@
+"""
+Template matching of chroma features against Harte chords.
+A ChordTemplates object builds, once, the matrix of the binary templates of
+all the chords obtained by combining a set of roots with a set of shorthands
+(by default the twelve pitch classes and all the shorthands of
+SHORTHAND_DEGREES), optionally with the no-chord and the inversions. Chroma
+frames are then scored against all the templates with a matrix product,
+computed in chunks of frames to bound the memory used on long recordings.
+When the bass/treble split is enabled, templates and frames have 24 bins:
+the bass chroma (one-hot on the bass note of the chord) followed by the
+treble chroma.
+"""
+
+from typing import Iterator, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from harte.core import HarteCore
+from harte.mappings import SHORTHAND_DEGREES
+from harte.transpose import ROOT_SPELLINGS
+from harte.utils import interval_offsets
+from harte.vocabulary import NO_CHORD
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class TemplateMatch(NamedTuple):
+    """
+    Result of the matching of chroma frames: the best label and score of
+    each frame, and the indices and scores of the k best templates (sorted
+    from the best one)
+    """
+    labels: np.ndarray
+    scores: np.ndarray
+    top_indices: np.ndarray
+    top_scores: np.ndarray
+
+
+def _template_labels(roots: Sequence[str], shorthands: Sequence[str],
+                     inversions: bool) -> Iterator[str]:
+    """
+    Generate the labels of the templates, i.e. each shorthand on each root,
+    followed by its inversions if required
+    """
+    for root in roots:
+        for shorthand in shorthands:
+            yield f"{root}:{shorthand}"
+            if inversions:
+                for degree in SHORTHAND_DEGREES[shorthand]:
+                    if degree != "1":
+                        yield f"{root}:{shorthand}/{degree}"
+
+
+class ChordTemplates:
+    """
+    Matrix of chord templates used to estimate the chords of chroma frames.
+    """
+
+    # the options following the roots are keyword-only
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 shorthands: Optional[Sequence[str]] = None,
+                 roots: Optional[Sequence[str]] = None, *,
+                 no_chord: bool = True, bass: bool = False,
+                 inversions: bool = False, root_weight: float = 1.0,
+                 bass_weight: float = 1.0, normalize: bool = True):
+        """
+        Constructor of the ChordTemplates class
+        :param shorthands: the shorthands of the templates, defaults to all
+        the shorthands of SHORTHAND_DEGREES
+        :type shorthands: Sequence[str]
+        :param roots: the roots of the templates, defaults to the twelve
+        pitch classes (with the common spelling)
+        :type roots: Sequence[str]
+        :param no_chord: whether to add a flat template for the no-chord
+        :type no_chord: bool
+        :param bass: whether to split templates and frames into bass and
+        treble chroma
+        :type bass: bool
+        :param inversions: whether to add a template for each chord tone in
+        the bass (e.g. 'C:maj/3'), only used with the bass/treble split
+        :type inversions: bool
+        :param root_weight: weight of the root in the treble templates
+        :type root_weight: float
+        :param bass_weight: weight of the bass chroma with respect to the
+        treble chroma
+        :type bass_weight: float
+        :param normalize: whether frames are normalized to unit length, so
+        that the scores are cosine similarities. Templates are always
+        normalized, so that the ranking of the templates does not depend on
+        this option (otherwise the largest templates would always win)
+        :type normalize: bool
+        """
+        if shorthands is None:
+            shorthands = [x for x in SHORTHAND_DEGREES if x]
+        if roots is None:
+            roots = ROOT_SPELLINGS["common"]
+        self.bass = bass
+        self.normalize = normalize
+
+        labels = list(_template_labels(roots, shorthands,
+                                       bass and inversions))
+        rows = [self._template(HarteCore(label), root_weight, bass_weight)
+                for label in labels]
+        if no_chord:
+            labels.append(NO_CHORD)
+            rows.append(np.full(self.n_bins, 1.0))
+        matrix = np.array(rows, dtype=np.float32).reshape(-1, self.n_bins)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.labels = np.array(labels, dtype=np.str_)
+        self.matrix = matrix
+        self._no_chord = len(labels) - 1 if no_chord else None
+
+    @property
+    def n_bins(self) -> int:
+        """
+        Number of bins of templates and frames (24 with the bass/treble
+        split, 12 otherwise)
+        """
+        return 24 if self.bass else 12
+
+    def _template(self, chord: HarteCore, root_weight: float,
+                  bass_weight: float) -> np.ndarray:
+        """
+        Build the template of a chord
+        """
+        treble = np.array(chord.multi_hot_encoding(), dtype=np.float64)
+        treble[chord.root_pc] *= root_weight
+        if not self.bass:
+            return treble
+        bass = np.zeros(12)
+        bass[(chord.root_pc + interval_offsets(chord.bass)[1]) % 12] = \
+            bass_weight
+        return np.concatenate([bass, treble])
+
+    def _prepare(self, chroma: np.ndarray) -> np.ndarray:
+        """
+        Check and normalize an array of chroma frames
+        """
+        chroma = np.asarray(chroma, dtype=np.float32)
+        if chroma.ndim != 2 or chroma.shape[1] != self.n_bins:
+            raise ValueError(f"The chroma frames should have shape "
+                             f"(frames, {self.n_bins}), not {chroma.shape}.")
+        return chroma
+
+    def _score_block(self, block: np.ndarray) -> np.ndarray:
+        """
+        Score a block of chroma frames against all the templates
+        """
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        silent = norms[:, 0] == 0
+        if self.normalize:
+            block = block / np.where(norms > 0, norms, 1)
+        scores = block @ self.matrix.T
+        if self._no_chord is not None:
+            # silent frames (scored 0 by every template) are assigned to the
+            # no-chord
+            scores[silent, self._no_chord] = 1.0
+        return scores
+
+    def iter_scores(self, chroma: np.ndarray,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) \
+            -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Score chroma frames against all the templates, in chunks of frames
+        :param chroma: a (frames, n_bins) array of chroma features
+        :type chroma: np.ndarray
+        :param chunk_size: number of frames scored at once
+        :type chunk_size: int
+        :return: an iterator over tuples containing the index of the first
+        frame of a chunk and the (chunk_size, templates) array of its scores
+        :rtype: Iterator[Tuple[int, np.ndarray]]
+        """
+        if chunk_size <= 0:
+            raise ValueError("The size of the chunks must be positive.")
+        chroma = self._prepare(chroma)
+        for start in range(0, len(chroma), chunk_size):
+            yield start, self._score_block(chroma[start:start + chunk_size])
+
+    def scores(self, chroma: np.ndarray,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """
+        Score chroma frames against all the templates
+        :param chroma: a (frames, n_bins) array of chroma features
+        :type chroma: np.ndarray
+        :param chunk_size: number of frames scored at once
+        :type chunk_size: int
+        :return: the (frames, templates) array of the scores
+        :rtype: np.ndarray
+        """
+        out = np.empty((len(chroma), len(self)), dtype=np.float32)
+        for start, block in self.iter_scores(chroma, chunk_size):
+            out[start:start + len(block)] = block
+        return out
+
+    def match(self, chroma: np.ndarray, k: int = 1,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> TemplateMatch:
+        """
+        Find the best templates for each chroma frame
+        :param chroma: a (frames, n_bins) array of chroma features
+        :type chroma: np.ndarray
+        :param k: number of best templates returned for each frame
+        :type k: int
+        :param chunk_size: number of frames scored at once
+        :type chunk_size: int
+        :return: the best label and score of each frame, and the indices and
+        scores of the k best templates
+        :rtype: TemplateMatch
+        """
+        if k <= 0:
+            raise ValueError("The number of templates must be positive.")
+        top_k = min(k, len(self))
+        top_indices = np.empty((len(chroma), top_k), dtype=np.intp)
+        top_scores = np.empty((len(chroma), top_k), dtype=np.float32)
+        for start, block in self.iter_scores(chroma, chunk_size):
+            if top_k < block.shape[1]:
+                candidates = np.argpartition(-block, top_k - 1,
+                                             axis=1)[:, :top_k]
+            else:
+                candidates = np.broadcast_to(np.arange(block.shape[1]),
+                                             block.shape)
+            order = np.argsort(
+                -np.take_along_axis(block, candidates, axis=1), axis=1,
+                kind="stable")
+            indices = np.take_along_axis(candidates, order, axis=1)
+            top_indices[start:start + len(block)] = indices
+            top_scores[start:start + len(block)] = np.take_along_axis(
+                block, indices, axis=1)
+        return TemplateMatch(self.labels[top_indices[:, 0]],
+                             top_scores[:, 0].copy(), top_indices, top_scores)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __repr__(self) -> str:
+        return f"ChordTemplates({len(self)} templates, {self.n_bins} bins)"
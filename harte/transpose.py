@@ -0,0 +1,202 @@
+"""
+Transposition of Harte chords, operating directly on the labels.
+Only the spelling of the root is rewritten, so that shorthand, degrees and
+bass (which are relative to the root) are kept intact.
+"""
+
+import re
+from typing import Iterable, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from harte.core import NATURAL_PITCH_CLASSES, NOTE_STEPS, HarteCore, \
+    root_pitch_class
+from harte.parse_harte import parse_chord
+from harte.utils import interval_offsets
+from harte.vocabulary import ChordVocabulary
+
+# spelling of the twelve pitch classes for each spelling policy
+ROOT_SPELLINGS = {
+    "sharp": ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"),
+    "flat": ("C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"),
+    "common": ("C", "Db", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb",
+               "B"),
+}
+SPELLING_POLICIES = ("preserve", "diatonic") + tuple(ROOT_SPELLINGS)
+
+_ROOT_REGEX = re.compile(r"^(\s*)([A-G](?:\s*[b#])*)")
+
+
+def _preserved_policy(root: str) -> str:
+    """
+    Select the spelling of a root that keeps its accidentals, using the common
+    spelling for the natural roots
+    """
+    if "b" in root:
+        return "flat"
+    if "#" in root:
+        return "sharp"
+    return "common"
+
+
+def _diatonic_root(root: str, steps: int, semitones: int) -> str:
+    """
+    Transpose a root by the given staff steps and semitones
+    """
+    root_step = NOTE_STEPS.index(root[0])
+    root_pitch = NATURAL_PITCH_CLASSES[root[0]] + root.count("#") \
+        - root.count("b")
+    absolute_step = root_step + steps
+    natural = NATURAL_PITCH_CLASSES[NOTE_STEPS[absolute_step % 7]] \
+        + 12 * (absolute_step // 7)
+    alter = root_pitch + semitones - natural
+    alter = (alter + 6) % 12 - 6
+    return NOTE_STEPS[absolute_step % 7] + \
+        ("#" * alter if alter > 0 else "b" * -alter)
+
+
+def transpose_root(root: str, amount: Union[int, str],
+                   spelling_policy: Optional[str] = None) -> str:
+    """
+    Transpose the root of a chord
+    :param root: the root of a chord (e.g. 'Bb')
+    :type root: str
+    :param amount: either the number of semitones of the transposition
+    (possibly negative) or an ascending interval in Harte notation (e.g. 'b3')
+    :type amount: Union[int, str]
+    :param spelling_policy: how to spell the transposed root. 'diatonic'
+    moves the note name by the staff steps of the interval, and can only be
+    used with intervals; 'sharp', 'flat' and 'common' use a fixed spelling for
+    each pitch class; 'preserve' keeps sharps and flats of the original root.
+    Defaults to 'diatonic' for intervals and 'preserve' for semitones
+    :type spelling_policy: str
+    :return: the transposed root
+    :rtype: str
+    """
+    if spelling_policy is None:
+        spelling_policy = "diatonic" if isinstance(amount, str) \
+            else "preserve"
+    if spelling_policy not in SPELLING_POLICIES:
+        raise ValueError(f"spelling_policy must be one of "
+                         f"{SPELLING_POLICIES}, not {spelling_policy!r}.")
+    if isinstance(amount, str):
+        steps, semitones = interval_offsets(amount)
+    elif spelling_policy == "diatonic":
+        raise ValueError("The diatonic spelling requires an interval.")
+    else:
+        steps, semitones = None, int(amount)
+    if spelling_policy == "diatonic":
+        return _diatonic_root(root, steps, semitones)
+    if spelling_policy == "preserve":
+        spelling_policy = _preserved_policy(root)
+    return ROOT_SPELLINGS[spelling_policy][
+        (root_pitch_class(root) + semitones) % 12]
+
+
+def transpose(label: str, amount: Union[int, str],
+              spelling_policy: Optional[str] = None) -> str:
+    """
+    Transpose a chord, rewriting the spelling of its root. No-chords are
+    returned unchanged
+    :param label: a chord annotated according to the Harte notation
+    :type label: str
+    :param amount: either the number of semitones of the transposition
+    (possibly negative) or an ascending interval in Harte notation (e.g. 'b3')
+    :type amount: Union[int, str]
+    :param spelling_policy: how to spell the transposed root (see
+    transpose_root)
+    :type spelling_policy: str
+    :return: the transposed chord
+    :rtype: str
+    """
+    root = parse_chord(label).root
+    if root is None:
+        return label
+    return _ROOT_REGEX.sub(
+        lambda match: match.group(1) + transpose_root(root, amount,
+                                                      spelling_policy),
+        label, count=1)
+
+
+class Transpositions(NamedTuple):
+    """
+    The twelve transpositions of a collection of chords. Each array has a
+    row for each chord and a column for each transposition (by 0 to 11
+    semitones)
+    """
+    labels: np.ndarray
+    root_pcs: np.ndarray
+    masks: np.ndarray
+
+
+def _transposed_labels(labels: List[str], spelling_policy: str,
+                       new_pcs: np.ndarray) -> np.ndarray:
+    """
+    Spell the transposed labels, given the pitch classes of their
+    transposed roots (-1 for the no-chords, which are left unchanged)
+    """
+    policy_names = list(ROOT_SPELLINGS)
+    prefixes, suffixes, policies = [], [], []
+    for label in labels:
+        match = _ROOT_REGEX.match(label)
+        if match is None:
+            prefixes.append("")
+            suffixes.append(label)
+            policies.append(len(policy_names))
+            continue
+        root = match.group(2).replace(" ", "")
+        policy = _preserved_policy(root) if spelling_policy == "preserve" \
+            else spelling_policy
+        prefixes.append(match.group(1))
+        suffixes.append(label[match.end():])
+        policies.append(policy_names.index(policy))
+
+    # one row of root spellings for each policy, plus an empty one
+    spellings = np.array(list(ROOT_SPELLINGS.values()) + [("",) * 12])
+    policy_rows = np.where(new_pcs[:, 0] >= 0,
+                           np.array(policies, dtype=np.intp),
+                           len(policy_names))
+    new_roots = spellings[policy_rows[:, None], np.maximum(new_pcs, 0)]
+    return np.char.add(np.char.add(
+        np.array(prefixes, dtype=np.str_).reshape(-1, 1), new_roots),
+                       np.array(suffixes, dtype=np.str_)[:, None])
+
+
+def transpose_all(chords: Union[ChordVocabulary, Iterable[str]],
+                  spelling_policy: str = "preserve") -> Transpositions:
+    """
+    Compute the twelve transpositions of a collection of chords at once
+    :param chords: a ChordVocabulary or a sequence of labels
+    :type chords: Union[ChordVocabulary, Iterable[str]]
+    :param spelling_policy: how to spell the transposed roots, one of
+    'preserve', 'sharp', 'flat' and 'common'
+    :type spelling_policy: str
+    :return: the transposed labels, the pitch class of their roots (-1 for
+    the no-chords) and their 12-bit pitch-class masks
+    :rtype: Transpositions
+    """
+    if spelling_policy not in ROOT_SPELLINGS and \
+            spelling_policy != "preserve":
+        raise ValueError(f"spelling_policy must be one of 'preserve', "
+                         f"{tuple(ROOT_SPELLINGS)}, not {spelling_policy!r}.")
+    if isinstance(chords, ChordVocabulary):
+        labels: List[str] = chords.labels.tolist()
+        root_pcs = chords.root_pcs.astype(np.int16)
+        masks = chords.masks.astype(np.int32)
+    else:
+        labels = list(chords)
+        cores = [HarteCore(label) for label in labels]
+        root_pcs = np.array([-1 if core.is_empty() else core.root_pc
+                             for core in cores], dtype=np.int16)
+        masks = np.array([sum(bit << i for i, bit in
+                              enumerate(core.multi_hot_encoding()))
+                          for core in cores], dtype=np.int32)
+
+    shifts = np.arange(12, dtype=np.int16)
+    has_root = root_pcs >= 0
+    new_pcs = np.where(has_root[:, None], (root_pcs[:, None] + shifts) % 12,
+                       -1).astype(np.int8)
+    new_masks = ((masks[:, None] << shifts) | (masks[:, None] >> (12 - shifts))
+                 ) & 0xFFF
+    new_labels = _transposed_labels(labels, spelling_policy, new_pcs)
+    return Transpositions(new_labels, new_pcs, new_masks.astype(np.uint16))
@@ -6,14 +6,19 @@ Utility functions for processing Harte Chords
 # pylint: disable=too-many-branches
 
 import re
-from typing import List
+from functools import lru_cache
+from threading import Lock
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, \
+    Sequence, Tuple
 
-from harte.mappings import SHORTHAND_DEGREES
+from harte.mappings import DEGREE_SHORTHAND_MAP, SHORTHAND_DEGREES
 
 
-def convert_interval(harte_interval: str) -> str:
+def _convert_interval(harte_interval: str) -> str:
     """
-    Utility function to convert a Harte interval to a music21 interval
+    Convert a Harte interval to a music21 interval by parsing the interval.
+    This is used to build DEGREE_TABLE and for the intervals outside of it
     :param harte_interval: an interval of a Harte Chord
     :type harte_interval: str
     :return: the music21-shaped interval corresponding to the Harte interval
@@ -35,13 +40,13 @@ def convert_interval(harte_interval: str) -> str:
             modifier = "d"
         elif n_sharp == 2 and n_flat == 0:
             new_sharps = matches[0].replace("##", "")
-            return convert_interval(f"{new_sharps}{base_degree + 1}")
+            return _convert_interval(f"{new_sharps}{base_degree + 1}")
         elif n_sharp == 0 and n_flat == 2:
             new_flats = matches[1].replace("bb", "")
             if base_degree == 1:
                 base_degree = 8
                 new_flats += "b"
-            return convert_interval(f"{new_flats}{base_degree - 1}")
+            return _convert_interval(f"{new_flats}{base_degree - 1}")
         else:
             raise ValueError(f"The degree {harte_interval} cannot be parsed.")
     else:
@@ -59,6 +64,177 @@ def convert_interval(harte_interval: str) -> str:
     return modifier + str(base_degree)
 
 
+# semitones of the major and perfect simple intervals, by generic interval
+BASE_INTERVAL_SEMITONES = {1: 0, 2: 2, 3: 4, 4: 5, 5: 7, 6: 9, 7: 11}
+# semitone offsets of the music21 interval specifiers
+PERFECT_SPECIFIER_OFFSETS = {"P": 0, "A": 1, "d": -1}
+MAJOR_SPECIFIER_OFFSETS = {"M": 0, "A": 1, "m": -1, "d": -2}
+
+
+def _music21_offsets(m21_interval: str) -> Tuple[int, int]:
+    """
+    Compute staff steps and semitones of a simple music21 interval
+    :param m21_interval: a music21-shaped interval (e.g. 'm3')
+    :type m21_interval: str
+    :return: a tuple containing the number of staff steps and the number of
+    semitones of the interval (e.g. (2, 3) for 'm3')
+    :rtype: Tuple[int, int]
+    """
+    specifier, generic = m21_interval[0], int(m21_interval[1:])
+    if generic in [1, 4, 5]:
+        offset = PERFECT_SPECIFIER_OFFSETS[specifier]
+    else:
+        offset = MAJOR_SPECIFIER_OFFSETS[specifier]
+    return generic - 1, BASE_INTERVAL_SEMITONES[generic] + offset
+
+
+def _degree_sort_key(degree: str) -> float:
+    """
+    Compute the numerical value used for ordering a degree
+    :param degree: a chord degree
+    :type degree: str
+    :return: a numerical value needed for ordering the degree
+    :rtype: float
+    """
+    # extract number from degree
+    degree_number = int("".join([k for k in degree if k.isdigit()]))
+
+    # extract accidental from degree
+    if degree.startswith("b"):
+        degree_number -= 0.49
+    elif degree.startswith("#"):
+        degree_number += 0.49
+
+    return degree_number
+
+
+class DegreeInfo(NamedTuple):
+    """
+    Precomputed information on a Harte degree. The interval and the offsets
+    are None when the degree cannot be converted to a music21 interval.
+    """
+    interval: Optional[str]
+    steps: Optional[int]
+    semitones: Optional[int]
+    sort_key: float
+    valid: bool
+
+
+def _build_degree_table() -> Mapping[str, DegreeInfo]:
+    """
+    Build the table of all the degrees allowed by the grammar, i.e. the
+    intervals from 1 to 13 with up to two modifiers, possibly marked as
+    missing with '*'
+    :return: a read-only mapping from each degree to its information
+    :rtype: Mapping[str, DegreeInfo]
+    """
+    table = {}
+    for missing in ["", "*"]:
+        for modifier in ["", "b", "bb", "#", "##"]:
+            for interval in range(1, 14):
+                degree = f"{missing}{modifier}{interval}"
+                try:
+                    m21_interval = _convert_interval(degree)
+                    steps, semitones = _music21_offsets(m21_interval)
+                    valid = True
+                except ValueError:
+                    m21_interval, steps, semitones = None, None, None
+                    valid = False
+                table[degree] = DegreeInfo(m21_interval, steps, semitones,
+                                           _degree_sort_key(degree), valid)
+    return MappingProxyType(table)
+
+
+DEGREE_TABLE = _build_degree_table()
+
+
+def convert_interval(harte_interval: str) -> str:
+    """
+    Utility function to convert a Harte interval to a music21 interval
+    :param harte_interval: an interval of a Harte Chord
+    :type harte_interval: str
+    :return: the music21-shaped interval corresponding to the Harte interval
+    format as a string
+    :rtype: str
+    """
+    info = DEGREE_TABLE.get(harte_interval)
+    if info is None:
+        return _convert_interval(harte_interval)
+    if not info.valid:
+        raise ValueError(f"The degree {harte_interval} cannot be parsed.")
+    return info.interval
+
+
+def interval_offsets(harte_interval: str) -> Tuple[int, int]:
+    """
+    Utility function to compute the staff steps and the semitones that
+    separate the root of a chord from one of its degrees, following the
+    conversion operated by convert_interval (i.e. compound intervals are
+    reduced to simple intervals)
+    :param harte_interval: an interval of a Harte Chord
+    :type harte_interval: str
+    :return: a tuple containing the number of staff steps and the number of
+    semitones above the root (e.g. (2, 3) for 'b3')
+    :rtype: Tuple[int, int]
+    """
+    info = DEGREE_TABLE.get(harte_interval)
+    if info is None:
+        return _music21_offsets(_convert_interval(harte_interval))
+    if not info.valid:
+        raise ValueError(f"The degree {harte_interval} cannot be parsed.")
+    return info.steps, info.semitones
+
+
+def resolve_degrees(harte_shorthand: Optional[str],
+                    harte_degrees: Sequence[str],
+                    harte_bass: str) -> List[str]:
+    """
+    Utility function to resolve all the degrees of a chord, merging the
+    degrees of the shorthand (if any) with the explicit degrees, removing the
+    missing ones (i.e. those starting with '*') and adding root and bass
+    :param harte_shorthand: the shorthand of a Harte Chord, if any
+    :type harte_shorthand: str
+    :param harte_degrees: the explicit degrees of a Harte Chord
+    :type harte_degrees: Sequence[str]
+    :param harte_bass: the bass of a Harte Chord (e.g. '1' if root position)
+    :type harte_bass: str
+    :return: the sorted list of all the degrees of the chord
+    :rtype: List[str]
+    """
+    all_degrees = ["1"]
+    harte_degrees = list(harte_degrees)
+    removed_degrees = [x.replace("*", "") for x in harte_degrees
+                       if x.startswith("*")]
+
+    # unwrap shorthand if it exists and merge with degrees
+    if harte_shorthand:
+        assert SHORTHAND_DEGREES[
+            harte_shorthand
+        ], "The Harte shorthand is not valid."
+        all_degrees += SHORTHAND_DEGREES[harte_shorthand] + harte_degrees
+    # if no shorthand exists, just use the degrees
+    elif harte_degrees and len(harte_degrees) > len(removed_degrees):
+        all_degrees += harte_degrees
+    # if no degrees exist, assume the chord is a major triad
+    else:
+        all_degrees += ["3", "5"]
+
+    # remove the degrees included in removed_degrees and the ones that start
+    # with '*'
+    all_degrees = [
+        x
+        for x in set(all_degrees)
+        if x not in removed_degrees and x[0] != "*"
+    ]
+    # add root and bass note to the overall list of degrees
+    all_degrees.append(harte_bass)
+
+    # sort the list and remove duplicates
+    all_degrees = list(set(all_degrees))
+    all_degrees.sort(key=degree_to_sort_key)
+    return all_degrees
+
+
 def unwrap_shorthand(harte_shorthand: str, harte_degrees: list) -> List[str]:
     """
     DEPRECATED
@@ -90,13 +266,128 @@ def degree_to_sort_key(degree: str) -> float:
     :return: a numerical value needed for ordering the degree
     :rtype: float
     """
-    # extract number from degree
-    degree_number = int("".join([k for k in degree if k.isdigit()]))
+    info = DEGREE_TABLE.get(degree)
+    if info is None:
+        return _degree_sort_key(degree)
+    return info.sort_key
 
-    # extract accidental from degree
-    if degree.startswith("b"):
-        degree_number -= 0.49
-    elif degree.startswith("#"):
-        degree_number += 0.49
 
-    return degree_number
+# bit of each degree in the interval-set keys, assigned following the order
+# of the degrees. Degrees outside DEGREE_TABLE get a new bit when first seen
+_DEGREE_BITS: Dict[str, int] = {
+    degree: bit for bit, degree in enumerate(
+        sorted(DEGREE_TABLE, key=lambda x: (DEGREE_TABLE[x].sort_key, x)))
+}
+_BIT_DEGREES: List[str] = list(_DEGREE_BITS)
+_DEGREE_BITS_LOCK = Lock()
+
+
+def degree_bit(degree: str) -> int:
+    """
+    Utility function to retrieve the bit associated to a degree in the
+    interval-set keys
+    :param degree: a chord degree
+    :type degree: str
+    :return: the position of the bit associated to the degree
+    :rtype: int
+    """
+    bit = _DEGREE_BITS.get(degree)
+    if bit is None:
+        with _DEGREE_BITS_LOCK:
+            bit = _DEGREE_BITS.get(degree)
+            if bit is None:
+                bit = _DEGREE_BITS[degree] = len(_BIT_DEGREES)
+                _BIT_DEGREES.append(degree)
+    return bit
+
+
+def degrees_to_key(degrees: Iterable[str]) -> int:
+    """
+    Utility function to compute the interval-set key of a collection of
+    degrees, i.e. a bitmask in which each degree sets its own bit
+    :param degrees: a collection of chord degrees
+    :type degrees: Iterable[str]
+    :return: the interval-set key of the degrees
+    :rtype: int
+    """
+    key = 0
+    for degree in degrees:
+        key |= 1 << degree_bit(degree)
+    return key
+
+
+def key_to_degrees(key: int) -> List[str]:
+    """
+    Utility function to retrieve the degrees of an interval-set key
+    :param key: an interval-set key
+    :type key: int
+    :return: the sorted list of the degrees in the key
+    :rtype: List[str]
+    """
+    degrees = []
+    bit = 0
+    while key:
+        if key & 1:
+            degrees.append(_BIT_DEGREES[bit])
+        key >>= 1
+        bit += 1
+    return sorted(degrees, key=degree_to_sort_key)
+
+
+_ROOT_BIT = 1 << degree_bit("1")
+_MISSING_THIRD_BIT = 1 << degree_bit("*3")
+_SHORTHAND_KEYS = [(degrees_to_key(grades), shorthand)
+                   for grades, shorthand in DEGREE_SHORTHAND_MAP.items()]
+SHORTHAND_SPAN = degrees_to_key(
+    {degree for grades in DEGREE_SHORTHAND_MAP for degree in grades})
+
+
+def _build_prettify_table() -> Mapping[int, Optional[Tuple[str, int]]]:
+    """
+    Build the table mapping each subset of the degrees that appear in
+    DEGREE_SHORTHAND_MAP to the first shorthand whose degrees are all part of
+    the subset
+    :return: a read-only mapping from each subset (as interval-set key) to
+    the shorthand and its interval-set key, or None if no shorthand matches
+    :rtype: Mapping[int, Optional[Tuple[str, int]]]
+    """
+    bits = [1 << bit for bit in range(SHORTHAND_SPAN.bit_length())
+            if SHORTHAND_SPAN >> bit & 1]
+    table = {}
+    for subset in range(1 << len(bits)):
+        key = 0
+        for position, bit in enumerate(bits):
+            if subset >> position & 1:
+                key |= bit
+        table[key] = None
+        for shorthand_key, shorthand in _SHORTHAND_KEYS:
+            if shorthand_key & key == shorthand_key:
+                table[key] = (shorthand, shorthand_key)
+                break
+    return MappingProxyType(table)
+
+
+PRETTIFY_TABLE = _build_prettify_table()
+
+
+@lru_cache(maxsize=None)
+def prettify_key(key: int) -> Optional[str]:
+    """
+    Utility function to summarise the degrees of an interval-set key with the
+    most concise shorthand, if possible. The root is left out, and the
+    degrees that are not part of the shorthand are listed after it
+    :param key: the interval-set key of all the degrees of a chord
+    :type key: int
+    :return: the shorthand followed by the remaining degrees (e.g.
+    'minmaj7(9)'), or None if no shorthand summarises the degrees
+    :rtype: str
+    """
+    entry = PRETTIFY_TABLE[key & SHORTHAND_SPAN]
+    if entry is None:
+        return None
+    shorthand, shorthand_key = entry
+    remaining = key & ~shorthand_key & ~_ROOT_BIT
+    if "sus" in shorthand:
+        remaining &= ~_MISSING_THIRD_BIT
+    degrees = key_to_degrees(remaining)
+    return shorthand + (f'({",".join(degrees)})' if degrees else "")
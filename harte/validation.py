@@ -0,0 +1,119 @@
+"""
+Validation of Harte chords without building them.
+A label is valid if it can be parsed according to the Harte grammar and all
+the notes of the chord can be resolved, i.e. if Harte(label) succeeds.
+Invalid labels are reported with one of the following kinds of error:
+  * syntax   the label does not follow the Harte grammar
+  * root     the root has an unsupported alteration (e.g. 'Cb#' or 'C#####')
+  * degree   a degree of the chord cannot be resolved (e.g. '##3') or
+             spelled (e.g. '4' over 'Fbbbb')
+together with the position of the offending character in the label. No
+music21 object is involved, and the Lark parser is only used to locate the
+syntax errors.
+"""
+
+import re
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from harte.core import is_spellable_degree, is_valid_root
+from harte.encoding import index_labels
+from harte.parse_harte import try_parse
+from harte.utils import interval_offsets, resolve_degrees
+
+ERROR_KINDS = ("syntax", "root", "degree")
+
+
+class ValidationError(NamedTuple):
+    """
+    Error found in a label of a collection
+    """
+    index: int
+    label: str
+    kind: str
+    position: int
+
+
+class ValidationReport(NamedTuple):
+    """
+    Result of the validation of a collection of labels: a boolean mask of
+    the valid labels and the errors of the invalid ones, sorted by index
+    """
+    valid: np.ndarray
+    errors: List[ValidationError]
+
+
+def _degree_position(label: str, degree: str, is_bass: bool) -> int:
+    """
+    Locate a degree within a label
+    """
+    pattern = re.compile(rf"(?<![b#*\d]){re.escape(degree)}(?!\d)")
+    matches = list(pattern.finditer(label))
+    if not matches:
+        return 0
+    return (matches[-1] if is_bass else matches[0]).start()
+
+
+def check(label: str) -> Optional[Tuple[str, int]]:
+    """
+    Check whether a label is a valid Harte chord
+    :param label: a chord annotated according to the Harte notation
+    :type label: str
+    :return: None if the label is valid, otherwise a tuple containing the
+    kind of error and the position at which it occurs
+    :rtype: Optional[Tuple[str, int]]
+    """
+    parsed_chord, position = try_parse(label)
+    if parsed_chord is None:
+        return "syntax", position
+    if parsed_chord.root is None:
+        return None
+    if not is_valid_root(parsed_chord.root):
+        return "root", label.find(parsed_chord.root[0]) + 1
+    bass = parsed_chord.bass or "1"
+    for degree in resolve_degrees(parsed_chord.shorthand,
+                                  parsed_chord.degrees, bass):
+        try:
+            steps, _ = interval_offsets(degree)
+        except ValueError:
+            steps = None
+        if steps is None or \
+                not is_spellable_degree(parsed_chord.root, steps):
+            is_bass = degree == bass and degree not in parsed_chord.degrees
+            return "degree", _degree_position(label, degree, is_bass)
+    return None
+
+
+def is_valid(label: str) -> bool:
+    """
+    Check whether a label is a valid Harte chord
+    :param label: a chord annotated according to the Harte notation
+    :type label: str
+    :return: True if the label is valid
+    :rtype: bool
+    """
+    return check(label) is None
+
+
+def validate_many(labels: Iterable[str]) -> ValidationReport:
+    """
+    Validate a collection of labels in a single pass, checking each distinct
+    label only once
+    :param labels: a sequence of chords annotated according to the Harte
+    notation
+    :type labels: Iterable[str]
+    :return: the mask of the valid labels and the errors of the invalid ones
+    :rtype: ValidationReport
+    """
+    distinct, inverse = index_labels(labels)
+    results = [check(label) for label in distinct]
+    distinct_valid = np.array([result is None for result in results],
+                              dtype=bool)
+    valid = distinct_valid[inverse]
+    errors = [ValidationError(index, distinct[label_id],
+                              *results[label_id])
+              for index, label_id in
+              zip(np.flatnonzero(~valid).tolist(),
+                  inverse[~valid].tolist())]
+    return ValidationReport(valid, errors)
@@ -0,0 +1,288 @@
+"""
+Vocabulary of Harte chords, mapping chord labels to stable integer IDs.
+Chords are identified by their prettified form, so that equivalent labels
+(e.g. 'C:(3,5)' and 'C:maj') share the same ID. For each ID the vocabulary
+stores the root pitch class, the bass offset, the 12-bit pitch-class mask and
+the canonical label in contiguous arrays, which can be saved to and loaded
+from (memory-mapped) .npz files.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from harte.core import HarteCore
+from harte.encoding import index_labels
+from harte.storage import load_arrays, save_arrays
+from harte.utils import interval_offsets
+
+NO_CHORD = "N"
+UNKNOWN_CHORD = "X"
+
+
+def canonical_label(label: str) -> str:
+    """
+    Compute the canonical form of a chord label, i.e. its prettified form
+    ('N' for the no-chords and 'X' for the unknown chords, which are kept
+    apart as in MIREX)
+    :param label: a chord annotated according to the Harte notation
+    :type label: str
+    :return: the canonical form of the chord
+    :rtype: str
+    """
+    if label.strip() == UNKNOWN_CHORD:
+        return UNKNOWN_CHORD
+    core = HarteCore(label)
+    return NO_CHORD if core.is_empty() else core.prettify()
+
+
+class ChordVocabulary:
+    """
+    Vocabulary assigning a stable integer ID to each distinct chord, in order
+    of first appearance. IDs are preserved when the vocabulary is saved and
+    loaded again, and new chords are always appended.
+    """
+
+    def __init__(self, labels: Iterable[str] = ()):
+        """
+        Constructor of the ChordVocabulary class
+        :param labels: labels to be added to the vocabulary
+        :type labels: Iterable[str]
+        """
+        # the lists are None for loaded vocabularies, whose chords are only
+        # stored in the (possibly memory-mapped) arrays until a chord is
+        # appended
+        self._canonical_ids: Optional[Dict[str, int]] = {}
+        self._label_ids: Dict[str, int] = {}
+        self._labels: Optional[List[str]] = []
+        self._root_pcs: Optional[List[int]] = []
+        self._bass_offsets: Optional[List[int]] = []
+        self._masks: Optional[List[int]] = []
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        for label in labels:
+            self.add(label)
+
+    def _canonical_index(self) -> Dict[str, int]:
+        """
+        Retrieve the mapping of the canonical labels to their IDs, building
+        it on the first lookup for loaded vocabularies
+        """
+        if self._canonical_ids is None:
+            self._canonical_ids = {label: chord_id for chord_id, label
+                                   in enumerate(self.labels.tolist())}
+        return self._canonical_ids
+
+    def _lists(self) -> None:
+        """
+        Copy the arrays of a loaded vocabulary to lists, so that chords can
+        be appended
+        """
+        if self._labels is None:
+            arrays = self._arrays
+            self._labels = arrays["labels"].tolist()
+            self._root_pcs = arrays["root_pcs"].tolist()
+            self._bass_offsets = arrays["bass_offsets"].tolist()
+            self._masks = arrays["masks"].tolist()
+
+    def _append(self, canonical: str, root_pc: int, bass_offset: int,
+                mask: int) -> int:
+        """
+        Append a new chord to the vocabulary, returning its ID
+        """
+        canonical_ids = self._canonical_index()
+        self._lists()
+        chord_id = canonical_ids[canonical] = len(self._labels)
+        self._labels.append(canonical)
+        self._root_pcs.append(root_pc)
+        self._bass_offsets.append(bass_offset)
+        self._masks.append(mask)
+        self._arrays = None
+        return chord_id
+
+    def add(self, label: str) -> int:
+        """
+        Retrieve the ID of a chord, adding the chord to the vocabulary if it
+        is not part of it
+        :param label: a chord annotated according to the Harte notation
+        :type label: str
+        :return: the ID of the chord
+        :rtype: int
+        """
+        chord_id = self._label_ids.get(label)
+        if chord_id is not None:
+            return chord_id
+        core = HarteCore(label)
+        canonical = canonical_label(label)
+        chord_id = self._canonical_index().get(canonical)
+        if chord_id is None:
+            if core.is_empty():
+                chord_id = self._append(canonical, -1, -1, 0)
+            else:
+                mask = 0
+                for pitch_class in core.get_pitch_classes():
+                    mask |= 1 << pitch_class
+                bass_offset = interval_offsets(core.bass)[1] % 12
+                chord_id = self._append(canonical, core.root_pc,
+                                        bass_offset, mask)
+        self._label_ids[label] = chord_id
+        return chord_id
+
+    # the vocabulary can be used as label index by the annotation readers
+    index = add
+
+    def get(self, label: str, default: Optional[int] = None) -> Optional[int]:
+        """
+        Retrieve the ID of a chord without adding it to the vocabulary
+        :param label: a chord annotated according to the Harte notation
+        :type label: str
+        :param default: the value returned if the chord is not part of the
+        vocabulary
+        :type default: int
+        :return: the ID of the chord, or default if the chord is not part of
+        the vocabulary
+        :rtype: int
+        """
+        chord_id = self._label_ids.get(label)
+        if chord_id is None:
+            chord_id = self._canonical_index().get(canonical_label(label))
+            if chord_id is None:
+                return default
+            self._label_ids[label] = chord_id
+        return chord_id
+
+    def encode(self, labels: Iterable[str], add: bool = True) -> np.ndarray:
+        """
+        Map a sequence of labels to their IDs. Each distinct label is looked
+        up only once
+        :param labels: a sequence of chords annotated according to the Harte
+        notation
+        :type labels: Iterable[str]
+        :param add: whether to add the chords that are not part of the
+        vocabulary. If False, such chords are mapped to -1
+        :type add: bool
+        :return: an array containing the ID of each label
+        :rtype: np.ndarray
+        """
+        distinct, inverse = index_labels(labels)
+        lookup = self.add if add else lambda label: self.get(label, -1)
+        ids = np.array([lookup(label) for label in distinct], dtype=np.int32)
+        return ids[inverse]
+
+    def decode(self, chord_ids: Iterable[int]) -> List[str]:
+        """
+        Map a sequence of IDs to the canonical labels of the chords
+        :param chord_ids: a sequence of IDs
+        :type chord_ids: Iterable[int]
+        :return: the canonical label of each chord
+        :rtype: List[str]
+        """
+        return [self[chord_id] for chord_id in chord_ids]
+
+    def multi_hot(self, chord_ids: Union[np.ndarray, Iterable[int]],
+                  transpose: bool = False) -> np.ndarray:
+        """
+        Compute the multi-hot encoding of a sequence of chords by gathering
+        their pitch-class masks
+        :param chord_ids: a sequence of IDs
+        :type chord_ids: Union[np.ndarray, Iterable[int]]
+        :param transpose: whether to transpose each chord so that its root
+        note is at the 0th position
+        :type transpose: bool
+        :return: an (N, 12) array of uint8 containing the encodings
+        :rtype: np.ndarray
+        """
+        chord_ids = np.asarray(chord_ids, dtype=np.intp)
+        masks = self.masks[chord_ids].astype(np.int32)
+        if transpose:
+            shift = np.maximum(self.root_pcs[chord_ids], 0).astype(np.int32)
+            masks = ((masks >> shift) | (masks << (12 - shift))) & 0xFFF
+        return ((masks[:, None] >> np.arange(12)) & 1).astype(np.uint8)
+
+    def _materialise(self) -> Dict[str, np.ndarray]:
+        """
+        Build (and cache) the contiguous arrays of the vocabulary
+        """
+        if self._arrays is None:
+            self._arrays = {
+                "labels": np.array(self._labels, dtype=np.str_),
+                "root_pcs": np.array(self._root_pcs, dtype=np.int8),
+                "bass_offsets": np.array(self._bass_offsets, dtype=np.int8),
+                "masks": np.array(self._masks, dtype=np.uint16),
+            }
+        return self._arrays
+
+    @property
+    def labels(self) -> np.ndarray:
+        """
+        Canonical label of each chord
+        """
+        return self._materialise()["labels"]
+
+    @property
+    def root_pcs(self) -> np.ndarray:
+        """
+        Root pitch class of each chord (-1 for the no-chord and the unknown
+        chord)
+        """
+        return self._materialise()["root_pcs"]
+
+    @property
+    def bass_offsets(self) -> np.ndarray:
+        """
+        Semitones between root and bass of each chord (-1 for the no-chord
+        and the unknown chord)
+        """
+        return self._materialise()["bass_offsets"]
+
+    @property
+    def masks(self) -> np.ndarray:
+        """
+        12-bit mask of the pitch classes of each chord (bit i is set if the
+        pitch class i is part of the chord)
+        """
+        return self._materialise()["masks"]
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Save the vocabulary to an uncompressed .npz file
+        :param path: path of the .npz file
+        :type path: Union[str, os.PathLike]
+        """
+        save_arrays(path, **self._materialise())
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike],
+             mmap_mode: Optional[str] = None) -> "ChordVocabulary":
+        """
+        Load a vocabulary from a .npz file
+        :param path: path of the .npz file
+        :type path: Union[str, os.PathLike]
+        :param mmap_mode: if given, the arrays are memory-mapped with this
+        mode (see numpy.memmap)
+        :type mmap_mode: str
+        :return: the loaded vocabulary
+        :rtype: ChordVocabulary
+        """
+        vocabulary = cls()
+        vocabulary._arrays = load_arrays(path, mmap_mode)
+        vocabulary._canonical_ids = None
+        vocabulary._labels = vocabulary._root_pcs = None
+        vocabulary._bass_offsets = vocabulary._masks = None
+        return vocabulary
+
+    def __len__(self) -> int:
+        if self._labels is None:
+            return len(self._arrays["labels"])
+        return len(self._labels)
+
+    def __contains__(self, label: str) -> bool:
+        return self.get(label) is not None
+
+    def __getitem__(self, chord_id: int) -> str:
+        if self._labels is None:
+            return str(self._arrays["labels"][chord_id])
+        return self._labels[chord_id]
+
+    def __repr__(self) -> str:
+        return f"ChordVocabulary({len(self)} chords)"
@@ -0,0 +1,93 @@
+"""
+Test cases for the annotations module.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from harte import annotations
+from harte.annotations import INVALID_ID, LabelIndex, read_annotations, \
+    read_jams, read_lab
+
+LAB = """0.000 1.500 N
+1.500 3.000 C:maj
+
+3.000 4.250\tA:min7/b3
+4.250 6.000 C:maj
+6.000 7.000 C:foo
+"""
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_read_lab(tmp_path, use_mmap: bool):
+    """
+    Test the streaming of a .lab file in bounded chunks.
+
+    :param tmp_path: pytest fixture
+    :param use_mmap: Whether the file is memory-mapped
+    :type use_mmap: bool
+    """
+    path = tmp_path / "track.lab"
+    path.write_text(LAB, encoding="utf-8")
+    index = LabelIndex()
+    batches = list(read_lab(path, index, chunk_size=2, use_mmap=use_mmap,
+                            strict=False))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    onsets = np.concatenate([batch.onsets for batch in batches])
+    chord_ids = np.concatenate([batch.chord_ids for batch in batches])
+    assert onsets.tolist() == [0.0, 1.5, 3.0, 4.25, 6.0]
+    assert chord_ids.tolist() == [0, 1, 2, 1, INVALID_ID]
+    assert index.labels == ["N", "C:maj", "A:min7/b3"]
+
+    with pytest.raises(Exception):
+        list(read_lab(path))
+
+
+def test_read_annotations(tmp_path):
+    """
+    Test that labels share the same IDs across .lab and JAMS files.
+
+    :param tmp_path: pytest fixture
+    """
+    lab_path = tmp_path / "track.lab"
+    lab_path.write_text("0 1 G:7\n1 2 C:maj\n", encoding="utf-8")
+    jams_path = tmp_path / "track.jams"
+    jams_path.write_text(json.dumps({"annotations": [
+        {"namespace": "chord", "data": [
+            {"time": 0.5, "duration": 1.0, "value": "C:maj"},
+            {"time": 1.5, "duration": 0.5, "value": "D:min"},
+        ]},
+        {"namespace": "key_mode", "data": [
+            {"time": 0.0, "duration": 2.0, "value": "C:major"},
+        ]},
+    ]}), encoding="utf-8")
+
+    index = LabelIndex()
+    batches = dict(read_annotations([lab_path, jams_path], index))
+    assert batches[lab_path].chord_ids.tolist() == [0, 1]
+    assert batches[jams_path].chord_ids.tolist() == [1, 2]
+    assert batches[jams_path].offsets.tolist() == [1.5, 2.0]
+    assert len(list(read_jams(jams_path, namespace="chord_harte"))) == 0
+
+
+def test_label_index_errors(monkeypatch):
+    """
+    Test that each invalid label is parsed only once.
+
+    :param monkeypatch: pytest fixture
+    """
+    parsed = []
+
+    def parse_chord(label):
+        parsed.append(label)
+        raise ValueError(label)
+
+    monkeypatch.setattr(annotations, "parse_chord", parse_chord)
+    index = LabelIndex()
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            index.index("C:foo")
+    assert parsed == ["C:foo"]
+    assert "C:foo" not in index and len(index) == 0
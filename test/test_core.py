@@ -0,0 +1,103 @@
+"""
+Test cases for the core module.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from harte.core import HarteCore
+from harte.harte import Harte
+
+CUR_DIR = os.path.dirname(os.path.realpath(__file__))
+with open(os.path.join(CUR_DIR, "chords_count.json"), encoding="UTF-8") as f:
+    CHORDS_COUNT = json.load(f)
+
+
+@pytest.mark.parametrize("chord", list(CHORDS_COUNT.keys()))
+def test_core_matches_harte(chord: str):
+    """
+    Test that the lightweight chord answers as the music21-based Harte class
+    for every chord extracted from ChoCo.
+
+    :param chord: Chord to be tested
+    :type chord: str
+    """
+    try:
+        harte = Harte(chord)
+    except Exception:  # pylint: disable=broad-except
+        with pytest.raises(Exception):
+            HarteCore(chord)
+        return
+    core = HarteCore(chord)
+    if harte.get_root() is None:
+        assert core.is_empty()
+        return
+    assert core.get_root() == harte.get_root()
+    assert core.get_bass() == harte.get_bass()
+    assert core.get_degrees() == harte.get_degrees()
+    assert core.unwrap_shorthand() == harte.unwrap_shorthand()
+    assert core.get_midi_pitches() == harte.get_midi_pitches()
+    assert core.multi_hot_encoding() == harte.multi_hot_encoding()
+    assert core.multi_hot_encoding(True) == harte.multi_hot_encoding(True)
+    assert core.get_interval_key() == harte.get_interval_key()
+    assert core.prettify() == harte.prettify()
+
+
+@pytest.mark.parametrize(
+    "chord", ["E###:hdim13/#3", "C####:aug/#5", "Dbbbb:dim7/bb7",
+              "Fbbbb:dim/b5", "Abbbb:min/bb3"])
+def test_core_respelled_pitches(chord: str):
+    """
+    Test the pitches that music21 respells because they would need too many
+    accidentals (e.g. the bass of 'E###:hdim13/#3' is 'C3', not 'G#####3').
+
+    :param chord: Chord with a degree needing more than four accidentals
+    :type chord: str
+    """
+    harte = Harte(chord)
+    core = HarteCore(chord)
+    assert core.get_midi_pitches() == harte.get_midi_pitches()
+    assert core.multi_hot_encoding(True) == harte.multi_hot_encoding(True)
+
+
+@pytest.mark.parametrize(
+    "chord", ["Cb#:maj", "C#####:maj", "Dbbbbb:min/3", "Fbbbb:sus4",
+              "Fbbbb:5/#4"])
+def test_core_invalid_root(chord: str):
+    """
+    Test that the roots and degrees rejected by the Harte class are rejected
+    as well.
+
+    :param chord: Chord with an unsupported root or degree
+    :type chord: str
+    """
+    with pytest.raises(Exception):
+        Harte(chord)
+    with pytest.raises(ValueError):
+        HarteCore(chord)
+
+
+def test_core_to_harte():
+    """
+    Test the lazy materialisation of the music21 object.
+    """
+    core = HarteCore("C#:maj7(b6)/b3")
+    harte = core.to_harte()
+    assert isinstance(harte, Harte)
+    assert core.to_harte() is harte
+    assert harte.get_midi_pitches() == core.get_midi_pitches()
+
+
+def test_core_does_not_import_music21():
+    """
+    Test that parsing and normalising chords does not load music21.
+    """
+    code = ("import sys; from harte.core import HarteCore; "
+            "HarteCore('C:maj7').prettify(); "
+            "assert 'music21' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(CUR_DIR),
+                   check=True)
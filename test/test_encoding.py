@@ -0,0 +1,42 @@
+"""
+Test cases for the encoding module.
+"""
+
+import numpy as np
+import pytest
+
+from harte.encoding import encode_many
+from harte.harte import Harte
+
+LABELS = ["C:maj", "A:min7/b3", "N", "C:maj", "Bb:7(#9)", "A:min7/b3"]
+
+
+@pytest.mark.parametrize("transpose", [False, True])
+def test_encode_many(transpose: bool):
+    """
+    Test that the batched encoding matches the encoding of each chord.
+
+    :param transpose: Whether chords are transposed to their root
+    :type transpose: bool
+    """
+    encoded = encode_many(LABELS, transpose=transpose)
+    assert encoded.shape == (len(LABELS), 12)
+    assert encoded.dtype == np.uint8
+    for label, row in zip(LABELS, encoded):
+        expected = [0] * 12 if label == "N" else \
+            Harte(label).multi_hot_encoding(transpose)
+        assert row.tolist() == expected
+
+
+def test_encode_many_out():
+    """
+    Test the reuse of a preallocated output array.
+    """
+    out = np.ones((len(LABELS), 12), dtype=bool)
+    result = encode_many(LABELS, out=out)
+    assert result is out
+    assert not out[2].any()
+    assert out.sum() == np.array(encode_many(LABELS), dtype=bool).sum()
+
+    with pytest.raises(ValueError):
+        encode_many(LABELS, out=np.empty((2, 12)))
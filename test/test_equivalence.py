@@ -0,0 +1,105 @@
+"""
+Test cases for the equivalence of chords.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from harte.core import HarteCore
+from harte.equivalence import canonical_key, dedupe, equivalent
+from harte.harte import Harte
+
+
+@pytest.mark.parametrize(
+    "first,second,levels",
+    [
+        ("C:maj", "C:(3,5)", ["spelling", "enharmonic", "pitch_class_set"]),
+        ("C:maj", "C:maj/1", ["spelling", "enharmonic", "pitch_class_set"]),
+        ("C#:maj", "Db:maj", ["enharmonic", "pitch_class_set"]),
+        ("C:(b3,5)", "C:(#2,5)", ["enharmonic", "pitch_class_set"]),
+        ("C:maj6", "A:min7", ["pitch_class_set"]),
+        ("C:maj/3", "C:maj", ["pitch_class_set"]),
+        ("C:maj9", "C:maj7(2)", ["enharmonic", "pitch_class_set"]),
+        ("N", "X", ["spelling", "enharmonic", "pitch_class_set"]),
+        ("C:maj", "C:min", []),
+        ("N", "C:(1)", []),
+    ],
+)
+def test_equivalent(first: str, second: str, levels: list):
+    """
+    Test the levels at which two chords are equivalent.
+
+    :param first: First chord
+    :type first: str
+    :param second: Second chord
+    :type second: str
+    :param levels: Levels at which the chords are equivalent
+    :type levels: list
+    """
+    for level in ["spelling", "enharmonic", "pitch_class_set"]:
+        assert equivalent(first, second, level) == (level in levels)
+        assert canonical_key(Harte(first), level) == \
+            canonical_key(HarteCore(first), level) == \
+            canonical_key(first, level)
+    assert (Harte(first) == Harte(second)) == ("spelling" in levels)
+    assert (HarteCore(first) == HarteCore(second)) == ("spelling" in levels)
+    if "spelling" in levels:
+        assert hash(Harte(first)) == hash(Harte(second))
+
+
+def test_hashable():
+    """
+    Test that chords can be used in sets and as dictionary keys.
+    """
+    chords = {Harte("C:maj"), Harte("C:(3,5)"), Harte("C:min")}
+    assert len(chords) == 2
+    assert {Harte("C:maj"): 1}[Harte("C:(3,5)")] == 1
+    with pytest.raises(ValueError):
+        canonical_key("C:maj", "german")
+
+
+def test_hash_after_mutation():
+    """
+    Test that the key of a chord is cached and is not changed by in-place
+    transpositions, so that the chord can still be found in a set.
+    """
+    chord = Harte("C:maj")
+    chords = {chord}
+    key = chord.canonical_key()
+    assert chord.canonical_key() is key
+    chord.transpose(2, inPlace=True)
+    assert chord.canonical_key() == key
+    assert chord in chords
+    assert chord == Harte("C:(3,5)")
+
+
+def test_dedupe():
+    """
+    Test the deduplication of labels at each level.
+    """
+    labels = ["C:maj", "C:(3,5)", "Db:maj", "C#:maj", "A:min7", "C:maj6",
+              "C:maj", "N", "X"]
+    assert dedupe(labels) == ["C:maj", "Db:maj", "C#:maj", "A:min7",
+                              "C:maj6", "N"]
+    assert dedupe(labels, "enharmonic") == ["C:maj", "Db:maj", "A:min7",
+                                            "C:maj6", "N"]
+    unique, inverse = dedupe(labels, "pitch_class_set", return_inverse=True)
+    assert unique == ["C:maj", "Db:maj", "A:min7", "N"]
+    assert inverse.tolist() == [0, 0, 1, 1, 2, 2, 0, 3, 3]
+    assert dedupe([]) == []
+    with pytest.raises(ValueError):
+        dedupe(labels, "german")
+
+
+def test_no_music21():
+    """
+    Test that comparing labels does not load music21.
+    """
+    code = ("import sys; from harte.equivalence import dedupe; "
+            "dedupe(['C:maj', 'C:(3,5)']); "
+            "assert 'music21' not in sys.modules")
+    root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
@@ -0,0 +1,91 @@
+"""
+Test cases for the evaluation module.
+"""
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from harte.evaluation import (COMPARISONS, compare, encode_labels, evaluate,
+                              evaluate_many, merge_segments)
+
+
+@pytest.mark.parametrize(
+    "reference,estimated,expected",
+    [
+        ("C:maj", "C:maj", [1] * 12),
+        ("C:maj", "C:min", [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+        ("C:maj", "C:maj7", [1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1]),
+        ("C:maj/3", "C:maj", [1, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1]),
+        ("C:maj7", "C:maj9", [1] * 12),
+        ("C:maj(b7)", "C:7", [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]),
+        ("C:dim7", "C:dim", [1, -1, -1, 1, 1, 1, 1, -1, -1, 0, 0, 1]),
+        ("C:maj/b7", "C:maj", [1, 1, 0, 1, 0, 1, 0, 0, 0, 0, 0, 1]),
+        ("C:maj", "A:min7", [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1]),
+        ("C:5", "C:maj", [1, -1, -1, 1, 1, 0, 0, -1, -1, 0, 0, -1]),
+        ("N", "N", [1] * 12),
+        ("N", "C:maj", [0] * 12),
+        ("C:maj", "N", [0] * 12),
+        ("X", "C:maj", [-1] * 12),
+        ("C:maj", "X", [0] * 12),
+        ("N", "X", [0] * 12),
+        ("X", "X", [-1] * 12),
+    ],
+)
+def test_compare(reference: str, estimated: str, expected: List[int]):
+    """
+    Test the comparison rules on pairs of chords.
+
+    :param reference: Reference chord
+    :type reference: str
+    :param estimated: Estimated chord
+    :type estimated: str
+    :param expected: Expected scores, in the order of COMPARISONS
+    :type expected: List[int]
+    """
+    ref, est = encode_labels([reference]), encode_labels([estimated])
+    assert [compare(ref, est, comparison)[0]
+            for comparison in COMPARISONS] == expected
+
+
+def test_merge_segments():
+    """
+    Test the merge of the segment boundaries.
+    """
+    durations, ref_indices, est_indices = merge_segments(
+        np.array([[0, 1], [1, 3], [4, 5]]), np.array([[-1, 0.5], [2, 6]]))
+    assert durations.tolist() == [0.5, 0.5, 1, 1, 1, 1]
+    assert ref_indices.tolist() == [0, 0, 1, 1, -1, 2]
+    assert est_indices.tolist() == [0, -1, -1, 1, 1, 1]
+
+
+def test_evaluate():
+    """
+    Test the duration-weighted scores of a track and of a corpus.
+    """
+    reference = (np.array([[0, 1], [1, 2.5], [2.5, 4]]),
+                 ["C:maj", "A:min7", "G:7/3"])
+    estimated = (np.array([[0.5, 2], [2, 3], [3, 5]]),
+                 ["C:maj", "A:min", "G:7"])
+    scores = evaluate(*reference, *estimated)
+    assert scores == pytest.approx({
+        "root": 0.5, "majmin": 0.5, "majmin_inv": 0.25, "thirds": 0.5,
+        "thirds_inv": 0.25, "triads": 0.5, "triads_inv": 0.25,
+        "sevenths": 0.375, "sevenths_inv": 0.125, "tetrads": 0.375,
+        "tetrads_inv": 0.125, "mirex": 0.75})
+    assert evaluate(*reference, *estimated, comparisons=["root"]) == \
+        {"root": pytest.approx(0.5)}
+    assert evaluate(*reference, *reference) == dict.fromkeys(COMPARISONS,
+                                                              1.0)
+
+    # the corpus scores weight each segment by its duration
+    silence = (np.array([[0, 12]]), ["N"])
+    corpus = evaluate_many([reference + estimated, silence + silence])
+    assert corpus["root"] == pytest.approx((0.5 * 4 + 12) / 16)
+    assert evaluate_many([]) == dict.fromkeys(COMPARISONS, 0.0)
+
+    with pytest.raises(ValueError):
+        evaluate(*reference, estimated[0], ["C:maj"])
+    with pytest.raises(ValueError):
+        compare(encode_labels(["C:maj"]), encode_labels(["C:maj"]), "foo")
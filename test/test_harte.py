@@ -80,3 +80,71 @@ def test_ordering_of_degrees(chord: str, pitches: List[str]):
     """
     chord = Harte(chord)  # type: ignore
     assert [p.name for p in chord.pitches] == pitches  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "chord,pretty",
+    [
+        ("D:(b3,5,7,9)", "D:minmaj7(9)"),
+        ("C:(3,5)", "C:maj"),
+        ("C:maj/b7", "C:7/b7"),
+        ("G:(3,5,b7,#9,b13)", "G:7(#9,b13)"),
+        ("F:sus4(b7,9)", "F:sus4(b7,9)"),
+        ("A:(1)", "A:(1)"),
+        ("N", "N"),
+    ],
+)
+def test_prettify(chord: str, pretty: str):
+    """
+    Test that chords are prettified without being modified.
+
+    :param chord: Input chord
+    :type chord: str
+    :param pretty: Prettified chord
+    :type pretty: str
+    """
+    chord = Harte(chord)  # type: ignore
+    unwrapped = chord.unwrap_shorthand()  # type: ignore
+    assert chord.prettify() == pretty  # type: ignore
+    assert chord.prettify() == pretty  # type: ignore
+    assert chord.unwrap_shorthand() == unwrapped  # type: ignore
+
+
+def test_cached_pitches():
+    """
+    Test that the cached pitches are invalidated when the chord is mutated.
+    """
+    chord = Harte("C:maj7/3")
+    assert chord.get_midi_pitches() == [52, 60, 67, 71]
+    assert chord.get_pitch_class_set() == {0, 4, 7, 11}
+    assert chord.multi_hot_encoding(transpose=True) == \
+        chord.multi_hot_encoding()
+    chord.get_midi_pitches().append(0)
+    assert chord.get_midi_pitches() == [52, 60, 67, 71]
+
+    chord.transpose(2, inPlace=True)
+    assert chord.get_midi_pitches() == [54, 62, 69, 73]
+    assert chord.multi_hot_encoding() == \
+        [0, 1, 1, 0, 0, 0, 1, 0, 0, 1, 0, 0]
+    assert chord.multi_hot_encoding(transpose=True) == \
+        [1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 1]
+    chord.add("C5")
+    assert chord.get_midi_pitches() == [54, 62, 69, 72, 73]
+    assert 0 in chord.get_pitch_class_set()
+    chord.remove(next(x for x in chord.pitches if x.midi == 72))
+    assert chord.get_midi_pitches() == [54, 62, 69, 73]
+    chord.root("A4")
+    assert chord.multi_hot_encoding(transpose=True) == \
+        [1, 0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 0]
+
+
+def test_sequence():
+    """
+    Test the construction of the chords of a progression.
+    """
+    text = "C:maj | Cfoo C:(##3) G:7/3"
+    tokens, chords = zip(*Harte.sequence(text))
+    assert [token.error for token in tokens] == [-1, 9, 16, -1]
+    assert chords[1] is None and chords[2] is None
+    assert chords[0] == Harte("C:maj")
+    assert chords[3].get_midi_pitches() == Harte("G:7/3").get_midi_pitches()
@@ -3,8 +3,13 @@ Test the HarteInterval class
 """
 
 import pytest
+from music21.interval import Interval, IntervalException
+from music21.note import Note
+from music21.pitch import Pitch
 
-from harte.utils import convert_interval
+from harte.interval import PITCH_TABLE, HarteInterval, PitchTable
+from harte.utils import (DEGREE_TABLE, convert_interval, degree_to_sort_key,
+                         interval_offsets)
 
 
 @pytest.mark.parametrize(
@@ -65,3 +70,101 @@ def test_harte_interval(harte_interval: str, music21_interval: str):
     harte_interval = convert_interval(harte_interval)
 
     assert harte_interval == music21_interval
+
+
+@pytest.mark.parametrize(
+    "degree,steps,semitones,sort_key",
+    [
+        ("1", 0, 0, 1),
+        ("b3", 2, 3, 2.51),
+        ("#5", 4, 8, 5.49),
+        ("bb7", 6, 9, 6.51),
+        ("b9", 1, 1, 8.51),
+        ("#11", 3, 6, 11.49),
+        ("*3", 2, 4, 3),
+    ],
+)
+def test_degree_table(degree: str, steps: int, semitones: int,
+                      sort_key: float):
+    """
+    Test the precomputed information of the degrees
+    :param degree: Harte degree
+    :type degree: str
+    :param steps: staff steps from the root
+    :type steps: int
+    :param semitones: semitones from the root
+    :type semitones: int
+    :param sort_key: key used for ordering the degree
+    :type sort_key: float
+    """
+    assert interval_offsets(degree) == (steps, semitones)
+    assert degree_to_sort_key(degree) == pytest.approx(sort_key)
+    assert DEGREE_TABLE[degree].valid
+
+
+@pytest.mark.parametrize("degree", ["##3", "bbb5", "*##7"])
+def test_invalid_degree(degree: str):
+    """
+    Test that degrees that cannot be converted raise an error
+    :param degree: Harte degree
+    :type degree: str
+    """
+    with pytest.raises(ValueError):
+        convert_interval(degree)
+    with pytest.raises(IntervalException):
+        HarteInterval(degree)
+
+
+@pytest.mark.parametrize(
+    "root,degree,octave",
+    [
+        ("C", "3", 4),
+        ("Bb", "b3", 4),
+        ("E", "bb7", 2),
+        ("Cb", "7", 5),
+        ("B#", "#9", 3),
+        ("Abbbb", "b13", 4),
+        ("F####", "#11", 6),
+    ],
+)
+def test_pitch_table(root: str, degree: str, octave: int):
+    """
+    Test that the pitch table agrees with the music21 transposition
+    :param root: root of the chord
+    :type root: str
+    :param degree: Harte degree
+    :type degree: str
+    :param octave: octave of the root
+    :type octave: int
+    """
+    m21_root = Pitch(root.replace("b", "-"), octave=octave)
+    expected = Interval(convert_interval(degree)).transposePitch(m21_root)
+    pitch = HarteInterval(degree).transposePitch(m21_root)
+    assert pitch.nameWithOctave == expected.nameWithOctave
+    assert pitch.midi == expected.midi
+    entry = PITCH_TABLE.get(root, degree)
+    assert entry.name == expected.name
+    assert entry.midi == expected.midi + 12 * (4 - octave)
+    note = HarteInterval(degree).transposeNote(Note(m21_root))
+    assert note.pitch.nameWithOctave == expected.nameWithOctave
+
+    # pitches without octave or with a microtone are transposed by music21
+    assert HarteInterval(degree).transposePitch(
+        Pitch(m21_root.name)).octave is None
+    m21_root.microtone = 20
+    assert HarteInterval(degree).transposePitch(m21_root).microtone.cents \
+        == pytest.approx(20)
+
+
+def test_fill_pitch_table():
+    """
+    Test the precomputation of the pitch table
+    """
+    table = PitchTable()
+    assert table.fill(["C", "Eb"], ["1", "b3", "#11"]) == 6
+    assert table.get("Eb", "b3") == ("G-", 0, 66)
+    assert table.get("C", "#11") == ("F#", 0, 66)
+    table.clear()
+    assert len(table) == 0
+    with pytest.raises(IntervalException):
+        table.get("C", "##3")
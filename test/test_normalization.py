@@ -0,0 +1,39 @@
+"""
+Test cases for the normalization module.
+"""
+
+import pytest
+
+from harte.harte import Harte
+from harte.normalization import normalize_many
+
+LABELS = ["D:(b3,5,7,9)", "C:(3,5)", "N", "C:foo", "C:(3,5)", "G:(3,5,b7)/b7",
+          "A:maj9(113)", "F#:sus4(b7)", "Cb#:maj", "E#####:min"]
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_normalize_many(workers):
+    """
+    Test bulk normalization, in process and with a pool of workers.
+
+    :param workers: Number of worker processes
+    """
+    result = normalize_many(LABELS, workers=workers, chunksize=2,
+                            errors="collect")
+    assert result.labels == ["D:minmaj7(9)", "C:maj", "N", None, "C:maj",
+                             "G:7/b7", None, "F#:sus4(b7)", None, None]
+    assert set(result.errors) == {"C:foo", "A:maj9(113)", "Cb#:maj",
+                                  "E#####:min"}
+    for label, normalized in zip(LABELS, result.labels):
+        if normalized is not None:
+            assert normalized == Harte(label).prettify()
+
+
+def test_normalize_many_raise():
+    """
+    Test that errors are raised by default.
+    """
+    with pytest.raises(Exception):
+        normalize_many(LABELS)
+    with pytest.raises(ValueError):
+        normalize_many(LABELS, errors="ignore")
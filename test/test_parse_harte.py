@@ -0,0 +1,189 @@
+"""
+Test cases for the parse_harte module.
+"""
+
+import json
+import os
+
+import pytest
+
+from harte import parse_harte
+from harte.parse_harte import ParseCache, ParsedChord, fast_parse, \
+    get_parser, parse_sequence, try_parse
+
+CUR_DIR = os.path.dirname(os.path.realpath(__file__))
+with open(os.path.join(CUR_DIR, "chords_count.json"), encoding="UTF-8") as f:
+    CHORDS_COUNT = json.load(f)
+
+
+@pytest.mark.parametrize(
+    "chord,parsed",
+    [
+        ("N", ParsedChord()),
+        ("C", ParsedChord(root="C")),
+        ("C#:maj7", ParsedChord(root="C#", shorthand="maj7")),
+        ("Bb:(b3,5)/b3", ParsedChord(root="Bb", degrees=("b3", "5"),
+                                     bass="b3")),
+        ("F:min(*5,b13)", ParsedChord(root="F", shorthand="min",
+                                      degrees=("*5", "b13"))),
+    ],
+)
+def test_parsed_chord(chord: str, parsed: ParsedChord):
+    """
+    Test that the cached parse returns the same information as the parser.
+
+    :param chord: Input chord
+    :type chord: str
+    :param parsed: Expected parsed chord
+    :type parsed: ParsedChord
+    """
+    cache = ParseCache()
+    assert cache.parse(chord) == parsed
+    assert cache.parse(chord).to_dict() == get_parser().parse(chord)
+
+
+def test_cache_statistics():
+    """
+    Test hits, misses and eviction of the parse cache.
+    """
+    cache = ParseCache(maxsize=2)
+    first = cache.parse("C:maj")
+    assert cache.parse("C:maj") is first
+    cache.parse("D:min")
+    cache.parse("E:7")
+    assert "C:maj" not in cache
+    assert cache.info() == (1, 3, 2, 2)
+
+    cache.resize(1)
+    assert len(cache) == 1 and "E:7" in cache
+
+    cache.clear()
+    assert cache.info() == (0, 0, 1, 0)
+
+
+def test_cache_errors_not_stored():
+    """
+    Test that unparseable chords raise and are not cached.
+    """
+    cache = ParseCache()
+    with pytest.raises(Exception):
+        cache.parse("C:foo")
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    "chord",
+    list(CHORDS_COUNT.keys())
+    + ["X", "C:", "C:maj()", "C:(3,,5)", "C:maj7sus4", "H:maj", "C:14",
+       "C:(14)", "N/3", "C:maj(3)(5)", "C/", "Cb#:min", "C:(*3)", " C:maj "],
+)
+def test_fast_parser(chord: str):
+    """
+    Differential test of the dedicated parser against the Lark parser over
+    all the chords extracted from ChoCo [1] and a set of malformed chords.
+
+    [1] https://github.com/smashub/choco
+
+    :param chord: Chord to be tested
+    :type chord: str
+    """
+    try:
+        expected = get_parser().parse(chord)
+    except Exception:  # pylint: disable=broad-except
+        expected = None
+    if " " in chord:
+        assert fast_parse(chord) is None
+    else:
+        assert fast_parse(chord) == expected
+
+
+def test_fast_parser_switch(monkeypatch):
+    """
+    Test that the parse cache honours USE_FAST_PARSER.
+
+    :param monkeypatch: pytest fixture
+    """
+    for use_fast_parser in [True, False]:
+        monkeypatch.setattr(parse_harte, "USE_FAST_PARSER", use_fast_parser)
+        cache = ParseCache()
+        assert cache.parse(" C:min7 / b3") == ParsedChord(
+            root="C", shorthand="min7", bass="b3")
+        with pytest.raises(Exception):
+            cache.parse("C:maj7sus4")
+
+
+def test_parser_cache_file(monkeypatch, tmp_path):
+    """
+    Test that the parser tables are cached in a per-user directory.
+
+    :param monkeypatch: pytest fixture
+    :param tmp_path: pytest fixture
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    # pylint: disable=protected-access
+    path = parse_harte._default_cache_file()
+    assert os.path.dirname(path) == str(tmp_path / "harte")
+    assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
+    (tmp_path / "file").write_text("")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "file"))
+    assert parse_harte._default_cache_file() is None
+
+
+@pytest.mark.parametrize(
+    "chord,position",
+    [("C:maj", -1), ("C:foo", 2), ("C:", 2), ("C:maj(", 6), ("C:(3,5", 6),
+     ("C:maj/", 6)],
+)
+def test_try_parse(chord: str, position: int):
+    """
+    Test the position of the syntax errors, including truncated chords.
+
+    :param chord: Input chord
+    :type chord: str
+    :param position: Expected position of the error
+    :type position: int
+    """
+    parsed_chord, error = try_parse(chord)
+    assert error == position
+    assert (parsed_chord is None) == (position >= 0)
+
+
+def test_parse_sequence():
+    """
+    Test the parsing of progressions, including invalid tokens.
+    """
+    text = "C:maj | A:min7 Cfoo G:sus4(9,113,b7)  N C:(3,5)/b7\nX"
+    tokens = list(parse_sequence(text))
+    assert [token.index for token in tokens] == list(range(7))
+    assert [token.label for token in tokens] == [
+        "C:maj", "A:min7", "Cfoo", "G:sus4(9,113,b7)", "N", "C:(3,5)/b7",
+        "X"]
+    for token in tokens:
+        assert text[token.start:token.end] == token.label
+    assert [token.error for token in tokens] == [-1, -1, 16, 31, -1, -1, -1]
+    assert tokens[2].chord is None and tokens[3].chord is None
+    assert tokens[5].chord == fast_parse_chord("C:(3,5)/b7")
+
+    lines = ["C:maj G:7\n", "Z A:min\n"]
+    tokens = list(parse_sequence(iter(lines)))
+    assert [(token.label, token.start, token.error) for token in tokens] == [
+        ("C:maj", 0, -1), ("G:7", 6, -1), ("Z", 10, 10), ("A:min", 12, -1)]
+
+    tokens = list(parse_sequence("C:(3,5),G:7,,C :maj", delimiters=","))
+    assert [token.label for token in tokens] == ["C:(3,5)", "G:7", "C :maj"]
+    assert tokens[2].chord == fast_parse_chord("C:maj")
+    assert not list(parse_sequence(""))
+    with pytest.raises(ValueError):
+        list(parse_sequence("C:maj", delimiters=""))
+
+
+def fast_parse_chord(chord: str) -> ParsedChord:
+    """
+    Parse a chord with the fast parser.
+
+    :param chord: Input chord
+    :type chord: str
+    :return: The parsed chord
+    :rtype: ParsedChord
+    """
+    return ParsedChord.from_dict(fast_parse(chord))
@@ -0,0 +1,40 @@
+"""
+Test cases for the profiling module.
+"""
+
+from harte.harte import Harte
+from harte.profiling import STAGES, disable, enable, profile, reset, snapshot
+
+
+def test_profile():
+    """
+    Test that the stages are counted only while profiling is enabled.
+    """
+    with profile() as profiler:
+        Harte("C:maj7")
+        Harte("A:min/b3")
+        Harte("N")
+        stats = profiler.snapshot()
+    assert list(stats) == list(STAGES)
+    assert stats["parse"].count == 3
+    assert stats["chord"].count == 3
+    assert stats["degrees"].count == stats["intervals"].count == 2
+    assert all(stage.total_ns > 0 for stage in stats.values())
+    assert stats["parse"].mean_ns == stats["parse"].total_ns / 3
+
+    Harte("C:maj7")
+    assert snapshot() == stats
+
+    enable()
+    try:
+        Harte("C:maj7")
+    finally:
+        disable()
+    assert snapshot()["parse"].count == 4
+    with profile(clear=False):
+        Harte("C:maj7")
+    assert snapshot()["parse"].count == 5
+
+    reset()
+    assert all(stage.count == 0 and stage.total_ns == 0 and
+               stage.mean_ns == 0 for stage in snapshot().values())
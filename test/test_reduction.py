@@ -0,0 +1,76 @@
+"""
+Test cases for the reduction module.
+"""
+
+from typing import List, Union
+
+import pytest
+
+from harte.reduction import Reducer, reduce
+from harte.vocabulary import ChordVocabulary
+
+LABELS = ["C:maj9", "C:(b3,5)", "N", "X", "Db:7(#9)/b7", "C:sus4(b7)",
+          "C:hdim7", "C:maj/3", "C:min7/b7", "C:maj/2", "Bb:maj6/6"]
+
+
+@pytest.mark.parametrize(
+    "vocabulary,inversions,expected",
+    [
+        ("majmin", "drop",
+         ["C:maj", "C:min", "N", "X", "Db:maj", "N", "N", "C:maj", "C:min",
+          "C:maj", "Bb:maj"]),
+        ("majmin", "keep",
+         ["C:maj", "C:min", "N", "X", "Db:maj", "N", "N", "C:maj/3", "C:min",
+          "C:maj", "Bb:maj"]),
+        ("majmin", "strict",
+         ["C:maj", "C:min", "N", "X", "N", "N", "N", "C:maj/3", "N", "N",
+          "N"]),
+        ("sevenths", "keep",
+         ["C:maj7", "C:min", "N", "X", "Db:7/b7", "N", "N", "C:maj/3",
+          "C:min7/b7", "C:maj", "Bb:maj"]),
+        ("tetrads", "drop",
+         ["C:maj7", "C:min", "N", "X", "Db:7", "C:sus4", "C:hdim7", "C:maj",
+          "C:min7", "C:maj", "Bb:maj6"]),
+        (["min", "maj"], "drop",
+         ["C:maj", "C:min", "N", "X", "Db:min", "N", "N", "C:maj", "C:min",
+          "C:maj", "Bb:maj"]),
+    ],
+)
+def test_reduce(vocabulary: Union[str, List[str]], inversions: str,
+                expected: List[str]):
+    """
+    Test the reduction of chords to the vocabularies.
+
+    :param vocabulary: Target vocabulary
+    :type vocabulary: Union[str, List[str]]
+    :param inversions: Rule for the inversions
+    :type inversions: str
+    :param expected: Expected reduced chords
+    :type expected: List[str]
+    """
+    assert reduce(LABELS * 2, vocabulary, inversions).tolist() == \
+        expected * 2
+
+
+def test_reducer():
+    """
+    Test the unmatched rules, the table of a vocabulary and the errors.
+    """
+    assert reduce(["C:dim", "C:maj"], unmatched="unknown").tolist() == \
+        ["X", "C:maj"]
+    with pytest.raises(ValueError):
+        reduce(["C:dim"], unmatched="raise")
+    assert reduce([]).tolist() == []
+
+    vocabulary = ChordVocabulary(LABELS[:3] + LABELS[4:])
+    reducer = Reducer("sevenths")
+    table = reducer.table(vocabulary)
+    assert len(table) == len(vocabulary)
+    chord_ids = vocabulary.encode(LABELS[4:] + LABELS[:3])
+    assert table[chord_ids].tolist() == \
+        reducer(LABELS[4:] + LABELS[:3]).tolist()
+
+    for keywords in ({"vocabulary": "foo"}, {"vocabulary": ["foo"]},
+                     {"inversions": "foo"}, {"unmatched": "foo"}):
+        with pytest.raises(ValueError):
+            Reducer(**keywords)
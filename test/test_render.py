@@ -0,0 +1,85 @@
+"""
+Test cases for the render module.
+"""
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from harte.core import HarteCore
+from harte.render import FrameRenderer, render
+
+
+@pytest.mark.parametrize(
+    "chord",
+    ["C:maj", "Cb:maj/3", "A:min7/b7", "E:sus4(b7,9,11,13)/4", "Ab:7/#6",
+     "C#:7/b4", "F:maj9(#11)/#4", "B#:dim7/bb7", "G:(1)"],
+)
+def test_pitches(chord: str):
+    """
+    Test that the default voicing reproduces the pitches of the Harte class.
+
+    :param chord: Input chord
+    :type chord: str
+    """
+    pitches = FrameRenderer().pitches(chord)
+    assert pitches == sorted(set(HarteCore(chord).get_midi_pitches()))
+
+
+@pytest.mark.parametrize(
+    "keywords,pitches",
+    [
+        ({}, [52, 60, 62, 67, 71]),
+        ({"voicing": "open"}, [52, 60, 67, 71, 74]),
+        ({"root_octave": 5, "bass_octave": 2}, [40, 72, 74, 79, 83]),
+        ({"bass_octave": None}, [60, 62, 64, 67, 71]),
+    ],
+)
+def test_voicings(keywords: dict, pitches: List[int]):
+    """
+    Test the voicings and octaves of the chords.
+
+    :param keywords: Arguments of the renderer
+    :type keywords: dict
+    :param pitches: Expected pitches of 'C:maj9/3'
+    :type pitches: List[int]
+    """
+    assert FrameRenderer(**keywords).pitches("C:maj9/3") == pitches
+    assert FrameRenderer(**keywords).pitches("N") == []
+
+
+def test_render(tmp_path):
+    """
+    Test the rendering of timed chords to chroma and piano roll frames.
+    """
+    onsets, offsets = [0.0, 0.5, 1.2], [0.5, 1.0, 1.5]
+    labels = ["C:maj", "N", "A:min/b3"]
+    chroma = render(onsets, offsets, labels, 0.1, mode="chroma")
+    assert chroma.shape == (15, 12) and chroma.dtype == np.uint8
+    expected = np.zeros((15, 12), dtype=np.uint8)
+    expected[:5] = HarteCore("C:maj").multi_hot_encoding()
+    expected[12:] = HarteCore("A:min").multi_hot_encoding()
+    assert np.array_equal(chroma, expected)
+
+    renderer = FrameRenderer(dtype=np.float32)
+    out = np.lib.format.open_memmap(str(tmp_path / "roll.npy"), mode="w+",
+                                    dtype=np.float32, shape=(20, 128))
+    assert renderer.render(onsets, offsets, labels, 0.1, out=out) is out
+    out.flush()
+    roll = np.load(str(tmp_path / "roll.npy"))
+    assert np.flatnonzero(roll[0]).tolist() == [60, 64, 67]
+    assert np.flatnonzero(roll[12]).tolist() == [48, 69, 76]
+    assert not roll[5:12].any() and not roll[15:].any()
+    assert renderer.render([], [], [], 0.1).shape == (0, 128)
+
+    with pytest.raises(ValueError):
+        renderer.render(onsets, offsets, labels, 0.1, out=out[:, :12])
+    with pytest.raises(ValueError):
+        renderer.render(onsets, offsets, labels, 0.1, out=np.zeros((20, 128)))
+    with pytest.raises(ValueError):
+        renderer.render(onsets, offsets, labels[:2], 0.1)
+    with pytest.raises(ValueError):
+        renderer.render(onsets, offsets, labels, 0)
+    with pytest.raises(ValueError):
+        FrameRenderer(mode="foo")
@@ -0,0 +1,93 @@
+"""
+Test cases for the pickling and the serialization of chords.
+"""
+
+import copy
+import pickle
+
+import pytest
+
+from harte import serialization
+from harte.core import HarteCore
+from harte.harte import Harte
+from harte.parse_harte import PARSE_CACHE
+
+LABELS = ["C:maj7(9)/3", "N", "Bb:(b3,5)", "C:(*3)", "C:maj7(9)/3",
+          "F#:sus4(b7,9)", "Ab:hdim7/b7"]
+
+
+@pytest.mark.parametrize("label", LABELS)
+def test_pickle(label: str):
+    """
+    Test that pickled and copied chords are equivalent to the original ones.
+
+    :param label: Chord to be pickled
+    :type label: str
+    """
+    chord = Harte(label)
+    for restored in [pickle.loads(pickle.dumps(chord)), copy.deepcopy(chord)]:
+        assert isinstance(restored, Harte)
+        assert restored.chord == label
+        assert restored.pitches == chord.pitches
+        assert restored.bass() == chord.bass()
+        assert restored.get_midi_pitches() == chord.get_midi_pitches()
+        assert restored.prettify() == chord.prettify()
+    assert len(pickle.dumps(chord)) < 200
+
+
+def test_pickle_music21_state():
+    """
+    Test that pickling and copying preserve the duration, the offset and
+    the changes made to the pitches of the chords.
+    """
+    chord = Harte("C:maj7/3", quarterLength=2)
+    chord.offset = 1.5
+    for restored in [pickle.loads(pickle.dumps(chord)), copy.copy(chord)]:
+        assert restored.quarterLength == 2 and restored.offset == 1.5
+        assert restored.pitches == chord.pitches
+
+    chord.transpose(2, inPlace=True)
+    for restored in [pickle.loads(pickle.dumps(chord)), copy.copy(chord)]:
+        assert restored.quarterLength == 2
+        assert [x.nameWithOctave for x in restored.pitches] == \
+            ["D4", "F#3", "A4", "C#5"]
+
+
+def test_serialization():
+    """
+    Test the round trip of the bulk serializer, which does not parse again.
+    """
+    chords = [Harte(label) for label in LABELS]
+    data = serialization.dumps(chords)
+    assert serialization.dumps(LABELS) == data
+    assert serialization.loads_labels(data) == LABELS
+
+    PARSE_CACHE.clear()
+    restored = serialization.loads(data)
+    assert len(PARSE_CACHE) == 0
+    assert restored[0] is not restored[4]
+    for chord, original in zip(restored, chords):
+        assert chord.chord == original.chord
+        assert chord.get_midi_pitches() == original.get_midi_pitches()
+
+    cores = serialization.loads(data, cls=HarteCore)
+    assert cores == [HarteCore(label) for label in LABELS]
+
+    assert serialization.loads(serialization.dumps([])) == []
+    many = [f"{root}{accidental}:({degree})/{bass}" for root in "ABCDEFG"
+            for accidental in ["", "b", "#"] for degree in range(2, 14)
+            for bass in range(1, 14)] * 2
+    assert serialization.loads_labels(serialization.dumps(many)) == many
+
+
+def test_serialization_errors():
+    """
+    Test that invalid data are rejected.
+    """
+    data = serialization.dumps(LABELS)
+    with pytest.raises(ValueError):
+        serialization.loads(data[:-1])
+    with pytest.raises(ValueError):
+        serialization.loads(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        serialization.loads(b"")
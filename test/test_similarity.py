@@ -0,0 +1,72 @@
+"""
+Test cases for the similarity module.
+"""
+
+import numpy as np
+import pytest
+
+from harte.core import HarteCore
+from harte.similarity import encode_chords, iter_pairwise, nearest, pairwise
+from harte.vocabulary import ChordVocabulary
+
+LABELS = ["C:maj", "C:min", "A:min7", "C:(3,5)", "N", "Eb:maj/5"]
+
+
+def _reference(x: set, y: set, metric: str) -> float:
+    """
+    Compare two sets of bins without NumPy.
+    """
+    if metric == "hamming":
+        return len(x ^ y)
+    if metric == "jaccard":
+        return len(x & y) / len(x | y) if x | y else 1.0
+    return len(x & y) / np.sqrt(len(x) * len(y)) if x and y else 0.0
+
+
+@pytest.mark.parametrize("metric", ["jaccard", "cosine", "hamming"])
+@pytest.mark.parametrize("encoding",
+                         ["pitch_class", "root_relative", "degree"])
+def test_pairwise(metric: str, encoding: str):
+    """
+    Test the pairwise matrices against a set-based implementation.
+
+    :param metric: Comparison metric
+    :type metric: str
+    :param encoding: Encoding of the chords
+    :type encoding: str
+    """
+    matrix = pairwise(LABELS, metric=metric, encoding=encoding, chunk_size=4)
+    bins = [set(np.flatnonzero(row)) for row in
+            encode_chords(LABELS, encoding)]
+    for i, x in enumerate(bins):
+        for j, y in enumerate(bins):
+            assert matrix[i, j] == pytest.approx(_reference(x, y, metric))
+
+
+def test_pairwise_inputs():
+    """
+    Test that vocabularies, labels and chord objects give the same results.
+    """
+    vocabulary = ChordVocabulary(LABELS)
+    cores = [HarteCore(label) for label in vocabulary.labels]
+    expected = pairwise(vocabulary.labels.tolist(), LABELS[:2])
+    assert np.array_equal(pairwise(vocabulary, LABELS[:2]), expected)
+    assert np.array_equal(pairwise(cores, LABELS[:2]), expected)
+    blocks = list(iter_pairwise(vocabulary, LABELS[:2], chunk_size=2))
+    assert [start for start, _ in blocks] == [0, 2, 4]
+    assert np.array_equal(np.concatenate([block for _, block in blocks]),
+                          expected)
+
+
+def test_nearest():
+    """
+    Test the top-k query.
+    """
+    indices, scores = nearest(["C:maj7", "A:min"], LABELS, k=2)
+    assert indices[0].tolist() == [0, 3]
+    assert scores[0].tolist() == pytest.approx([0.75, 0.75])
+    assert indices[1, 0] == 2
+
+    indices, scores = nearest(["C:maj7"], LABELS, k=10, metric="hamming")
+    assert indices.shape == (1, len(LABELS))
+    assert np.all(np.diff(scores[0]) >= 0)
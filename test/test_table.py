@@ -0,0 +1,93 @@
+"""
+Test cases for the table module.
+"""
+
+import numpy as np
+import pytest
+
+from harte.harte import Harte
+from harte.table import ChordTable
+from harte.vocabulary import ChordVocabulary
+
+LABELS = ["C:maj", "A:min7/b3", "N", "C:(3,5)", "Bb:maj", "C:maj",
+          "F#:7(#9)"]
+
+
+def test_table():
+    """
+    Test the columns of a table against the Harte objects.
+    """
+    onsets = np.arange(len(LABELS), dtype=float)
+    table = ChordTable(LABELS, onsets, onsets + 1)
+    assert len(table) == len(LABELS)
+    assert table.labels == LABELS
+    assert table.label_ids[0] == table.label_ids[5]
+    assert table.root_pcs.tolist() == [0, 9, -1, 0, 10, 0, 6]
+    assert [table.pool[i] if i >= 0 else None
+            for i in table.root_ids] == ["C", "A", None, "C", "Bb", "C", "F#"]
+    assert [table.pool[i] if i >= 0 else None for i in table.shorthand_ids] \
+        == ["maj", "min7", None, None, "maj", "maj", "7"]
+    assert table.bass_offsets.tolist() == [0, 3, -1, 0, 0, 0, 0]
+    vocabulary = ChordVocabulary(LABELS)
+    assert np.array_equal(table.multi_hot(),
+                          vocabulary.multi_hot(vocabulary.encode(LABELS)))
+    assert np.array_equal(
+        table.multi_hot(transpose=True),
+        vocabulary.multi_hot(vocabulary.encode(LABELS), transpose=True))
+    assert table.offsets.tolist() == (onsets + 1).tolist()
+
+    chord = table[1]
+    assert isinstance(chord, Harte)
+    assert chord.get_midi_pitches() == Harte("A:min7/b3").get_midi_pitches()
+    assert [chord.chord for chord in table.iter_harte()] == LABELS
+
+    with pytest.raises(ValueError):
+        ChordTable(LABELS, onsets[:3])
+    assert len(ChordTable()) == 0
+
+
+def test_table_selection():
+    """
+    Test slicing and filtering.
+    """
+    # pylint ignores the overloads of ChordTable.__getitem__
+    # pylint: disable=no-member
+    table = ChordTable(LABELS, np.arange(len(LABELS), dtype=float))
+    assert table[1:3].labels == LABELS[1:3]
+    assert table[1:3].pool is table.pool
+    assert table[[6, 0]].labels == ["F#:7(#9)", "C:maj"]
+    assert table[table.where(root_pc=0)].labels == ["C:maj", "C:(3,5)",
+                                                     "C:maj"]
+    assert table[table.where(shorthand="maj", root_pc=0)].onsets.tolist() \
+        == [0, 5]
+    assert not table.where(shorthand="dim").any()
+    assert table[table.where(contains=[0, 4])].labels == \
+        ["C:maj", "A:min7/b3", "C:(3,5)", "C:maj"]
+    assert table[table.where(bass_offset=3)].labels == ["A:min7/b3"]
+    with pytest.raises(IndexError):
+        _ = table[np.ones(3, dtype=bool)]
+
+
+@pytest.mark.parametrize("mmap_mode", [None, "r"])
+def test_table_save_load(tmp_path, mmap_mode):
+    """
+    Test saving and (memory-mapped) loading.
+
+    :param tmp_path: Temporary directory
+    :param mmap_mode: Memory-mapping mode
+    """
+    table = ChordTable(LABELS, np.arange(len(LABELS), dtype=float))
+    table.save(tmp_path / "table.npz")
+    loaded = ChordTable.load(tmp_path / "table.npz", mmap_mode)
+    if mmap_mode is not None:
+        assert isinstance(loaded.masks, np.memmap)
+    assert loaded.labels == LABELS
+    assert loaded.label(3) == "C:(3,5)"
+    assert loaded.pool.get("min7") == table.pool.get("min7")
+    for name, column in table.columns.items():
+        assert np.array_equal(loaded.columns[name], column)
+    assert loaded.offsets is None
+    assert loaded[loaded.where(root_pc=9)][0].chord == "A:min7/b3"
+
+    ChordTable().save(tmp_path / "empty.npz")
+    assert len(ChordTable.load(tmp_path / "empty.npz", mmap_mode)) == 0
@@ -0,0 +1,88 @@
+"""
+Test cases for the templates module.
+"""
+
+import numpy as np
+import pytest
+
+from harte.core import HarteCore
+from harte.mappings import SHORTHAND_DEGREES
+from harte.templates import ChordTemplates
+
+
+def test_templates():
+    """
+    Test the template matrix.
+    """
+    templates = ChordTemplates()
+    assert len(templates) == 12 * (len(SHORTHAND_DEGREES) - 1) + 1
+    assert templates.labels[-1] == "N"
+    assert np.allclose(np.linalg.norm(templates.matrix, axis=1), 1)
+    for label, row in zip(templates.labels[:-1], templates.matrix):
+        assert np.array_equal(row > 0, HarteCore(label).multi_hot_encoding())
+
+    weighted = ChordTemplates(["maj"], ["C"], no_chord=False, root_weight=2,
+                              normalize=False)
+    assert np.allclose(weighted.matrix * np.sqrt(6),
+                       [[2, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0]])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4096])
+def test_match(chunk_size: int):
+    """
+    Test that chroma frames are matched to the right chords.
+
+    :param chunk_size: Number of frames scored at once
+    :type chunk_size: int
+    """
+    templates = ChordTemplates(["maj", "min", "7", "dim"])
+    labels = ["C:maj", "A:min", "F#:dim", "D:7", "Bb:maj"]
+    chroma = np.array([HarteCore(label).multi_hot_encoding()
+                       for label in labels] + [[0] * 12], dtype=float)
+    chroma[:-1] += 0.1
+    result = templates.match(chroma, k=3, chunk_size=chunk_size)
+    assert result.labels.tolist() == labels + ["N"]
+    assert result.top_indices.shape == (6, 3)
+    assert np.all(np.diff(result.top_scores, axis=1) <= 0)
+    assert np.array_equal(result.scores, result.top_scores[:, 0])
+    scores = templates.scores(chroma, chunk_size=chunk_size)
+    assert np.allclose(np.take_along_axis(scores, result.top_indices, axis=1),
+                       result.top_scores)
+    assert np.allclose(scores.max(axis=1), result.scores)
+
+    with pytest.raises(ValueError):
+        templates.match(chroma[:, :6])
+    with pytest.raises(ValueError):
+        templates.match(chroma, k=0)
+
+
+def test_match_unnormalized():
+    """
+    Test that unnormalized frames are matched to the same chords, the
+    larger templates and the no-chord not being favoured.
+    """
+    templates = ChordTemplates(normalize=False)
+    labels = ["C:maj", "D:min", "G:7", "F:maj7"]
+    chroma = np.array([HarteCore(label).multi_hot_encoding()
+                       for label in labels] + [[0] * 12], dtype=float)
+    chroma[1] *= 3
+    result = templates.match(chroma)
+    assert result.labels.tolist() == labels + ["N"]
+    assert np.allclose(result.scores[:-1],
+                       np.linalg.norm(chroma[:-1], axis=1))
+    assert np.array_equal(result.labels,
+                          ChordTemplates().match(chroma).labels)
+
+
+def test_bass_treble():
+    """
+    Test the bass/treble split with inversions.
+    """
+    templates = ChordTemplates(["maj", "min"], bass=True, inversions=True,
+                               no_chord=False)
+    assert templates.n_bins == 24
+    assert len(templates) == 12 * 2 * 3
+    chroma = np.zeros((2, 24))
+    chroma[0, [4, 12, 16, 19]] = 1
+    chroma[1, [9, 21, 12, 16]] = 1
+    assert templates.match(chroma).labels.tolist() == ["C:maj/3", "A:min"]
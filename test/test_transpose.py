@@ -0,0 +1,79 @@
+"""
+Test cases for the transpose module.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+import pytest
+
+from harte.core import HarteCore
+from harte.transpose import transpose, transpose_all
+from harte.vocabulary import ChordVocabulary
+
+
+@pytest.mark.parametrize(
+    "chord,amount,policy,transposed",
+    [
+        ("C#:maj7(b6)/b3", 2, None, "D#:maj7(b6)/b3"),
+        ("Bb:min", "b3", None, "Db:min"),
+        ("B:7", "2", None, "C#:7"),
+        ("E:(3,5)", "b2", None, "F:(3,5)"),
+        ("G#:min", "b3", None, "B:min"),
+        ("D:maj", "#4", None, "G#:maj"),
+        ("Eb:maj", 1, "sharp", "E:maj"),
+        ("C:maj", 1, None, "Db:maj"),
+        ("C:maj", -1, "sharp", "B:maj"),
+        ("A:min7/b7", 3, "flat", "C:min7/b7"),
+        ("N", 5, None, "N"),
+    ],
+)
+def test_transpose(chord: str, amount: Union[int, str],
+                   policy: Optional[str], transposed: str):
+    """
+    Test the transposition of single chords.
+
+    :param chord: Input chord
+    :type chord: str
+    :param amount: Semitones or interval of the transposition
+    :type amount: Union[int, str]
+    :param policy: Spelling policy
+    :type policy: str
+    :param transposed: Transposed chord
+    :type transposed: str
+    """
+    assert transpose(chord, amount, policy) == transposed
+
+
+def test_transpose_errors():
+    """
+    Test invalid spelling policies.
+    """
+    with pytest.raises(ValueError):
+        transpose("C:maj", 2, "diatonic")
+    with pytest.raises(ValueError):
+        transpose("C:maj", 2, "german")
+
+
+@pytest.mark.parametrize("policy", ["preserve", "sharp", "flat", "common"])
+def test_transpose_all(policy: str):
+    """
+    Test that the batch transposition matches single transpositions.
+
+    :param policy: Spelling policy
+    :type policy: str
+    """
+    labels = ["C:maj", "Bb:min7/b3", "N", "F#:9(#11)"]
+    for chords in [labels, ChordVocabulary(labels)]:
+        result = transpose_all(chords, policy)
+        assert result.labels.shape == (len(labels), 12)
+        for row, label in enumerate(labels):
+            for shift in range(12):
+                expected = transpose(label, shift, policy)
+                assert result.labels[row, shift] == expected
+                core = HarteCore(expected)
+                assert result.root_pcs[row, shift] == \
+                    (-1 if core.is_empty() else core.root_pc)
+                assert np.array_equal(
+                    (result.masks[row, shift] >> np.arange(12)) & 1,
+                    core.multi_hot_encoding())
@@ -0,0 +1,92 @@
+"""
+Test cases for the validation module.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Optional, Tuple
+
+import pytest
+
+from harte.harte import Harte
+from harte.validation import check, is_valid, validate_many
+
+CUR_DIR = os.path.dirname(os.path.realpath(__file__))
+
+with open(os.path.join(CUR_DIR, "chords_count.json"), encoding="UTF-8") as f:
+    CHORDS_COUNT = json.load(f)
+
+
+@pytest.mark.parametrize(
+    "label,error",
+    [
+        ("C:maj7(9)/3", None),
+        ("Cbbbb:maj", None),
+        ("C:(*bbb3)", None),
+        ("C:maj(3, 5)", None),
+        ("N", None),
+        ("", ("syntax", 0)),
+        ("Z", ("syntax", 0)),
+        ("C:foo", ("syntax", 2)),
+        ("G:sus4(9,113,b7)", ("syntax", 11)),
+        ("Cbbbbb:maj", ("root", 1)),
+        ("Cb#:maj", ("root", 1)),
+        ("C:(bbb3)", ("degree", 3)),
+        ("C:maj/##3", ("degree", 6)),
+        ("C:(3,##9)/##9", ("degree", 5)),
+        ("Fbbbb:maj", None),
+        ("Fbbbb:sus4", ("degree", 9)),
+        ("Fbbbb:min13", ("degree", 0)),
+        ("Fbbbb:maj(#11)", ("degree", 10)),
+        ("Fbbbb:5/#4", ("degree", 8)),
+    ],
+)
+def test_check(label: str, error: Optional[Tuple[str, int]]):
+    """
+    Test the kind and position of the errors.
+
+    :param label: Input label
+    :type label: str
+    :param error: Expected error
+    :type error: Optional[Tuple[str, int]]
+    """
+    assert check(label) == error
+    assert is_valid(label) == (error is None)
+
+
+def test_validate_many():
+    """
+    Test that the validation agrees with the construction of Harte objects.
+    """
+    labels = list(CHORDS_COUNT) + ["C:(##3)", "Cb#:maj"]
+    report = validate_many(labels * 2)
+    assert len(report.valid) == 2 * len(labels)
+    invalid = set()
+    for label in labels:
+        try:
+            Harte(label)
+        except Exception:  # pylint: disable=broad-except
+            invalid.add(label)
+    assert {error.label for error in report.errors} == invalid
+    assert len(report.errors) == 2 * len(invalid)
+    for error in report.errors:
+        assert not report.valid[error.index]
+        assert (labels * 2)[error.index] == error.label
+        assert (error.kind, error.position) == check(error.label)
+    assert [error.index for error in report.errors] == \
+        sorted(error.index for error in report.errors)
+
+
+def test_no_music21():
+    """
+    Test that validating labels does not import music21.
+    """
+    code = ("import sys; from harte.validation import validate_many; "
+            "validate_many(['C:maj', 'C:foo', 'C:(##3)']); "
+            "print('music21' in sys.modules)")
+    output = subprocess.run([sys.executable, "-c", code],
+                            cwd=os.path.dirname(CUR_DIR), check=True,
+                            capture_output=True, text=True)
+    assert output.stdout.strip() == "False"
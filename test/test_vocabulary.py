@@ -0,0 +1,76 @@
+"""
+Test cases for the vocabulary module.
+"""
+
+import numpy as np
+import pytest
+
+from harte.encoding import encode_many
+from harte.vocabulary import ChordVocabulary
+
+LABELS = ["C:maj", "A:min7/b3", "N", "C:(3,5)", "Bb:7(#9)", "X", "Eb:min/5"]
+
+
+def test_vocabulary_ids():
+    """
+    Test that equivalent chords share the same ID.
+    """
+    vocabulary = ChordVocabulary()
+    chord_ids = vocabulary.encode(LABELS)
+    assert chord_ids.tolist() == [0, 1, 2, 0, 3, 4, 5]
+    assert vocabulary.decode(chord_ids[:3]) == ["C:maj", "A:min7/b3", "N"]
+    assert vocabulary.get("C:maj") == 0
+    assert vocabulary.get("D:maj") is None
+    assert vocabulary.encode(["D:maj", "C:maj"], add=False).tolist() == [-1, 0]
+    assert len(vocabulary) == 6
+
+    # the unknown chord is not the no-chord
+    vocabulary = ChordVocabulary(["N", "X", "C:maj", " X"])
+    assert len(vocabulary) == 3
+    assert vocabulary.encode(["X", "N", " X"]).tolist() == [1, 0, 1]
+    assert vocabulary.decode([0, 1]) == ["N", "X"]
+
+
+def test_vocabulary_arrays():
+    """
+    Test the per-chord arrays of the vocabulary.
+    """
+    vocabulary = ChordVocabulary(LABELS)
+    assert vocabulary.root_pcs.tolist() == [0, 9, -1, 10, -1, 3]
+    assert vocabulary.bass_offsets.tolist() == [0, 3, -1, 0, -1, 7]
+    assert vocabulary.masks[0] == 0b000010010001
+
+    chord_ids = vocabulary.encode(LABELS)
+    for transpose in [False, True]:
+        assert np.array_equal(vocabulary.multi_hot(chord_ids, transpose),
+                              encode_many(LABELS, transpose))
+
+
+@pytest.mark.parametrize("mmap_mode", [None, "r"])
+def test_vocabulary_save_load(tmp_path, mmap_mode):
+    """
+    Test that IDs are stable across saving and loading.
+
+    :param tmp_path: pytest fixture
+    :param mmap_mode: Memory-mapping mode
+    """
+    vocabulary = ChordVocabulary(LABELS)
+    path = tmp_path / "vocabulary.npz"
+    vocabulary.save(path)
+
+    loaded = ChordVocabulary.load(path, mmap_mode=mmap_mode)
+    if mmap_mode is not None:
+        assert isinstance(loaded.masks, np.memmap)
+    assert len(loaded) == len(vocabulary) and loaded[1] == "A:min7/b3"
+    assert loaded.decode([4, 0]) == ["X", "C:maj"]
+    assert loaded.encode(LABELS, add=False).tolist() == \
+        vocabulary.encode(LABELS).tolist()
+    if mmap_mode is not None:
+        # lookups do not copy the arrays
+        assert isinstance(loaded.labels, np.memmap)
+    assert loaded.labels.tolist() == vocabulary.labels.tolist()
+    assert np.array_equal(loaded.masks, vocabulary.masks)
+    assert loaded.encode(LABELS).tolist() == vocabulary.encode(LABELS).tolist()
+    assert loaded.add("D:maj") == len(vocabulary)
+    assert loaded.labels.tolist() == vocabulary.labels.tolist() + ["D:maj"]
+    assert loaded.get("C:(3,5)") == 0 and len(loaded) == len(vocabulary) + 1